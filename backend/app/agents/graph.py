@@ -1,11 +1,17 @@
 """LangGraph StateGraph 워크플로우 정의
 
 문서파싱 → [권리분석 | 시세분석 | 뉴스분석] (병렬) → 가치평가 → 보고서 생성
+
+병렬 분석 노드는 끝나는 즉시 같은 노드 안에서 자기 결과로 쓸 수 있는 리포트 항목을 먼저 작성한다.
+(슈퍼스텝 단위로 실행되므로 별도 노드로 두면 가장 느린 병렬 노드를 기다리게 된다)
+보고서 생성 노드는 가치평가가 필요한 항목만 작성해 합친다.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from dataclasses import asdict
 from datetime import datetime, timezone
 from typing import Any
@@ -13,14 +19,21 @@ from typing import Any
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import RetryPolicy
 
+from app.agents.llm import LLMPriority, llm_batch_scope, llm_cache_scope, llm_priority_scope
 from app.agents.nodes.document_parser import document_parser_node
 from app.agents.nodes.market_data import market_data_node
 from app.agents.nodes.news_analysis import news_analysis_node
-from app.agents.nodes.report_generator import report_generator_node
+from app.agents.nodes.report_generator import (
+    REPORT_SECTIONS,
+    polish_analysis_summary,
+    report_generator_node,
+    write_report_section,
+)
 from app.agents.nodes.rights_analysis import rights_analysis_node
 from app.agents.nodes.valuation import valuation_node
 from app.agents.state import AgentState
 from app.api.websocket.manager import manager
+from app.config import settings
 from app.database import async_session
 from app.migrations import extract_summary_fields
 from app.models.analysis import Analysis, AnalysisStatus
@@ -59,15 +72,33 @@ PARALLEL_NODES: list[str] = ["rights_analysis", "market_data", "news_analysis"]
 # ---------------------------------------------------------------------------
 
 
+def _with_report_section(name: str, node: Callable[[AgentState], Awaitable[dict]]) -> Callable:
+    """분석 노드가 끝나면 이어서 그 결과로 작성할 수 있는 리포트 항목을 작성하는 노드를 만든다."""
+    section = REPORT_SECTIONS[name]
+
+    async def run(state: AgentState) -> dict:
+        update = await node(state)
+        if not settings.report_speculative_sections or settings.report_mode != "llm":
+            return update
+        return {**update, **await write_report_section({**state, **update}, section)}
+
+    run.__name__ = node.__name__
+    return run
+
+
 def build_graph() -> StateGraph:
     """StateGraph를 구성하고 컴파일된 그래프를 반환한다."""
     graph = StateGraph(AgentState)
 
     # 노드 등록
     graph.add_node("document_parser", document_parser_node, retry_policy=retry_policy)
-    graph.add_node("rights_analysis", rights_analysis_node, retry_policy=retry_policy)
-    graph.add_node("market_data", market_data_node, retry_policy=retry_policy)
-    graph.add_node("news_analysis", news_analysis_node, retry_policy=retry_policy)
+    graph.add_node(
+        "rights_analysis", _with_report_section("rights_analysis", rights_analysis_node), retry_policy=retry_policy
+    )
+    graph.add_node("market_data", _with_report_section("market_data", market_data_node), retry_policy=retry_policy)
+    graph.add_node(
+        "news_analysis", _with_report_section("news_analysis", news_analysis_node), retry_policy=retry_policy
+    )
     graph.add_node("valuation", valuation_node, retry_policy=retry_policy)
     graph.add_node("report_generator", report_generator_node, retry_policy=retry_policy)
 
@@ -100,14 +131,68 @@ compiled_graph = build_graph()
 # ---------------------------------------------------------------------------
 
 
+async def _polish_report(analysis_id: str, final_state: dict[str, Any]) -> None:
+    """템플릿 요약으로 완료된 보고서의 요약 문장을 LLM 작성본으로 교체한다.
+
+    분석은 이미 완료 상태이므로 실패하면 템플릿 요약을 그대로 둔다.
+    """
+    try:
+        summary = await polish_analysis_summary(final_state)
+    except Exception:
+        logger.warning("보고서 LLM 다듬기 실패 - 템플릿 요약 유지: %s", analysis_id, exc_info=True)
+        return
+
+    async with async_session() as db:
+        analysis = await db.get(Analysis, analysis_id)
+        if analysis is None or not analysis.report:
+            return
+        analysis.report = {**analysis.report, "analysis_summary": summary, "summary_source": "llm"}
+        await db.commit()
+
+    await manager.send_progress(analysis_id, {
+        "type": "report_polished",
+        "analysis_summary": summary,
+    })
+
+
 async def run_analysis_workflow(
     analysis_id: str,
     file_paths: list[str] | None = None,
+    *,
+    use_llm_cache: bool = True,
+    priority: LLMPriority = LLMPriority.INTERACTIVE,
+    batch: bool = False,
 ) -> None:
     """분석 워크플로우를 실행한다 (BackgroundTask에서 호출).
 
-    astream(stream_mode="updates")로 각 노드 완료 시 WebSocket 알림을 전송한다.
+    use_llm_cache=False이면 이 분석의 모든 LLM 호출이 응답 캐시를 건너뛰고 새로 생성된다.
+    priority=BULK이면 LLM 속도 제한 대기열에서 단건(interactive) 분석 호출보다 뒤에 처리된다.
+    batch=True이면 LLM 호출을 Message Batches API로 모아 보낸다 (동시에 실행 중인 다른 배치 분석과 함께).
+    """
+    with llm_cache_scope(use_llm_cache), llm_priority_scope(priority), llm_batch_scope(batch):
+        await _run_workflow(analysis_id, file_paths)
+
+
+async def run_batch_reanalysis(analysis_ids: list[str], *, use_llm_cache: bool = False) -> None:
+    """여러 분석을 배치 모드로 동시에 다시 실행한다.
+
+    모든 분석이 같은 단계에 도달할 때마다 그 단계의 LLM 호출이 배치 1건으로 제출되고,
+    결과가 도착하면 각 분석의 그래프가 다음 단계로 이어진다. 업로드 파일 경로는 DB에서 다시 조회한다.
     """
+    results = await asyncio.gather(
+        *(
+            run_analysis_workflow(analysis_id, use_llm_cache=use_llm_cache, priority=LLMPriority.BULK, batch=True)
+            for analysis_id in analysis_ids
+        ),
+        return_exceptions=True,
+    )
+    for analysis_id, result in zip(analysis_ids, results):
+        if isinstance(result, BaseException):
+            logger.error("batch reanalysis failed: %s", analysis_id, exc_info=result)
+
+
+async def _run_workflow(analysis_id: str, file_paths: list[str] | None) -> None:
+    """astream(stream_mode="updates")로 각 노드 완료 시 WebSocket 알림을 전송한다."""
     # DB: status → running, 파일 경로 조회
     async with async_session() as db:
         analysis = await db.get(Analysis, analysis_id)
@@ -158,6 +243,7 @@ async def run_analysis_workflow(
         "market_data": None,
         "news_analysis": None,
         "valuation": None,
+        "report_sections": {},
         "report": None,
         "errors": [],
     }
@@ -234,6 +320,9 @@ async def run_analysis_workflow(
             "report_url": f"/api/v1/analyses/{analysis_id}/report",
         })
 
+        if state_report and state_report.get("summary_source") == "template" and settings.report_llm_polish:
+            await _polish_report(analysis_id, final_state)
+
     except Exception as exc:
         logger.exception("워크플로우 치명 오류: %s", analysis_id)
         async with async_session() as db:
@@ -0,0 +1,25 @@
+"""LLM 게이트웨이 패키지 - 에이전트 노드는 이 패키지를 통해서만 Claude를 호출한다"""
+
+from app.agents.llm.batch import LLMBatchError, batch_collector, batch_enabled_in_context, llm_batch_scope
+from app.agents.llm.cache import get_llm_cache, llm_cache_scope
+from app.agents.llm.gateway import close_llm_client, complete_text, complete_tool, create_message, model_for
+from app.agents.llm.metrics import llm_metrics
+from app.agents.llm.rate_limiter import LLMPriority, llm_priority_scope, rate_limiter
+
+__all__ = [
+    "LLMBatchError",
+    "LLMPriority",
+    "batch_collector",
+    "batch_enabled_in_context",
+    "close_llm_client",
+    "complete_text",
+    "complete_tool",
+    "create_message",
+    "get_llm_cache",
+    "llm_batch_scope",
+    "llm_cache_scope",
+    "llm_metrics",
+    "llm_priority_scope",
+    "model_for",
+    "rate_limiter",
+]
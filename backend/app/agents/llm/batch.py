@@ -0,0 +1,188 @@
+"""LLM 배치 실행 - 여러 분석의 같은 단계 호출을 Message Batches API 1건으로 모아 보낸다
+
+일괄 재분석처럼 지연 시간보다 비용/처리량이 중요한 작업용 (배치 요청은 단건 호출의 절반 가격).
+
+- llm_batch_scope(True) 안에서 실행되는 create_message 호출은 바로 보내지 않고 수집기에 쌓인다
+- 마지막 요청 후 llm_batch_idle_seconds 동안 새 요청이 없으면(= 동시에 돌던 분석들이 모두 이 단계에서 멈춤)
+  쌓인 요청을 배치 1건으로 제출한다. 첫 요청 후 llm_batch_max_wait_seconds가 지나거나
+  llm_batch_max_requests개가 모이면 바로 제출한다
+- llm_batch_poll_seconds 간격으로 상태를 확인하고, 끝나면 결과 JSONL을 custom_id로 각 호출에 돌려준다
+- 호출한 노드는 결과가 올 때까지 await 하므로 그래프는 결과 도착 후 다음 단계로 그대로 이어진다
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from anthropic import AsyncAnthropic
+from anthropic.types import Message
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_batch_mode: ContextVar[bool] = ContextVar("llm_batch_mode", default=False)
+
+
+@contextmanager
+def llm_batch_scope(enabled: bool) -> Iterator[None]:
+    """블록 안에서 실행되는 LLM 호출을 배치로 모아 보낼지 지정한다."""
+    token = _batch_mode.set(enabled)
+    try:
+        yield
+    finally:
+        _batch_mode.reset(token)
+
+
+def batch_enabled_in_context() -> bool:
+    return _batch_mode.get()
+
+
+class LLMBatchError(RuntimeError):
+    """배치 안의 개별 요청이 성공하지 못함 (errored/canceled/expired 또는 결과 누락)"""
+
+
+@dataclass
+class _PendingRequest:
+    custom_id: str
+    params: dict
+    future: asyncio.Future[Message]
+
+
+class BatchCollector:
+    """create_message 요청을 모아 Message Batches API로 제출하고 결과를 나눠 준다.
+
+    Future는 이벤트 루프에 묶이므로 루프가 바뀌면 대기 중인 요청을 버리고 새로 시작한다.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: list[_PendingRequest] = []
+        self._client: AsyncAnthropic | None = None
+        self._first_at = 0.0
+        self._last_at = 0.0
+        self._timer: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._failed = 0
+
+    def _check_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+            self._running = set()
+        return loop
+
+    async def submit(self, client: AsyncAnthropic, params: dict) -> Message:
+        """요청 1건을 다음 배치에 넣고 결과 Message를 기다린다."""
+        loop = self._check_loop()
+        future: asyncio.Future[Message] = loop.create_future()
+        now = time.monotonic()
+        if not self._pending:
+            self._first_at = now
+        self._last_at = now
+        self._client = client
+        self._pending.append(_PendingRequest(f"req_{next(self._ids)}", params, future))
+        if len(self._pending) >= settings.llm_batch_max_requests:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.create_task(self._flush_when_idle())
+        return await future
+
+    async def _flush_when_idle(self) -> None:
+        try:
+            while self._pending:
+                deadline = min(
+                    self._last_at + settings.llm_batch_idle_seconds,
+                    self._first_at + settings.llm_batch_max_wait_seconds,
+                )
+                delay = deadline - time.monotonic()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+        finally:
+            self._timer = None
+        self._flush()
+
+    def _flush(self) -> None:
+        requests = [request for request in self._pending if not request.future.done()]
+        self._pending = []
+        if not requests:
+            return
+        task = asyncio.get_running_loop().create_task(self._run_batch(self._client, requests))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, client: AsyncAnthropic, requests: list[_PendingRequest]) -> None:
+        by_id = {request.custom_id: request for request in requests}
+        try:
+            batch = await client.messages.batches.create(
+                requests=[{"custom_id": request.custom_id, "params": request.params} for request in requests]
+            )
+            with self._lock:
+                self._batches += 1
+                self._requests += len(requests)
+            logger.info("LLM 배치 제출 %s: 요청 %d건", batch.id, len(requests))
+            while batch.processing_status != "ended":
+                await asyncio.sleep(settings.llm_batch_poll_seconds)
+                batch = await client.messages.batches.retrieve(batch.id)
+            async for entry in await client.messages.batches.results(batch.id):
+                request = by_id.pop(entry.custom_id, None)
+                if request is None or request.future.done():
+                    continue
+                result = entry.result
+                if result.type == "succeeded":
+                    request.future.set_result(result.message)
+                else:
+                    error = f"배치 요청 {result.type}"
+                    if result.type == "errored":
+                        error += f": {result.error.error.message}"
+                    self._fail(request, LLMBatchError(error))
+            logger.info("LLM 배치 완료 %s: %s", batch.id, batch.request_counts)
+        except Exception as exc:
+            logger.warning("LLM 배치 실행 실패 - 대기 중인 요청 %d건 실패 처리", len(by_id), exc_info=True)
+            for request in list(by_id.values()):
+                self._fail(request, exc)
+            by_id.clear()
+        for request in by_id.values():
+            self._fail(request, LLMBatchError("배치 결과에 요청이 없습니다."))
+
+    def _fail(self, request: _PendingRequest, exc: Exception) -> None:
+        if request.future.done():
+            return
+        request.future.set_exception(exc)
+        with self._lock:
+            self._failed += 1
+
+    def stats(self) -> dict:
+        """제출한 배치 수/요청 수, 실패한 요청 수, 현재 모으는 중인 요청 수를 반환한다."""
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "requests": self._requests,
+                "failed": self._failed,
+                "pending": len(self._pending),
+                "running": len(self._running),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._batches = 0
+            self._requests = 0
+            self._failed = 0
+
+
+batch_collector = BatchCollector()
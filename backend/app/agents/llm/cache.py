@@ -0,0 +1,193 @@
+"""LLM 응답 캐시 - 요청 내용(model + prompt + tool 스키마 등) 해시 기준 SQLite 영속 캐시
+
+재분석/재시도 시 프롬프트 바이트가 같으면 Claude를 다시 호출하지 않고 저장된 응답을 돌려준다.
+
+- 키: 모델, 프롬프트, max_tokens, tools/tool_choice 등 요청 파라미터 전체의 SHA-256
+- 만료: 호출 위치(call site)별 TTL (llm_cache_ttl_overrides, 0 이하이면 캐시하지 않음)
+- 축출: 총 용량이 상한을 넘으면 가장 오래 사용되지 않은(accessed_at 기준) 항목부터 삭제
+- 우회: llm_cache_scope(False) 안에서 실행되는 호출은 캐시를 읽지도 쓰지도 않는다 (분석 요청 단위 opt-out)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_use_cache: ContextVar[bool] = ContextVar("llm_cache_enabled", default=True)
+
+
+@contextmanager
+def llm_cache_scope(enabled: bool) -> Iterator[None]:
+    """블록 안에서 실행되는 LLM 호출의 캐시 사용 여부를 지정한다."""
+    token = _use_cache.set(enabled)
+    try:
+        yield
+    finally:
+        _use_cache.reset(token)
+
+
+def cache_enabled_in_context() -> bool:
+    return _use_cache.get()
+
+
+def cache_key(model: str, prompt: str, params: dict) -> str:
+    """요청 내용 전체의 SHA-256 hex digest를 반환한다."""
+    body = json.dumps(
+        {"model": model, "prompt": prompt, **params},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def ttl_for(call_site: str) -> int:
+    """호출 위치의 TTL(초)을 반환한다. "document_parser.classify"는 "document_parser" 설정도 따른다."""
+    overrides = settings.llm_cache_ttl_overrides
+    if call_site in overrides:
+        return overrides[call_site]
+    prefix = call_site.split(".", 1)[0]
+    return overrides.get(prefix, settings.llm_cache_ttl_seconds)
+
+
+class LLMResponseCache:
+    """LLM 응답을 저장하는 SQLite 캐시.
+
+    모든 메서드는 블로킹 I/O이므로 이벤트 루프에서는 asyncio.to_thread로 호출한다.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int) -> None:
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    call_site TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_responses_accessed ON llm_responses (accessed_at)")
+        return self._conn
+
+    def get(self, key: str) -> dict | None:
+        """저장된 응답(dict)을 반환한다. 없거나 만료되었으면 None."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT payload, expires_at FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        try:
+            return json.loads(zlib.decompress(row[0]))
+        except Exception:
+            logger.warning("손상된 LLM 캐시 항목 삭제: %s", key)
+            with self._lock:
+                self._connect().execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            return None
+
+    def put(self, key: str, *, call_site: str, model: str, response: dict, ttl: int) -> None:
+        """응답을 저장하고 용량 상한을 넘으면 오래된 항목을 축출한다."""
+        data = zlib.compress(json.dumps(response, ensure_ascii=False, separators=(",", ":")).encode())
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, call_site, model, data, len(data), now, now, now + ttl),
+            )
+            self._evict(conn, now)
+
+    def stats(self) -> dict:
+        """적중/미스 카운터와 현재 용량을 반환한다."""
+        with self._lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """만료 항목을 지우고, 그래도 상한을 넘으면 accessed_at이 오래된 항목부터 삭제한다 (lock 보유 상태)."""
+        conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (now,))
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()
+        if total <= self.max_bytes:
+            return
+        victims: list[str] = []
+        for key, size in conn.execute("SELECT key, size FROM llm_responses ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            victims.append(key)
+            total -= size
+        conn.executemany("DELETE FROM llm_responses WHERE key = ?", [(key,) for key in victims])
+        self.evictions += len(victims)
+
+
+_cache: LLMResponseCache | None = None
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    """설정에 따라 전역 LLM 응답 캐시를 반환한다 (비활성화 시 None)."""
+    global _cache
+    if not settings.llm_cache_enabled:
+        return None
+    if _cache is None:
+        _cache = LLMResponseCache(settings.llm_cache_path, settings.llm_cache_max_mb * 1024 * 1024)
+    return _cache
+
+
+def close_llm_cache() -> None:
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
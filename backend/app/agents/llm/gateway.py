@@ -0,0 +1,456 @@
+"""LLM 게이트웨이 - 모든 에이전트 노드의 Claude 호출을 한 곳에서 처리한다
+
+- 공유 AsyncAnthropic 클라이언트 1개 (httpx 커넥션 풀 공유, 요청 타임아웃)
+- 전역 동시 호출 수 제한 + 모델별 동시 호출 수 제한
+- 호출 위치(call site)별 토큰/지연 시간 지표 (llm_metrics)
+- 요청 내용 해시 기준 영속 응답 캐시 (cache.py). accept 콜백을 넘기면 호출자의 파싱/검증을 통과한 응답만 저장한다
+- Anthropic 프롬프트 캐싱: 고정 접두부(system + prefix)가 캐시 최소 길이 이상이면 끝에 cache_control을 붙이고
+  가변 프롬프트는 맨 마지막에 둔다
+- 모델별 분당 요청/입력 토큰/출력 토큰 한도 안에서 우선순위 순으로 호출 (rate_limiter.py)
+- 호출 위치별 모델 라우팅 (llm_model_routing, 지정이 없으면 llm_model)
+- 배치 모드: llm_batch_scope(True) 안의 호출은 Message Batches API로 모아 보낸다 (batch.py)
+- 스트리밍: on_text 콜백을 넘기면 응답 텍스트를 생성되는 대로 전달한다 (최종 Message는 동일)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from anthropic import DEFAULT_CONNECTION_LIMITS, AsyncAnthropic, DefaultAsyncHttpxClient, RateLimitError, Timeout
+from anthropic.types import Message
+
+from app.agents.llm.batch import batch_collector, batch_enabled_in_context
+from app.agents.llm.cache import cache_enabled_in_context, cache_key, close_llm_cache, get_llm_cache, ttl_for
+from app.agents.llm.metrics import llm_metrics
+from app.agents.llm.rate_limiter import current_priority, estimate_output_tokens, estimate_tokens, rate_limiter
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 프롬프트 캐시 최소 길이 (토큰) - 이보다 짧은 접두부는 cache_control을 붙여도 API가 캐시하지 않는다
+_PROMPT_CACHE_MIN_TOKENS = 1024
+_PROMPT_CACHE_MIN_TOKENS_HAIKU = 2048
+
+# 응답이 잘리지 않고 끝난 경우에만 캐시한다 (max_tokens로 잘린 JSON 등을 재사용하지 않도록)
+_CACHEABLE_STOP_REASONS = {"end_turn", "tool_use", "stop_sequence"}
+
+# SDK가 내부적으로 쓰는 HTTP 라이브러리의 Limits 타입 (httpx 객체를 직접 넘기면 SDK 빌드에 따라 거부됨)
+_Limits = type(DEFAULT_CONNECTION_LIMITS)
+
+# 스트리밍 응답의 텍스트 조각을 받는 콜백
+TextCallback = Callable[[str], Awaitable[None]]
+# 응답을 캐시해도 되는지 판단하는 콜백 (호출자가 쓸 수 있는 응답이면 True)
+AcceptCallback = Callable[[Message], bool]
+
+_client: AsyncAnthropic | None = None
+
+
+def _get_client() -> AsyncAnthropic:
+    global _client
+    if _client is None:
+        _client = AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            max_retries=settings.llm_max_retries,
+            timeout=_timeout(),
+            http_client=DefaultAsyncHttpxClient(
+                limits=_Limits(
+                    max_connections=settings.llm_max_connections,
+                    max_keepalive_connections=settings.llm_max_connections,
+                ),
+                timeout=_timeout(),
+            ),
+        )
+    return _client
+
+
+def _timeout() -> Timeout:
+    return Timeout(settings.llm_timeout_seconds, connect=settings.llm_connect_timeout_seconds)
+
+
+async def close_llm_client() -> None:
+    """공유 클라이언트의 커넥션 풀과 응답 캐시를 닫는다 (애플리케이션 종료 시 호출)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+    close_llm_cache()
+
+
+class _ConcurrencyLimiter:
+    """전역 + 모델별 세마포어.
+
+    asyncio.Semaphore는 처음 대기가 발생한 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만든다.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._global: asyncio.Semaphore | None = None
+        self._per_model: dict[str, asyncio.Semaphore] = {}
+
+    def _semaphores(self, model: str) -> tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._global is None:
+            self._loop = loop
+            self._global = asyncio.Semaphore(settings.llm_max_concurrency)
+            self._per_model = {}
+        if model not in self._per_model:
+            limit = settings.llm_model_concurrency.get(model, settings.llm_default_model_concurrency)
+            self._per_model[model] = asyncio.Semaphore(limit)
+        return self._global, self._per_model[model]
+
+    async def acquire(self, model: str) -> tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        global_sem, model_sem = self._semaphores(model)
+        await global_sem.acquire()
+        try:
+            await model_sem.acquire()
+        except BaseException:
+            global_sem.release()
+            raise
+        return global_sem, model_sem
+
+
+_limiter = _ConcurrencyLimiter()
+
+
+def model_for(call_site: str) -> str:
+    """호출 위치에 라우팅된 모델을 반환한다. "document_parser.classify"는 "document_parser" 설정도 따른다."""
+    routing = settings.llm_model_routing
+    if call_site in routing:
+        return routing[call_site]
+    return routing.get(call_site.split(".", 1)[0], settings.llm_model)
+
+
+def _text_block(text: str, *, cache: bool = False) -> dict:
+    block: dict = {"type": "text", "text": text}
+    if cache and settings.llm_prompt_cache_enabled:
+        block["cache_control"] = {"type": "ephemeral"}
+    return block
+
+
+def _min_cacheable_tokens(model: str) -> int:
+    return _PROMPT_CACHE_MIN_TOKENS_HAIKU if "haiku" in model else _PROMPT_CACHE_MIN_TOKENS
+
+
+def _build_request(prompt: str, system: str | None, prefix: str | None, model: str) -> dict:
+    """system → prefix → prompt 순서로 요청 본문을 만든다.
+
+    캐시는 요청 앞부분부터 브레이크포인트까지를 통째로 저장하므로 고정 부분의 마지막 블록(prefix, 없으면 system)에만
+    브레이크포인트를 둔다. 고정 부분이 모델별 최소 길이보다 짧으면(지시문만 있는 경우 등) 붙이지 않는다.
+    실제로 캐시되는 것은 여러 추출기가 공유하는 문서 원문 접두부 정도다.
+    """
+    cache = estimate_tokens(system, prefix) >= _min_cacheable_tokens(model)
+    request: dict = {}
+    if system:
+        request["system"] = [_text_block(system, cache=cache and not prefix)]
+    if prefix:
+        content: str | list[dict] = [_text_block(prefix, cache=cache), _text_block(prompt)]
+    else:
+        content = prompt
+    request["messages"] = [{"role": "user", "content": content}]
+    return request
+
+
+async def _stream(request: dict, on_text: TextCallback) -> tuple[Message, float | None]:
+    """messages.stream으로 호출하며 텍스트 조각마다 on_text를 호출한다.
+
+    Returns:
+        (최종 Message, 첫 텍스트 조각까지 걸린 시간(초) - 텍스트가 없으면 None)
+    """
+    started = time.perf_counter()
+    first_token: float | None = None
+    async with _get_client().messages.stream(**request) as stream:
+        async for text in stream.text_stream:
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            await on_text(text)
+        return await stream.get_final_message(), first_token
+
+
+async def _send(
+    request: dict,
+    *,
+    call_site: str,
+    estimated_input_tokens: int,
+    on_text: TextCallback | None = None,
+) -> Message:
+    """속도 제한/동시성 제한을 거쳐 messages.create(on_text가 있으면 messages.stream)를 바로 호출한다."""
+    model = request["model"]
+    # 속도 제한 대기열을 먼저 통과한 뒤 동시성 슬롯을 잡는다 (슬롯을 쥔 채 한도 회복을 기다리지 않도록)
+    queued = time.perf_counter()
+    reservation, rate_wait = await rate_limiter.acquire(
+        model,
+        input_tokens=estimated_input_tokens,
+        output_tokens=estimate_output_tokens(request["max_tokens"]),
+        priority=current_priority(),
+    )
+    # 예약은 어떤 경로로 끝나든(슬롯 대기 중 취소 등) 한 번 정산하거나 돌려준다
+    settled = False
+    try:
+        global_sem, model_sem = await _limiter.acquire(model)
+        started = time.perf_counter()
+        queue_wait = started - queued
+        first_token: float | None = None
+        try:
+            try:
+                if on_text is None:
+                    response = await _get_client().messages.create(**request)
+                else:
+                    response, first_token = await _stream(request, on_text)
+            finally:
+                model_sem.release()
+                global_sem.release()
+        except Exception as exc:
+            llm_metrics.record(
+                call_site,
+                latency_s=time.perf_counter() - started,
+                queue_wait_s=queue_wait,
+                rate_limit_wait_s=rate_wait,
+                error=True,
+            )
+            settled = True
+            await rate_limiter.release_unused(reservation)
+            if isinstance(exc, RateLimitError):
+                rate_limiter.throttled(model)
+                logger.warning("LLM 속도 제한(429) - %s 호출 일시 중단: %s", model, call_site)
+            raise
+
+        latency = time.perf_counter() - started
+        usage = response.usage
+        cache_read = usage.cache_read_input_tokens or 0
+        cache_write = usage.cache_creation_input_tokens or 0
+        # 입력 토큰 한도에는 캐시 쓰기 토큰이 포함되고 캐시 읽기 토큰은 포함되지 않는다
+        settled = True
+        await rate_limiter.settle(
+            reservation,
+            input_tokens=usage.input_tokens + cache_write,
+            output_tokens=usage.output_tokens,
+        )
+    finally:
+        if not settled:
+            await rate_limiter.release_unused(reservation)
+    llm_metrics.record(
+        call_site,
+        model=model,
+        latency_s=latency,
+        queue_wait_s=queue_wait,
+        rate_limit_wait_s=rate_wait,
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        cache_read_input_tokens=cache_read,
+        cache_creation_input_tokens=cache_write,
+        first_token_s=first_token,
+    )
+    logger.debug(
+        "LLM 호출 %s: model=%s in=%d out=%d cache_read=%d cache_write=%d latency=%.2fs wait=%.2fs",
+        call_site,
+        model,
+        usage.input_tokens,
+        usage.output_tokens,
+        cache_read,
+        cache_write,
+        latency,
+        queue_wait,
+    )
+    return response
+
+
+async def _send_batched(request: dict, *, call_site: str) -> Message:
+    """배치 수집기에 요청을 넣고 결과를 기다린다.
+
+    배치는 별도 한도로 처리되므로 속도 제한/동시성 제한을 거치지 않는다.
+    지연 시간은 배치 대기가 대부분이라 모델별 히스토그램에는 넣지 않는다.
+    """
+    started = time.perf_counter()
+    try:
+        response = await batch_collector.submit(_get_client(), request)
+    except Exception:
+        llm_metrics.record(
+            call_site,
+            latency_s=time.perf_counter() - started,
+            queue_wait_s=0.0,
+            error=True,
+            batched=True,
+        )
+        raise
+    usage = response.usage
+    llm_metrics.record(
+        call_site,
+        latency_s=time.perf_counter() - started,
+        queue_wait_s=0.0,
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        cache_read_input_tokens=usage.cache_read_input_tokens or 0,
+        cache_creation_input_tokens=usage.cache_creation_input_tokens or 0,
+        batched=True,
+    )
+    return response
+
+
+async def _emit_text(response: Message, on_text: TextCallback | None) -> None:
+    """스트리밍하지 않은 응답의 텍스트를 on_text에 한 번에 전달한다."""
+    if on_text is None:
+        return
+    text = "".join(block.text for block in response.content if block.type == "text")
+    if text:
+        await on_text(text)
+
+
+def _accepts(accept: AcceptCallback | None, response: Message) -> bool:
+    """응답이 호출자의 검증을 통과하는지 확인한다 (검증 중 예외는 실패로 본다)."""
+    if accept is None:
+        return True
+    try:
+        return accept(response)
+    except Exception:
+        return False
+
+
+async def create_message(
+    prompt: str,
+    *,
+    call_site: str,
+    system: str | None = None,
+    prefix: str | None = None,
+    model: str | None = None,
+    max_tokens: int = 4096,
+    use_cache: bool = True,
+    on_text: TextCallback | None = None,
+    accept: AcceptCallback | None = None,
+    **kwargs: Any,
+) -> Message:
+    """응답 캐시 조회, 동시성 제한, 지표 수집을 거쳐 messages.create를 호출한다.
+
+    배치 모드(llm_batch_scope) 안에서는 바로 호출하지 않고 Message Batches API 요청으로 모아 보낸다.
+
+    Args:
+        prompt: user 메시지의 가변 텍스트 (항상 마지막 블록)
+        call_site: 지표 집계/캐시 TTL 구분용 호출 위치 이름 (예: "document_parser.classify")
+        system: 고정 지시문 (system 블록)
+        prefix: prompt 앞에 두는 고정 user 블록 (system과 합쳐 캐시 최소 길이 이상이면 프롬프트 캐시 대상)
+        model: 사용할 모델 (None이면 model_for(call_site))
+        max_tokens: 최대 출력 토큰
+        use_cache: False면 이 호출은 응답 캐시를 건너뛴다
+        on_text: 응답 텍스트 조각을 받을 콜백. 주어지면 스트리밍으로 호출한다
+            (캐시 적중/배치 모드에서는 전체 텍스트를 한 번에 전달)
+        accept: 응답을 캐시에 저장해도 되는지 판단하는 콜백. 파싱/검증에 실패한 응답은 저장하지 않아
+            다시 분석할 때 같은 오류 응답을 재사용하지 않는다 (캐시에서 읽은 응답도 통과하지 못하면 새로 호출)
+        **kwargs: tools, tool_choice 등 messages.create에 그대로 전달할 인자
+    """
+    model = model or model_for(call_site)
+    cache = get_llm_cache() if use_cache and cache_enabled_in_context() else None
+    ttl = ttl_for(call_site)
+    key: str | None = None
+    if cache is not None and ttl > 0:
+        key = cache_key(model, prompt, {"max_tokens": max_tokens, "system": system, "prefix": prefix, **kwargs})
+        try:
+            cached = await asyncio.to_thread(cache.get, key)
+        except Exception:
+            logger.warning("LLM 캐시 조회 실패 - 캐시 없이 호출: %s", call_site, exc_info=True)
+            cached = None
+        if cached is not None:
+            response = Message.model_validate(cached)
+            if _accepts(accept, response):
+                llm_metrics.record(call_site, model=model, latency_s=0.0, queue_wait_s=0.0, cached=True)
+                logger.debug("LLM 캐시 적중 %s", call_site)
+                await _emit_text(response, on_text)
+                return response
+            logger.info("LLM 캐시 응답 검증 실패 - 다시 호출: %s", call_site)
+
+    request = {"model": model, "max_tokens": max_tokens, **_build_request(prompt, system, prefix, model), **kwargs}
+    if batch_enabled_in_context():
+        response = await _send_batched(request, call_site=call_site)
+        await _emit_text(response, on_text)
+    else:
+        estimated = estimate_tokens(prompt, system, prefix, str(kwargs.get("tools") or ""))
+        response = await _send(request, call_site=call_site, estimated_input_tokens=estimated, on_text=on_text)
+
+    cacheable = response.stop_reason in _CACHEABLE_STOP_REASONS and _accepts(accept, response)
+    if key is not None and cacheable:
+        try:
+            await asyncio.to_thread(
+                cache.put,
+                key,
+                call_site=call_site,
+                model=model,
+                response=response.model_dump(mode="json"),
+                ttl=ttl,
+            )
+        except Exception:
+            logger.warning("LLM 캐시 저장 실패: %s", call_site, exc_info=True)
+    return response
+
+
+async def complete_text(
+    prompt: str,
+    *,
+    call_site: str,
+    system: str | None = None,
+    prefix: str | None = None,
+    model: str | None = None,
+    max_tokens: int = 4096,
+    on_text: TextCallback | None = None,
+    accept: Callable[[str], bool] | None = None,
+) -> str:
+    """텍스트 응답을 반환한다. on_text가 있으면 생성되는 텍스트 조각을 스트리밍으로 전달한다.
+
+    accept가 있으면 응답 텍스트가 accept를 통과할 때만 응답 캐시에 저장한다.
+    """
+    response = await create_message(
+        prompt,
+        call_site=call_site,
+        system=system,
+        prefix=prefix,
+        model=model,
+        max_tokens=max_tokens,
+        on_text=on_text,
+        accept=None if accept is None else lambda message: accept(message.content[0].text),
+    )
+    return response.content[0].text
+
+
+async def complete_tool(
+    prompt: str,
+    *,
+    tool: dict,
+    call_site: str,
+    system: str | None = None,
+    prefix: str | None = None,
+    model: str | None = None,
+    max_tokens: int = 4096,
+    accept: Callable[[dict], bool] | None = None,
+) -> dict:
+    """tool_use 방식으로 호출하여 도구 입력(dict)을 반환한다.
+
+    tool_use 블록이 있고 (accept가 있으면) 도구 입력이 accept를 통과한 응답만 응답 캐시에 저장한다.
+    """
+
+    def accept_message(message: Message) -> bool:
+        data = _tool_input(message)
+        return data is not None and (accept is None or accept(data))
+
+    response = await create_message(
+        prompt,
+        call_site=call_site,
+        system=system,
+        prefix=prefix,
+        model=model,
+        max_tokens=max_tokens,
+        accept=accept_message,
+        tools=[tool],
+        tool_choice={"type": "tool", "name": tool["name"]},
+    )
+    data = _tool_input(response)
+    if data is None:
+        raise ValueError("LLM이 tool_use 응답을 반환하지 않았습니다.")
+    return data
+
+
+def _tool_input(response: Message) -> dict | None:
+    for block in response.content:
+        if block.type == "tool_use":
+            return block.input
+    return None
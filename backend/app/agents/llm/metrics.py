@@ -0,0 +1,154 @@
+"""LLM 호출 지표 - 호출 위치(call site)별 토큰(프롬프트 캐시 읽기/쓰기 포함)/지연 시간 집계
+
+지연 시간은 호출 위치 × 모델별 히스토그램으로도 모아 모델 티어(빠른 모델/기본 모델)를 비교할 수 있게 한다.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from dataclasses import asdict, dataclass, field
+
+# 지연 시간 히스토그램 버킷 상한(초), 마지막 버킷은 +Inf
+LATENCY_BUCKETS_S: tuple[float, ...] = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+
+@dataclass
+class LatencyHistogram:
+    """고정 버킷 지연 시간 히스토그램"""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_S) + 1))
+    total_s: float = 0.0
+
+    def observe(self, latency_s: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_S, latency_s)] += 1
+        self.total_s += latency_s
+
+    def quantile(self, q: float) -> float | None:
+        """q 분위수가 속한 버킷의 상한(초). +Inf 버킷이면 마지막 유한 상한, 관측값이 없으면 None."""
+        total = sum(self.counts)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BUCKETS_S[min(index, len(LATENCY_BUCKETS_S) - 1)]
+        return LATENCY_BUCKETS_S[-1]
+
+    def snapshot(self) -> dict:
+        calls = sum(self.counts)
+        labels = [f"le_{bound:g}" for bound in LATENCY_BUCKETS_S] + ["le_inf"]
+        return {
+            "calls": calls,
+            "avg_s": round(self.total_s / calls, 4) if calls else 0.0,
+            "p50_s": self.quantile(0.5),
+            "p95_s": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass
+class CallSiteStats:
+    """호출 위치 하나의 누적 지표"""
+
+    calls: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_s: float = 0.0
+    max_latency_s: float = 0.0
+    # 속도 제한 + 동시성 제한으로 대기한 시간
+    queue_wait_s: float = 0.0
+    # 그중 분당 요청/토큰 한도(rate_limiter) 대기열에서 기다린 시간
+    rate_limit_wait_s: float = 0.0
+    # 응답 캐시에서 바로 반환한 호출 수 (calls에 포함, 토큰 비용 없음)
+    cache_hits: int = 0
+    # Anthropic 프롬프트 캐시 읽기/쓰기 토큰 (input_tokens와 별도로 과금)
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    # 스트리밍 호출 수와 첫 텍스트 조각까지 걸린 시간 합계
+    streamed: int = 0
+    first_token_s: float = 0.0
+    # Message Batches API로 보낸 호출 수 (calls에 포함, latency_s는 배치 대기 포함)
+    batched: int = 0
+    # 하위 모델 결과가 검증에 실패해 기본 모델로 다시 호출한 횟수
+    escalations: int = 0
+
+
+class LLMMetrics:
+    """호출 위치별 LLM 지표 집계기 (스레드 안전)"""
+
+    def __init__(self) -> None:
+        self._sites: dict[str, CallSiteStats] = {}
+        self._histograms: dict[str, dict[str, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        call_site: str,
+        *,
+        latency_s: float,
+        model: str | None = None,
+        queue_wait_s: float,
+        rate_limit_wait_s: float = 0.0,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_read_input_tokens: int = 0,
+        cache_creation_input_tokens: int = 0,
+        error: bool = False,
+        cached: bool = False,
+        batched: bool = False,
+        first_token_s: float | None = None,
+    ) -> None:
+        with self._lock:
+            stats = self._sites.setdefault(call_site, CallSiteStats())
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.cache_hits += int(cached)
+            stats.batched += int(batched)
+            if first_token_s is not None:
+                stats.streamed += 1
+                stats.first_token_s += first_token_s
+            stats.input_tokens += input_tokens
+            stats.output_tokens += output_tokens
+            stats.cache_read_input_tokens += cache_read_input_tokens
+            stats.cache_creation_input_tokens += cache_creation_input_tokens
+            stats.latency_s += latency_s
+            stats.max_latency_s = max(stats.max_latency_s, latency_s)
+            stats.queue_wait_s += queue_wait_s
+            stats.rate_limit_wait_s += rate_limit_wait_s
+            # 히스토그램은 실제로 응답을 받은 호출만 (캐시 적중/오류 제외)
+            if model is not None and not cached and not error:
+                self._histograms.setdefault(call_site, {}).setdefault(model, LatencyHistogram()).observe(latency_s)
+
+    def record_escalation(self, call_site: str) -> None:
+        with self._lock:
+            self._sites.setdefault(call_site, CallSiteStats()).escalations += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        """호출 위치별 누적 지표와 평균 지연 시간을 반환한다."""
+        with self._lock:
+            result: dict[str, dict] = {}
+            for call_site, stats in sorted(self._sites.items()):
+                entry = {
+                    key: round(value, 4) if isinstance(value, float) else value
+                    for key, value in asdict(stats).items()
+                }
+                entry["avg_latency_s"] = round(stats.latency_s / stats.calls, 4) if stats.calls else 0.0
+                entry["avg_first_token_s"] = round(stats.first_token_s / stats.streamed, 4) if stats.streamed else 0.0
+                entry["latency_by_model"] = {
+                    model: histogram.snapshot()
+                    for model, histogram in sorted(self._histograms.get(call_site, {}).items())
+                }
+                result[call_site] = entry
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sites.clear()
+            self._histograms.clear()
+
+
+llm_metrics = LLMMetrics()
@@ -0,0 +1,278 @@
+"""LLM 호출 속도 제한 - 분당 요청 수/입력 토큰/출력 토큰 토큰 버킷 + 우선순위 대기열
+
+동시에 몰린 호출이 한꺼번에 429를 받고 LangGraph 재시도 백오프로 밀려나는 대신,
+공급자 한도(RPM, ITPM, OTPM) 안에서 호출을 대기열에 세워 순서대로 내보낸다.
+
+- 버킷: 분당 한도만큼 채워지고 초당 한도/60씩 다시 찬다 (0이면 해당 차원은 제한하지 않음)
+- 입력 토큰: 호출 전 글자 수로 추정해 차감하고, 응답 usage로 실제 값과의 차이를 정산한다
+- 출력 토큰: min(max_tokens, llm_rate_limit_output_estimate_tokens)만큼 예약했다가 실제 output_tokens로 정산한다
+  (max_tokens 전체를 예약하면 OTPM 8000에서 4096 토큰 추출기가 2개씩만 동시에 나간다)
+- 우선순위: interactive(단건 분석) 호출이 bulk(일괄 작업) 호출보다 먼저 버킷을 쓴다, 같은 우선순위는 FIFO
+- 429 응답을 받으면 버킷을 비워 한도가 회복될 때까지 새 호출을 내보내지 않는다
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+
+from app.config import settings
+
+
+class LLMPriority(StrEnum):
+    INTERACTIVE = "interactive"  # 사용자가 기다리는 단건 분석
+    BULK = "bulk"  # 일괄/백그라운드 작업
+
+
+_RANK = {LLMPriority.INTERACTIVE: 0, LLMPriority.BULK: 1}
+
+_priority: ContextVar[LLMPriority] = ContextVar("llm_priority", default=LLMPriority.INTERACTIVE)
+
+
+@contextmanager
+def llm_priority_scope(priority: LLMPriority | str) -> Iterator[None]:
+    """블록 안에서 실행되는 LLM 호출의 대기열 우선순위를 지정한다."""
+    token = _priority.set(LLMPriority(priority))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> LLMPriority:
+    return _priority.get()
+
+
+def estimate_tokens(*texts: str | None) -> int:
+    """입력 토큰 수를 글자 수로 보수적으로 추정한다 (한글 기준 약 1.5자/토큰)."""
+    return int(sum(len(text) for text in texts if text) / settings.llm_rate_limit_chars_per_token) + 1
+
+
+def estimate_output_tokens(max_tokens: int) -> int:
+    """출력 토큰 예약량 - 실제 사용량이 추정치를 넘으면 정산 시 버킷이 빚(음수)이 되어 다음 호출이 기다린다."""
+    estimate = settings.llm_rate_limit_output_estimate_tokens
+    return min(max_tokens, estimate) if estimate > 0 else max_tokens
+
+
+class TokenBucket:
+    """분당 한도를 갖는 토큰 버킷. level은 정산 결과에 따라 음수(빚)가 될 수 있다."""
+
+    def __init__(self, per_minute: int, now: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = now
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """amount만큼 꺼낼 수 있을 때까지 남은 시간(초). 한도보다 큰 요청은 버킷이 가득 차면 허용한다."""
+        self._refill(now)
+        needed = min(amount, self.capacity) - self.level
+        return max(needed / self.rate, 0.0)
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def refund(self, amount: float, now: float) -> None:
+        """예약량과 실제 사용량의 차이를 정산한다 (음수면 추가 차감)."""
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+    def drain(self, now: float) -> None:
+        self._refill(now)
+        self.level = min(self.level, 0.0)
+
+
+@dataclass
+class PriorityWaitStats:
+    """우선순위 하나의 대기 지표"""
+
+    acquired: int = 0
+    wait_s: float = 0.0
+    max_wait_s: float = 0.0
+
+
+@dataclass
+class RateReservation:
+    """acquire가 차감한 양 - 응답 후 settle로 정산한다."""
+
+    model: str
+    input_tokens: int
+    output_tokens: int
+
+
+class _ModelBudget:
+    """모델 하나의 버킷과 대기열 (Anthropic 한도는 모델별로 적용된다)"""
+
+    def __init__(self, model: str, now: float) -> None:
+        limits = {
+            "requests": settings.llm_requests_per_minute,
+            "input_tokens": settings.llm_input_tokens_per_minute,
+            "output_tokens": settings.llm_output_tokens_per_minute,
+            **settings.llm_model_rate_limits.get(model, {}),
+        }
+        self.buckets = {name: TokenBucket(limit, now) for name, limit in limits.items() if limit > 0}
+        self.queue: list[tuple[int, int]] = []
+
+    def time_until(self, cost: dict[str, float], now: float) -> float:
+        return max((bucket.time_until(cost[name], now) for name, bucket in self.buckets.items()), default=0.0)
+
+
+class TokenBudgetLimiter:
+    """모델별 RPM/ITPM/OTPM 토큰 버킷과 우선순위 대기열.
+
+    대기열 맨 앞 호출만 버킷을 확인하고, 나머지는 앞 호출이 나가거나 더 높은 우선순위 호출이 들어올 때 다시 깨어난다.
+    asyncio.Condition은 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만든다 (버킷 잔량은 유지).
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._changed: asyncio.Condition | None = None
+        self._budgets: dict[str, _ModelBudget] = {}
+        self._seq = itertools.count()
+        self._stats = {priority: PriorityWaitStats() for priority in LLMPriority}
+        self._throttled = 0
+        self._lock = threading.Lock()
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._changed is None:
+            self._loop = loop
+            self._changed = asyncio.Condition()
+            for budget in self._budgets.values():
+                budget.queue = []
+        return self._changed
+
+    def _budget(self, model: str) -> _ModelBudget:
+        if model not in self._budgets:
+            self._budgets[model] = _ModelBudget(model, time.monotonic())
+        return self._budgets[model]
+
+    async def acquire(
+        self,
+        model: str,
+        *,
+        input_tokens: int,
+        output_tokens: int,
+        priority: LLMPriority = LLMPriority.INTERACTIVE,
+    ) -> tuple[RateReservation, float]:
+        """버킷에 여유가 생길 때까지 우선순위 순서로 대기한 뒤 차감한다.
+
+        Returns:
+            (예약 내역, 대기 시간(초))
+        """
+        reservation = RateReservation(model=model, input_tokens=input_tokens, output_tokens=output_tokens)
+        if not settings.llm_rate_limit_enabled:
+            return reservation, 0.0
+
+        cost = {"requests": 1, "input_tokens": input_tokens, "output_tokens": output_tokens}
+        changed = self._condition()
+        budget = self._budget(model)
+        ticket = (_RANK[priority], next(self._seq))
+        started = time.monotonic()
+        async with changed:
+            heapq.heappush(budget.queue, ticket)
+            changed.notify_all()  # 맨 앞이 바뀌었을 수 있으므로 대기 중인 호출을 깨운다
+            try:
+                while True:
+                    if budget.queue[0] != ticket:
+                        await changed.wait()
+                        continue
+                    now = time.monotonic()
+                    delay = budget.time_until(cost, now)
+                    if delay <= 0:
+                        for name, bucket in budget.buckets.items():
+                            bucket.take(cost[name], now)
+                        break
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout=delay)
+                    except TimeoutError:
+                        pass
+            finally:
+                budget.queue.remove(ticket)
+                heapq.heapify(budget.queue)
+                changed.notify_all()
+
+        waited = time.monotonic() - started
+        with self._lock:
+            stats = self._stats[priority]
+            stats.acquired += 1
+            stats.wait_s += waited
+            stats.max_wait_s = max(stats.max_wait_s, waited)
+        return reservation, waited
+
+    async def settle(self, reservation: RateReservation, *, input_tokens: int, output_tokens: int) -> None:
+        """응답 usage 기준으로 예약한 토큰을 정산하고, 여유가 늘었으면 대기 중인 호출을 깨운다."""
+        if not settings.llm_rate_limit_enabled:
+            return
+        now = time.monotonic()
+        buckets = self._budget(reservation.model).buckets
+        if "input_tokens" in buckets:
+            buckets["input_tokens"].refund(reservation.input_tokens - input_tokens, now)
+        if "output_tokens" in buckets:
+            buckets["output_tokens"].refund(reservation.output_tokens - output_tokens, now)
+        changed = self._condition()
+        async with changed:
+            changed.notify_all()
+
+    async def release_unused(self, reservation: RateReservation) -> None:
+        """요청이 실패해 토큰을 쓰지 않은 경우 토큰 예약만 돌려준다 (요청 수는 그대로 차감)."""
+        await self.settle(reservation, input_tokens=0, output_tokens=0)
+
+    def throttled(self, model: str) -> None:
+        """429 응답을 받았을 때 해당 모델 버킷을 비워 한도가 회복될 때까지 새 호출을 멈춘다."""
+        if not settings.llm_rate_limit_enabled:
+            return
+        now = time.monotonic()
+        for bucket in self._budget(model).buckets.values():
+            bucket.drain(now)
+        with self._lock:
+            self._throttled += 1
+
+    def stats(self) -> dict:
+        """우선순위별 대기 지표, 모델별 대기열 길이와 버킷 잔량을 반환한다."""
+        with self._lock:
+            priorities = {}
+            for priority, stats in self._stats.items():
+                entry = {
+                    key: round(value, 4) if isinstance(value, float) else value
+                    for key, value in asdict(stats).items()
+                }
+                entry["avg_wait_s"] = round(stats.wait_s / stats.acquired, 4) if stats.acquired else 0.0
+                priorities[priority.value] = entry
+            now = time.monotonic()
+            models = {}
+            for model, budget in sorted(self._budgets.items()):
+                levels = {}
+                for name, bucket in budget.buckets.items():
+                    bucket.time_until(0, now)  # 잔량 갱신
+                    levels[name] = {"level": round(bucket.level, 1), "capacity": bucket.capacity}
+                models[model] = {"queued": len(budget.queue), "buckets": levels}
+            return {
+                "enabled": settings.llm_rate_limit_enabled,
+                "throttled": self._throttled,
+                "priorities": priorities,
+                "models": models,
+            }
+
+    def reset(self) -> None:
+        """버킷을 설정값으로 다시 만들고 지표를 초기화한다."""
+        with self._lock:
+            self._budgets = {}
+            self._stats = {priority: PriorityWaitStats() for priority in LLMPriority}
+            self._throttled = 0
+
+
+rate_limiter = TokenBudgetLimiter()
@@ -2,24 +2,35 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
 
-from anthropic import AsyncAnthropic
-
+from app.agents.llm import batch_enabled_in_context, complete_text, complete_tool, llm_metrics, model_for
 from app.agents.prompts.document_prompts import (
     APPRAISAL_EXTRACTION_PROMPT,
     CLASSIFY_PROMPT,
+    DOCUMENT_TEXT_TEMPLATE,
+    EXTRACTION_SYSTEM_PROMPT,
     REGISTRY_EXTRACTION_PROMPT,
     SALE_ITEM_EXTRACTION_PROMPT,
     STATUS_REPORT_EXTRACTION_PROMPT,
+    STRUCTURED_EXTRACTION_PROMPT,
+    STRUCTURED_EXTRACTION_SYSTEM_PROMPT,
 )
 from app.agents.state import AgentState
-from app.agents.tools.pdf_extractor import extract_text_from_pdf
+from app.agents.tools.document_classifier import classifier_stats, classify_by_rules
+from app.agents.tools.pdf_extractor import iter_pdf_pages
+from app.agents.tools.section_splitter import EXTRACTOR_SECTIONS, slice_for_extractor, split_sections
 from app.config import settings
 from app.schemas.document import (
     AppraisalExtraction,
+    DocumentType,
     OccupancyInfo,
     RegistryExtraction,
     RightEntry,
@@ -29,14 +40,13 @@ from app.schemas.document import (
 
 logger = logging.getLogger(__name__)
 
-_client: AsyncAnthropic | None = None
+T = TypeVar("T")
+R = TypeVar("R")
 
+_DOCUMENT_TYPES = {doc_type.value for doc_type in DocumentType}
 
-def _get_client() -> AsyncAnthropic:
-    global _client
-    if _client is None:
-        _client = AsyncAnthropic(api_key=settings.anthropic_api_key)
-    return _client
+# 문서 분류에 사용하는 앞부분 글자 수 (이만큼 읽히면 나머지 페이지 추출과 병행해 분류 시작)
+CLASSIFY_PREFIX_CHARS = 2000
 
 
 def _fix_json(text: str) -> str:
@@ -66,35 +76,297 @@ def _parse_json_response(text: str) -> dict:
     return _try_parse(text.strip())
 
 
-async def _call_llm(prompt: str, max_tokens: int = 4096) -> str:
-    """Anthropic Claude API를 호출한다."""
-    client = _get_client()
-    response = await client.messages.create(
-        model="claude-sonnet-4-5-20250929",
+# 노드가 state에 채우는 추출 결과 필드 (단독 문서 유형 이름과 동일)
+EXTRACTION_FIELDS = ("registry", "appraisal", "sale_item", "status_report")
+
+# ---------------------------------------------------------------------------
+# tool_use 구조화 추출 스키마 (document_extraction_mode="combined")
+# ---------------------------------------------------------------------------
+
+_RIGHT_ENTRY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "order": {"type": "integer", "description": "순위번호"},
+        "right_type": {"type": "string", "description": "권리종류 (소유권이전, 근저당권설정, 가압류 등)"},
+        "holder": {"type": "string", "description": "권리자"},
+        "amount": {"type": ["integer", "null"], "description": "채권액 (원)"},
+        "registration_date": {"type": ["string", "null"], "description": "접수일자 YYYY-MM-DD"},
+    },
+    "required": ["order", "right_type", "holder"],
+}
+
+_OCCUPANCY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "occupant_name": {"type": "string"},
+        "occupant_type": {"type": "string", "enum": ["임차인", "소유자", "기타"]},
+        "deposit": {"type": ["integer", "null"], "description": "보증금 (원)"},
+        "monthly_rent": {"type": ["integer", "null"], "description": "월세 (원)"},
+        "move_in_date": {"type": ["string", "null"], "description": "전입일 YYYY-MM-DD"},
+        "confirmed_date": {"type": ["string", "null"], "description": "확정일자 YYYY-MM-DD"},
+        "dividend_applied": {"type": "boolean", "description": "배당요구/배당신청 여부"},
+    },
+    "required": ["occupant_name", "occupant_type"],
+}
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+EXTRACTION_SCHEMAS: dict[str, dict] = {
+    "registry": {
+        "type": ["object", "null"],
+        "description": "등기부등본 정보",
+        "properties": {
+            "property_address": {"type": "string", "description": "소재지"},
+            "property_type": {"type": "string", "description": "아파트, 다세대, 연립, 다가구, 오피스텔, 상가, 토지 등"},
+            "area": {"type": ["number", "null"], "description": "전용면적 (㎡)"},
+            "building_name": {"type": ["string", "null"], "description": "아파트/건물 단지명"},
+            "owner": {"type": ["string", "null"], "description": "현 소유자"},
+            "section_a_entries": {"type": "array", "items": _RIGHT_ENTRY_SCHEMA, "description": "갑구 사항"},
+            "section_b_entries": {"type": "array", "items": _RIGHT_ENTRY_SCHEMA, "description": "을구 사항"},
+        },
+        "required": ["property_address", "property_type", "section_a_entries", "section_b_entries"],
+    },
+    "appraisal": {
+        "type": ["object", "null"],
+        "description": "감정평가 정보",
+        "properties": {
+            "appraised_value": {"type": "integer", "description": "감정가 (원)"},
+            "land_value": {"type": ["integer", "null"], "description": "토지 평가액 (원)"},
+            "building_value": {"type": ["integer", "null"], "description": "건물 평가액 (원)"},
+            "land_area": {"type": ["number", "null"], "description": "토지(대지권) 면적 (㎡)"},
+            "building_area": {"type": ["number", "null"], "description": "건물 전용면적 (㎡)"},
+        },
+        "required": ["appraised_value"],
+    },
+    "sale_item": {
+        "type": ["object", "null"],
+        "description": "매각물건명세서 정보",
+        "properties": {
+            "case_number": {"type": "string", "description": "사건번호 (예: 2025타경33712)"},
+            "property_address": {"type": "string", "description": "소재지"},
+            "occupancy_info": {"type": "array", "items": _OCCUPANCY_SCHEMA, "description": "점유관계"},
+            "assumed_rights": {**_STRING_LIST, "description": "인수할 권리"},
+            "special_conditions": {**_STRING_LIST, "description": "특별매각조건"},
+        },
+        "required": ["case_number", "property_address", "occupancy_info", "assumed_rights", "special_conditions"],
+    },
+    "status_report": {
+        "type": ["object", "null"],
+        "description": "현황조사보고서 정보",
+        "properties": {
+            "investigation_date": {"type": ["string", "null"], "description": "조사일자 YYYY-MM-DD"},
+            "property_address": {"type": "string", "description": "소재지"},
+            "current_occupant": {"type": ["string", "null"], "description": "현 점유자"},
+            "occupancy_status": {"type": ["string", "null"], "description": "거주중, 공실, 영업중 등"},
+            "building_condition": {"type": ["string", "null"], "description": "양호, 보통, 불량 등"},
+            "access_road": {"type": ["string", "null"], "description": "접근도로 상태"},
+            "surroundings": {"type": ["string", "null"], "description": "주변 환경"},
+            "special_notes": {**_STRING_LIST, "description": "특이사항"},
+        },
+        "required": ["property_address", "special_notes"],
+    },
+}
+
+
+def _extraction_tool(fields: tuple[str, ...]) -> dict:
+    """지정한 유형만 담은 save_document_extraction 도구 정의를 만든다."""
+    return {
+        "name": "save_document_extraction",
+        "description": "문서에서 추출한 구조화 정보를 유형별로 저장합니다. 문서에 없는 유형은 null입니다.",
+        "input_schema": {
+            "type": "object",
+            "properties": {field_name: EXTRACTION_SCHEMAS[field_name] for field_name in fields},
+            "required": list(fields),
+        },
+    }
+
+
+DOCUMENT_EXTRACTION_TOOL = _extraction_tool(EXTRACTION_FIELDS)
+
+
+async def _call_llm(
+    prompt: str,
+    max_tokens: int = 4096,
+    *,
+    call_site: str = "document_parser",
+    system: str | None = None,
+    prefix: str | None = None,
+    model: str | None = None,
+    accept: Callable[[str], bool] | None = None,
+) -> str:
+    """LLM 게이트웨이를 통해 Claude를 호출한다 (accept를 통과한 응답만 응답 캐시에 저장)."""
+    return await complete_text(
+        prompt,
+        call_site=call_site,
+        system=system,
+        prefix=prefix,
+        model=model,
         max_tokens=max_tokens,
-        messages=[{"role": "user", "content": prompt}],
+        accept=accept,
+    )
+
+
+def _usable(parse: Callable[[R], T], accept: Callable[[T], bool] | None = None) -> Callable[[R], bool]:
+    """응답이 파싱되고 (accept가 있으면) 검증도 통과하는지 확인하는 응답 캐시 저장 조건을 만든다."""
+
+    def check(raw: R) -> bool:
+        try:
+            value = parse(raw)
+        except Exception:
+            return False
+        return accept is None or accept(value)
+
+    return check
+
+
+async def _escalate(
+    call: Callable[[str, Callable[[R], bool]], Awaitable[R]],
+    parse: Callable[[R], T],
+    *,
+    call_site: str,
+    accept: Callable[[T], bool] | None = None,
+) -> T:
+    """라우팅된 모델로 call(모델, 응답 캐시 저장 조건)을 실행하고, 파싱/검증에 실패하면 기본 모델로 한 번 더 실행한다.
+
+    파싱/검증에 실패한 응답은 응답 캐시에 남기지 않는다 (다시 분석할 때 같은 실패를 재사용하지 않도록).
+    """
+    model = model_for(call_site)
+    escalates = model != settings.llm_model
+    raw = await call(model, _usable(parse, accept if escalates else None))
+    if not escalates:
+        return parse(raw)
+    try:
+        value = parse(raw)
+    except Exception as exc:
+        reason = f"응답 파싱 실패 ({exc})"
+    else:
+        if accept is None or accept(value):
+            return value
+        reason = "결과 검증 실패"
+
+    llm_metrics.record_escalation(call_site)
+    logger.info("%s: %s %s - %s로 재호출", call_site, model, reason, settings.llm_model)
+    return parse(await call(settings.llm_model, _usable(parse)))
+
+
+async def _call_with_escalation(
+    prompt: str,
+    parse: Callable[[str], T],
+    *,
+    call_site: str,
+    accept: Callable[[T], bool] | None = None,
+    max_tokens: int = 4096,
+    system: str | None = None,
+    prefix: str | None = None,
+) -> T:
+    """텍스트 응답을 호출 위치에 라우팅된 모델로 받고, 파싱/검증에 실패하면 기본 모델로 다시 받는다 (_escalate)."""
+
+    async def call(model: str, cache_accept: Callable[[str], bool]) -> str:
+        return await _call_llm(
+            prompt,
+            max_tokens,
+            call_site=call_site,
+            system=system,
+            prefix=prefix,
+            model=model,
+            accept=cache_accept,
+        )
+
+    return await _escalate(call, parse, call_site=call_site, accept=accept)
+
+
+async def _call_extraction_llm(
+    instructions: str,
+    text: str,
+    parse: Callable[[str], T],
+    *,
+    call_site: str,
+    shared_document: bool,
+    accept: Callable[[T], bool] | None = None,
+) -> T:
+    """추출 프롬프트를 프롬프트 캐시에 맞게 배치해 호출한다.
+
+    - 기본: system → 추출기 지시문 → 문서 텍스트(마지막). 지시문은 캐시 최소 길이보다 짧아 캐시되지 않는다
+    - shared_document: 같은 원문을 여러 추출기가 쓰는 경우 문서 텍스트를 캐시 접두부로 두고 지시문을 마지막에 둔다
+      (섹션 분할이 켜져 있으면 추출기별 텍스트가 보통 달라서 이 경우는 드물다)
+    """
+    document = DOCUMENT_TEXT_TEMPLATE.format(text=text)
+    prompt, prefix = (instructions, document) if shared_document else (document, instructions)
+    return await _call_with_escalation(
+        prompt,
+        parse,
+        call_site=call_site,
+        accept=accept,
+        system=EXTRACTION_SYSTEM_PROMPT,
+        prefix=prefix,
+    )
+
+
+async def _call_llm_structured(
+    prompt: str,
+    *,
+    tool: dict,
+    call_site: str,
+    max_tokens: int = 8192,
+    model: str | None = None,
+    accept: Callable[[dict], bool] | None = None,
+) -> dict:
+    """LLM 게이트웨이를 통해 tool_use 방식으로 Claude를 호출하여 도구 입력(dict)을 반환한다."""
+    return await complete_tool(
+        prompt,
+        tool=tool,
+        call_site=call_site,
+        system=STRUCTURED_EXTRACTION_SYSTEM_PROMPT,
+        prefix=STRUCTURED_EXTRACTION_PROMPT,
+        model=model,
+        max_tokens=max_tokens,
+        accept=accept,
     )
-    return response.content[0].text
 
 
 async def classify_document(text: str) -> tuple[str, float]:
     """문서 유형을 분류한다.
 
+    앞 CLASSIFY_PREFIX_CHARS 글자를 규칙 기반 분류기로 먼저 판별하고,
+    confidence가 classify_rule_min_confidence 미만일 때만 LLM을 호출한다.
+    LLM 분류는 라우팅된 모델(기본: 빠른 모델)로 먼저 하고, confidence가 llm_escalation_min_confidence
+    미만이거나 알 수 없는 유형이면 기본 모델로 다시 분류한다.
+
     Returns:
         (document_type, confidence)
     """
-    prompt = CLASSIFY_PROMPT.format(text=text[:2000])
-    raw = await _call_llm(prompt, max_tokens=200)
+    prefix = text[:CLASSIFY_PREFIX_CHARS]
+    if settings.classify_fast_path_enabled:
+        doc_type, confidence = classify_by_rules(prefix)
+        if confidence >= settings.classify_rule_min_confidence:
+            classifier_stats.record("rule")
+            logger.debug("규칙 기반 분류: %s (confidence=%.2f)", doc_type, confidence)
+            return doc_type, confidence
+        logger.debug("규칙 기반 분류 신뢰도 부족 (%s, %.2f) - LLM 분류", doc_type, confidence)
+
+    classifier_stats.record("llm")
+    prompt = CLASSIFY_PROMPT.format(text=prefix)
+    return await _call_with_escalation(
+        prompt,
+        _parse_classification,
+        call_site="document_parser.classify",
+        accept=_is_confident_classification,
+        max_tokens=200,
+    )
+
+
+def _parse_classification(raw: str) -> tuple[str, float]:
     data = _parse_json_response(raw)
     return data["document_type"], float(data.get("confidence", 0.0))
 
 
-async def extract_registry_data(text: str) -> RegistryExtraction:
-    """등기부등본에서 구조화된 데이터를 추출한다."""
-    prompt = REGISTRY_EXTRACTION_PROMPT.format(text=text)
-    raw = await _call_llm(prompt)
-    data = _parse_json_response(raw)
+def _is_confident_classification(result: tuple[str, float]) -> bool:
+    doc_type, confidence = result
+    return doc_type in _DOCUMENT_TYPES and confidence >= settings.llm_escalation_min_confidence
+
 
+def _registry_from_dict(data: dict) -> RegistryExtraction:
+    """등기부등본 추출 결과(dict)를 dataclass로 변환한다."""
     section_a = [
         RightEntry(
             order=e.get("order", 0),
@@ -127,12 +399,8 @@ async def extract_registry_data(text: str) -> RegistryExtraction:
     )
 
 
-async def extract_appraisal_data(text: str) -> AppraisalExtraction:
-    """감정평가서에서 구조화된 데이터를 추출한다."""
-    prompt = APPRAISAL_EXTRACTION_PROMPT.format(text=text)
-    raw = await _call_llm(prompt)
-    data = _parse_json_response(raw)
-
+def _appraisal_from_dict(data: dict) -> AppraisalExtraction:
+    """감정평가서 추출 결과(dict)를 dataclass로 변환한다."""
     return AppraisalExtraction(
         appraised_value=int(data.get("appraised_value") or 0),
         land_value=data.get("land_value"),
@@ -142,12 +410,8 @@ async def extract_appraisal_data(text: str) -> AppraisalExtraction:
     )
 
 
-async def extract_status_report_data(text: str) -> StatusReportExtraction:
-    """현황조사보고서에서 구조화된 데이터를 추출한다."""
-    prompt = STATUS_REPORT_EXTRACTION_PROMPT.format(text=text)
-    raw = await _call_llm(prompt)
-    data = _parse_json_response(raw)
-
+def _status_report_from_dict(data: dict) -> StatusReportExtraction:
+    """현황조사보고서 추출 결과(dict)를 dataclass로 변환한다."""
     return StatusReportExtraction(
         investigation_date=data.get("investigation_date"),
         property_address=data.get("property_address", ""),
@@ -160,12 +424,8 @@ async def extract_status_report_data(text: str) -> StatusReportExtraction:
     )
 
 
-async def extract_sale_item_data(text: str) -> SaleItemExtraction:
-    """매각물건명세서에서 구조화된 데이터를 추출한다."""
-    prompt = SALE_ITEM_EXTRACTION_PROMPT.format(text=text)
-    raw = await _call_llm(prompt)
-    data = _parse_json_response(raw)
-
+def _sale_item_from_dict(data: dict) -> SaleItemExtraction:
+    """매각물건명세서 추출 결과(dict)를 dataclass로 변환한다."""
     occupancy = [
         OccupancyInfo(
             occupant_name=o.get("occupant_name", ""),
@@ -188,70 +448,328 @@ async def extract_sale_item_data(text: str) -> SaleItemExtraction:
     )
 
 
+async def extract_registry_data(text: str, *, shared_document: bool = False) -> RegistryExtraction:
+    """등기부등본에서 구조화된 데이터를 추출한다."""
+    return await _call_extraction_llm(
+        REGISTRY_EXTRACTION_PROMPT,
+        text,
+        lambda raw: _registry_from_dict(_parse_json_response(raw)),
+        call_site="document_parser.registry",
+        shared_document=shared_document,
+        accept=_EXTRACTION_ACCEPT["registry"],
+    )
+
+
+async def extract_appraisal_data(text: str, *, shared_document: bool = False) -> AppraisalExtraction:
+    """감정평가서에서 구조화된 데이터를 추출한다."""
+    return await _call_extraction_llm(
+        APPRAISAL_EXTRACTION_PROMPT,
+        text,
+        lambda raw: _appraisal_from_dict(_parse_json_response(raw)),
+        call_site="document_parser.appraisal",
+        shared_document=shared_document,
+        accept=_EXTRACTION_ACCEPT["appraisal"],
+    )
+
+
+async def extract_status_report_data(text: str, *, shared_document: bool = False) -> StatusReportExtraction:
+    """현황조사보고서에서 구조화된 데이터를 추출한다."""
+    return await _call_extraction_llm(
+        STATUS_REPORT_EXTRACTION_PROMPT,
+        text,
+        lambda raw: _status_report_from_dict(_parse_json_response(raw)),
+        call_site="document_parser.status_report",
+        shared_document=shared_document,
+        accept=_EXTRACTION_ACCEPT["status_report"],
+    )
+
+
+async def extract_sale_item_data(text: str, *, shared_document: bool = False) -> SaleItemExtraction:
+    """매각물건명세서에서 구조화된 데이터를 추출한다."""
+    return await _call_extraction_llm(
+        SALE_ITEM_EXTRACTION_PROMPT,
+        text,
+        lambda raw: _sale_item_from_dict(_parse_json_response(raw)),
+        call_site="document_parser.sale_item",
+        shared_document=shared_document,
+        accept=_EXTRACTION_ACCEPT["sale_item"],
+    )
+
+
+_FROM_DICT: dict[str, Callable[[dict], object]] = {
+    "registry": _registry_from_dict,
+    "appraisal": _appraisal_from_dict,
+    "sale_item": _sale_item_from_dict,
+    "status_report": _status_report_from_dict,
+}
+
+# 추출 결과가 쓸 만한지 판단하는 검증 (실패하면 빠른 모델 결과를 버리고 기본 모델로 다시 추출)
+_EXTRACTION_ACCEPT: dict[str, Callable[[Any], bool]] = {
+    "registry": lambda r: bool(r.property_address),
+    "appraisal": lambda r: r.appraised_value > 0,
+    "sale_item": lambda r: bool(r.case_number or r.occupancy_info),
+    "status_report": lambda r: bool(r.property_address or r.current_occupant or r.occupancy_status),
+}
+
+
+async def extract_structured_data(
+    text: str,
+    fields: tuple[str, ...] = EXTRACTION_FIELDS,
+) -> dict[str, object | None]:
+    """tool_use 호출 한 번으로 여러 유형의 구조화 데이터를 추출한다.
+
+    도구 스키마가 응답 형식을 보장하므로 JSON 파싱 실패가 없고, 복합문서는 4번의 호출이 1번으로 줄어든다.
+    호출 위치가 빠른 모델로 라우팅되어 있으면(단독 감정평가서/현황조사보고서 등) 유형별 추출과 같은 검증을 거쳐
+    실패하면 기본 모델로 다시 추출한다.
+
+    Returns:
+        {유형: 추출 결과 dataclass}, 문서에 없는 유형은 None
+    """
+    call_site = "document_parser.combined" if len(fields) > 1 else f"document_parser.{fields[0]}"
+    prompt = DOCUMENT_TEXT_TEMPLATE.format(text=text)
+    tool = _extraction_tool(fields)
+
+    def parse(data: dict) -> dict[str, object | None]:
+        return {
+            field_name: _FROM_DICT[field_name](data[field_name]) if isinstance(data.get(field_name), dict) else None
+            for field_name in fields
+        }
+
+    def accept(result: dict[str, object | None]) -> bool:
+        present = [field_name for field_name in fields if result[field_name] is not None]
+        return bool(present) and all(_EXTRACTION_ACCEPT[field_name](result[field_name]) for field_name in present)
+
+    async def call(model: str, cache_accept: Callable[[dict], bool]) -> dict:
+        return await _call_llm_structured(prompt, tool=tool, call_site=call_site, model=model, accept=cache_accept)
+
+    return await _escalate(call, parse, call_site=call_site, accept=accept)
+
+
+@dataclass
+class _FileParseResult:
+    """파일 하나의 파싱 결과 (병합 전)"""
+
+    index: int
+    file_path: str
+    doc_type: str | None = None
+    confidence: float = 0.0
+    extractions: dict[str, object] = field(default_factory=dict)
+    # 추출기별 소요 시간(초) - 복합문서 병렬 추출 시 기록
+    timings: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+
+def _slice_auction_summary(text: str) -> dict[str, str]:
+    """복합문서를 섹션별로 잘라 추출기별 입력 텍스트를 만든다 (비활성화 시 모두 원문)."""
+    if not settings.section_slicing_enabled:
+        return {extractor: text for extractor in EXTRACTOR_SECTIONS}
+
+    sections = split_sections(text)
+    slices = {extractor: slice_for_extractor(text, extractor, sections) for extractor in EXTRACTOR_SECTIONS}
+    logger.info(
+        "복합문서 섹션 분할: 원문 %d자, 섹션 %d개 → %s",
+        len(text),
+        len(sections),
+        ", ".join(f"{extractor}={len(sliced)}자" for extractor, sliced in slices.items()),
+    )
+    return slices
+
+
+async def _read_and_classify(file_path: str) -> tuple[str, str, float] | None:
+    """PDF 페이지를 스트리밍으로 읽으면서 앞부분이 모이는 즉시 문서 분류를 시작한다.
+
+    분류는 앞 CLASSIFY_PREFIX_CHARS 글자만 사용하므로 나머지 페이지 추출/OCR과 겹쳐 실행된다.
+
+    Returns:
+        (전체 텍스트, document_type, confidence), 추출된 텍스트가 없으면 None
+    """
+    parts: list[str] = []
+    length = 0
+    classify_task: asyncio.Task[tuple[str, float]] | None = None
+    try:
+        async for page_text in iter_pdf_pages(file_path):
+            parts.append(page_text + "\n")
+            length += len(page_text) + 1
+            if classify_task is None and length >= CLASSIFY_PREFIX_CHARS:
+                prefix = "".join(parts)[:CLASSIFY_PREFIX_CHARS]
+                if prefix.strip():
+                    logger.debug("문서 분류 조기 시작 (%d페이지 읽음): %s", len(parts), file_path)
+                    classify_task = asyncio.create_task(classify_document(prefix))
+
+        text = "".join(parts)
+        if not text.strip():
+            return None
+        if classify_task is None:
+            classify_task = asyncio.create_task(classify_document(text))
+        doc_type, confidence = await classify_task
+    except BaseException:
+        if classify_task is not None:
+            classify_task.cancel()
+        raise
+    return text, doc_type, confidence
+
+
+async def _timed_extract(
+    label: str,
+    extract: Callable[..., Awaitable[object]],
+    text: str,
+    **kwargs: object,
+) -> tuple[object | None, float]:
+    """추출기 하나를 실행하고 (결과, 소요 시간)을 반환한다. 실패는 경고 로그만 남기고 None으로 격리한다."""
+    started = time.perf_counter()
+    try:
+        value = await extract(text, **kwargs)
+    except Exception as exc:
+        elapsed = time.perf_counter() - started
+        logger.warning("복합문서 %s 추출 실패 (%.2fs): %s", label, elapsed, exc)
+        return None, elapsed
+    return value, time.perf_counter() - started
+
+
+async def _run_auction_extractors(
+    extractors: dict[str, tuple[str, Callable[..., Awaitable[object]]]],
+    slices: dict[str, str],
+) -> list[tuple[object | None, float]]:
+    """복합문서 추출기들을 동시에 실행한다.
+
+    여러 추출기가 같은 텍스트를 받으면(섹션 분할 비활성화, 앵커 미검출 등) 문서 텍스트를 공유 캐시 접두부로 보내고,
+    llm_prompt_cache_warmup이면 그중 첫 추출기가 끝나 캐시가 채워진 뒤에 나머지를 호출한다
+    (동시에 보내면 모두 캐시 쓰기가 되어 절감 효과가 없다).
+    배치 모드에서는 첫 호출이 배치 한 번을 통째로 기다리게 되므로 미리 채우지 않고 모두 같은 배치로 보낸다.
+    """
+    text_counts: dict[str, int] = {}
+    for sliced in slices.values():
+        text_counts[sliced] = text_counts.get(sliced, 0) + 1
+    warmup = settings.llm_prompt_cache_warmup and not batch_enabled_in_context()
+    warmed: dict[str, asyncio.Event] = {}
+
+    async def run(field_name: str, label: str, extract: Callable[..., Awaitable[object]]):
+        sliced = slices[field_name]
+        shared = text_counts[sliced] > 1
+        if not (shared and warmup):
+            return await _timed_extract(label, extract, sliced, shared_document=shared)
+        if sliced in warmed:
+            await warmed[sliced].wait()
+            return await _timed_extract(label, extract, sliced, shared_document=True)
+        warmed[sliced] = asyncio.Event()
+        try:
+            return await _timed_extract(label, extract, sliced, shared_document=True)
+        finally:
+            warmed[sliced].set()
+
+    return await asyncio.gather(
+        *[run(field_name, label, extract) for field_name, (label, extract) in extractors.items()]
+    )
+
+
+async def _parse_file(index: int, file_path: str) -> _FileParseResult:
+    """파일 하나를 추출 → 분류 → 유형별 구조화까지 처리한다 (오류는 결과에 기록)."""
+    result = _FileParseResult(index=index, file_path=file_path)
+    try:
+        parsed = await _read_and_classify(file_path)
+        if parsed is None:
+            result.error = f"텍스트 추출 실패: {file_path}"
+            return result
+
+        text, doc_type, confidence = parsed
+        result.doc_type, result.confidence = doc_type, confidence
+        logger.info("문서 분류: %s (confidence=%.2f) - %s", doc_type, confidence, file_path)
+
+        if doc_type == "auction_summary" and settings.document_extraction_mode == "combined":
+            # 복합문서: tool_use 한 번으로 4가지 유형을 함께 추출 (섹션 합집합이 사실상 원문이므로 원문 전달)
+            logger.info("복합문서 감지 - tool_use 통합 추출 시작")
+            value, elapsed = await _timed_extract("통합", extract_structured_data, text)
+            extracted = value or {}
+            for field_name in EXTRACTION_FIELDS:
+                result.extractions[field_name] = extracted.get(field_name)
+            result.timings["combined"] = elapsed
+            logger.info("복합문서 통합 추출 소요 시간: %.2fs - %s", elapsed, file_path)
+        elif doc_type == "auction_summary":
+            # 복합문서: 4가지 추출을 동시에 시도 (개별 실패 허용)
+            # 추출기마다 관련 섹션만 전달해 입력 토큰을 줄인다
+            logger.info("복합문서 감지 - 등기/감정/매각/현황조사 정보 통합 추출 시작")
+            slices = _slice_auction_summary(text)
+            extractors = {
+                "registry": ("등기", extract_registry_data),
+                "appraisal": ("감정", extract_appraisal_data),
+                "sale_item": ("매각", extract_sale_item_data),
+                "status_report": ("현황조사", extract_status_report_data),
+            }
+            outcomes = await _run_auction_extractors(extractors, slices)
+            for field_name, (value, elapsed) in zip(extractors, outcomes):
+                result.extractions[field_name] = value
+                result.timings[field_name] = elapsed
+            logger.info(
+                "복합문서 추출 소요 시간: %s - %s",
+                ", ".join(f"{name}={elapsed:.2f}s" for name, elapsed in result.timings.items()),
+                file_path,
+            )
+        elif doc_type in EXTRACTION_FIELDS and settings.document_extraction_mode == "combined":
+            extracted = await extract_structured_data(text, (doc_type,))
+            result.extractions[doc_type] = extracted[doc_type]
+        elif doc_type == "registry":
+            result.extractions["registry"] = await extract_registry_data(text)
+        elif doc_type == "appraisal":
+            result.extractions["appraisal"] = await extract_appraisal_data(text)
+        elif doc_type == "sale_item":
+            result.extractions["sale_item"] = await extract_sale_item_data(text)
+        elif doc_type == "status_report":
+            result.extractions["status_report"] = await extract_status_report_data(text)
+        else:
+            logger.info("지원하지 않는 문서 유형 건너뜀: %s", doc_type)
+    except Exception as exc:
+        logger.exception("문서 파싱 오류: %s", file_path)
+        result.error = f"문서 파싱 오류 ({file_path}): {exc}"
+    return result
+
+
+def _merge_results(results: list[_FileParseResult]) -> dict:
+    """파일별 결과를 유형별로 하나씩 고른다 (입력 순서와 완료 순서에 무관하게 결정적).
+
+    같은 유형이 여러 파일에서 나오면 단독 문서 > 복합문서, 그다음 분류 confidence가 높은 쪽을 택하고,
+    그래도 같으면 file_paths 앞쪽 파일을 유지한다.
+    """
+    merged: dict = {field_name: None for field_name in EXTRACTION_FIELDS}
+    ranks: dict[str, tuple[bool, float]] = {}
+    errors: list[str] = []
+    for result in sorted(results, key=lambda r: r.index):
+        if result.error:
+            errors.append(result.error)
+        for field_name, value in result.extractions.items():
+            if value is None:
+                continue
+            rank = (result.doc_type == field_name, result.confidence)
+            if field_name in ranks:
+                logger.info(
+                    "%s 중복 추출 - %s 결과 선택: %s",
+                    field_name,
+                    "새" if rank > ranks[field_name] else "기존",
+                    result.file_path,
+                )
+            if field_name not in ranks or rank > ranks[field_name]:
+                ranks[field_name] = rank
+                merged[field_name] = value
+    if errors:
+        merged["errors"] = errors
+    return merged
+
+
 async def document_parser_node(state: AgentState) -> dict:
     """문서 파싱 에이전트 노드.
 
     처리 흐름:
-    1. 각 PDF 파일에서 텍스트 추출
-    2. 문서 유형 분류
+    1. 각 PDF 파일에서 페이지 단위로 텍스트 추출 (스트리밍)
+    2. 문서 유형 분류 (앞부분이 추출되는 즉시 시작)
     3. 유형별 LLM 기반 데이터 구조화
     4. 파싱 결과를 partial dict로 반환
+
+    파일들은 document_parse_concurrency개까지 동시에 처리하고, 결과는 _merge_results로 병합한다.
     """
-    registry: RegistryExtraction | None = None
-    appraisal: AppraisalExtraction | None = None
-    sale_item: SaleItemExtraction | None = None
-    status_report: StatusReportExtraction | None = None
-    new_errors: list[str] = []
+    sem = asyncio.Semaphore(max(1, settings.document_parse_concurrency))
 
-    for file_path in state["file_paths"]:
-        try:
-            text, _tables = await extract_text_from_pdf(file_path)
-            if not text.strip():
-                new_errors.append(f"텍스트 추출 실패: {file_path}")
-                continue
+    async def parse_one(index: int, file_path: str) -> _FileParseResult:
+        async with sem:
+            return await _parse_file(index, file_path)
 
-            doc_type, confidence = await classify_document(text)
-            logger.info("문서 분류: %s (confidence=%.2f) - %s", doc_type, confidence, file_path)
-
-            if doc_type == "auction_summary":
-                # 복합문서: 3가지 추출을 모두 시도 (개별 실패 허용)
-                logger.info("복합문서 감지 - 등기/감정/매각 정보 통합 추출 시작")
-                try:
-                    registry = await extract_registry_data(text)
-                except Exception as exc:
-                    logger.warning("복합문서 등기 추출 실패: %s", exc)
-                try:
-                    appraisal = await extract_appraisal_data(text)
-                except Exception as exc:
-                    logger.warning("복합문서 감정 추출 실패: %s", exc)
-                try:
-                    sale_item = await extract_sale_item_data(text)
-                except Exception as exc:
-                    logger.warning("복합문서 매각 추출 실패: %s", exc)
-                try:
-                    status_report = await extract_status_report_data(text)
-                except Exception as exc:
-                    logger.warning("복합문서 현황조사 추출 실패: %s", exc)
-            elif doc_type == "registry":
-                registry = await extract_registry_data(text)
-            elif doc_type == "appraisal":
-                appraisal = await extract_appraisal_data(text)
-            elif doc_type == "sale_item":
-                sale_item = await extract_sale_item_data(text)
-            elif doc_type == "status_report":
-                status_report = await extract_status_report_data(text)
-            else:
-                logger.info("지원하지 않는 문서 유형 건너뜀: %s", doc_type)
-        except Exception as exc:
-            logger.exception("문서 파싱 오류: %s", file_path)
-            new_errors.append(f"문서 파싱 오류 ({file_path}): {exc}")
-
-    result: dict = {
-        "registry": registry,
-        "appraisal": appraisal,
-        "sale_item": sale_item,
-        "status_report": status_report,
-    }
-    if new_errors:
-        result["errors"] = new_errors
-    return result
+    results = await asyncio.gather(*[parse_one(i, path) for i, path in enumerate(state["file_paths"])])
+    return _merge_results(list(results))
@@ -2,14 +2,13 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
-from datetime import date, timedelta
 from statistics import mean
 
 from app.agents.state import AgentState
 from app.agents.tools.address_converter import address_to_lawd_code
-from app.agents.tools.real_estate_api import fetch_transactions, resolve_property_type
+from app.agents.tools.real_estate_api import resolve_property_type
+from app.agents.tools.transaction_store import COLLECTION_MONTHS, load_transactions, recent_deal_ymds
 from app.schemas.market import MarketDataResult, MonthlyPrice, RentTransaction, Transaction
 
 logger = logging.getLogger(__name__)
@@ -220,26 +219,8 @@ async def _collect_transactions(
     transaction_type: str,
     months: int = 12,
 ) -> list[dict]:
-    """최근 N개월간 거래 데이터를 병렬로 수집한다."""
-    today = date.today()
-    # 중복 제거된 연월 목록 생성
-    deal_ymds: set[str] = set()
-    for months_ago in range(months):
-        target_date = today - timedelta(days=30 * months_ago)
-        deal_ymds.add(target_date.strftime("%Y%m"))
-
-    sem = asyncio.Semaphore(10)
-
-    async def fetch_one(deal_ymd: str) -> list[dict]:
-        async with sem:
-            try:
-                return await fetch_transactions(lawd_code, deal_ymd, base_type, transaction_type)
-            except Exception as exc:
-                logger.warning("  MOLIT %s API 호출 실패 [%s]: %s", transaction_type, deal_ymd, exc)
-                return []
-
-    results = await asyncio.gather(*[fetch_one(ymd) for ymd in sorted(deal_ymds, reverse=True)])
-    return [t for txns in results for t in txns]
+    """최근 N개월간 거래 데이터를 수집한다 (실거래 저장소에 없는 달만 API로 병렬 조회)."""
+    return await load_transactions(lawd_code, base_type, transaction_type, recent_deal_ymds(months))
 
 
 # ---------------------------------------------------------------------------
@@ -295,8 +276,8 @@ async def market_data_node(state: AgentState) -> dict:
         )
 
         # === 매매 + 전월세 데이터 수집 (매매는 5년치) ===
-        all_trade = await _collect_transactions(lawd_code, base_type, "매매", months=60)
-        all_rent = await _collect_transactions(lawd_code, base_type, "전월세")
+        all_trade = await _collect_transactions(lawd_code, base_type, "매매", months=COLLECTION_MONTHS["매매"])
+        all_rent = await _collect_transactions(lawd_code, base_type, "전월세", months=COLLECTION_MONTHS["전월세"])
 
         logger.info("시세 API 수집 결과: 매매 %d건, 전월세 %d건", len(all_trade), len(all_rent))
 
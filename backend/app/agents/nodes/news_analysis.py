@@ -4,8 +4,7 @@ from __future__ import annotations
 
 import logging
 
-from anthropic import AsyncAnthropic
-
+from app.agents.llm import complete_tool
 from app.agents.prompts.news_prompts import NEWS_ANALYSIS_PROMPT
 from app.agents.state import AgentState
 from app.agents.tools.news_api import (
@@ -14,21 +13,10 @@ from app.agents.tools.news_api import (
     search_news,
     _strip_html,
 )
-from app.config import settings
 from app.schemas.news import NewsAnalysisResult, NewsItem, Sentiment
 
 logger = logging.getLogger(__name__)
 
-_client: AsyncAnthropic | None = None
-
-
-def _get_client() -> AsyncAnthropic:
-    global _client
-    if _client is None:
-        _client = AsyncAnthropic(api_key=settings.anthropic_api_key)
-    return _client
-
-
 # ---------------------------------------------------------------------------
 # tool_use 스키마 — Claude가 항상 유효한 JSON 구조로 응답하도록 강제
 # ---------------------------------------------------------------------------
@@ -76,19 +64,8 @@ NEWS_ANALYSIS_TOOL = {
 
 
 async def _call_llm_structured(prompt: str, max_tokens: int = 8192) -> dict:
-    """Anthropic Claude API를 tool_use 방식으로 호출하여 구조화된 dict를 반환한다."""
-    client = _get_client()
-    response = await client.messages.create(
-        model="claude-sonnet-4-5-20250929",
-        max_tokens=max_tokens,
-        messages=[{"role": "user", "content": prompt}],
-        tools=[NEWS_ANALYSIS_TOOL],
-        tool_choice={"type": "tool", "name": "save_news_analysis"},
-    )
-    for block in response.content:
-        if block.type == "tool_use":
-            return block.input
-    raise ValueError("LLM이 tool_use 응답을 반환하지 않았습니다.")
+    """LLM 게이트웨이를 통해 tool_use 방식으로 호출하여 구조화된 dict를 반환한다."""
+    return await complete_tool(prompt, tool=NEWS_ANALYSIS_TOOL, call_site="news_analysis", max_tokens=max_tokens)
 
 
 # ---------------------------------------------------------------------------
@@ -5,24 +5,58 @@ from __future__ import annotations
 import json
 import logging
 import re
-from dataclasses import asdict
+from dataclasses import asdict, dataclass
 
-from anthropic import AsyncAnthropic
-
-from app.agents.prompts.report_prompts import REPORT_PROMPT
+from app.agents.llm import complete_text
+from app.agents.llm.gateway import TextCallback
+from app.agents.prompts.report_prompts import (
+    REPORT_PROMPT,
+    REPORT_SECTION_PROMPT,
+    REPORT_SECTION_SYSTEM_PROMPT,
+    REPORT_SYSTEM_PROMPT,
+)
 from app.agents.state import AgentState
+from app.agents.tools.report_template import render_analysis_summary
+from app.api.websocket.manager import manager
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-_client: AsyncAnthropic | None = None
+# 스트리밍 중인 JSON에서 문자열 값을 갖는 필드의 시작 ("key": ")
+_FIELD_START = re.compile(r'"(\w+)"\s*:\s*"')
+
+# analysis_summary 항목 (리포트 구조 순서)
+REPORT_FIELDS: tuple[str, ...] = (
+    "property_overview",
+    "rights_summary",
+    "market_summary",
+    "news_summary",
+    "bid_price_reasoning",
+    "sale_price_reasoning",
+    "overall_opinion",
+)
+
+
+@dataclass(frozen=True)
+class ReportSection:
+    """분석 노드 하나의 결과만으로 먼저 작성할 수 있는 리포트 항목 묶음"""
 
+    name: str
+    fields: tuple[str, ...]
+    # 작성에 필요한 입력 (state 키, 프롬프트 제목)
+    inputs: tuple[tuple[str, str], ...]
 
-def _get_client() -> AsyncAnthropic:
-    global _client
-    if _client is None:
-        _client = AsyncAnthropic(api_key=settings.anthropic_api_key)
-    return _client
+
+# 분석 노드 이름 → 그 노드가 끝나는 즉시 작성하는 리포트 항목
+REPORT_SECTIONS: dict[str, ReportSection] = {
+    "rights_analysis": ReportSection(
+        name="rights",
+        fields=("property_overview", "rights_summary"),
+        inputs=(("sale_item", "매각물건 정보"), ("appraisal", "감정평가"), ("rights_analysis", "권리분석 결과")),
+    ),
+    "market_data": ReportSection(name="market", fields=("market_summary",), inputs=(("market_data", "시장 데이터"),)),
+    "news_analysis": ReportSection(name="news", fields=("news_summary",), inputs=(("news_analysis", "뉴스 분석"),)),
+}
 
 
 def _fix_json(text: str) -> str:
@@ -49,15 +83,112 @@ def _parse_json_response(text: str) -> dict:
     return _try_parse(text.strip())
 
 
-async def _call_llm(prompt: str, max_tokens: int = 4096) -> str:
-    """Anthropic Claude API를 호출한다."""
-    client = _get_client()
-    response = await client.messages.create(
-        model="claude-sonnet-4-5-20250929",
+def _is_json_response(text: str) -> bool:
+    """응답에서 JSON을 파싱할 수 있는지 확인한다 (응답 캐시 저장 조건)."""
+    try:
+        data = _parse_json_response(text)
+    except ValueError:
+        return False
+    return isinstance(data, dict)
+
+
+class SummaryStreamParser:
+    """스트리밍 중인 analysis_summary JSON에서 문자열 필드 값을 점진적으로 꺼낸다.
+
+    응답 전체를 다시 파싱하지 않고 마지막으로 확인한 위치부터 이어서 읽는다.
+    최종 보고서는 이 파서가 아니라 완성된 응답을 _parse_json_response로 파싱해 만든다.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._field: str | None = None
+        self._value_start = 0
+        self._emitted = 0
+
+    def feed(self, chunk: str) -> list[tuple[str, str, str, bool]]:
+        """텍스트 조각을 추가하고 값이 늘어난 필드를 (필드, 추가된 텍스트, 현재까지 값, 완료 여부)로 반환한다."""
+        self._buffer += chunk
+        updates: list[tuple[str, str, str, bool]] = []
+        while True:
+            if self._field is None:
+                match = _FIELD_START.search(self._buffer, self._pos)
+                if match is None:
+                    break
+                self._field = match.group(1)
+                self._value_start = self._pos = match.end()
+                self._emitted = 0
+            end, done = self._scan_string()
+            try:
+                value = json.loads(f'"{self._buffer[self._value_start:end]}"', strict=False)
+            except json.JSONDecodeError:
+                value = self._buffer[self._value_start:end]
+            if len(value) > self._emitted or done:
+                updates.append((self._field, value[self._emitted:], value, done))
+                self._emitted = len(value)
+            if not done:
+                break
+            self._field = None
+            self._pos = end + 1
+        return updates
+
+    def _scan_string(self) -> tuple[int, bool]:
+        """현재 값 문자열의 끝(닫는 따옴표 위치)을 찾는다. 아직 끝나지 않았으면 완결된 이스케이프까지의 위치."""
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self._pos = i
+                return i, True
+            if char == "\\":
+                width = 6 if buffer[i + 1 : i + 2] == "u" else 2
+                if i + width > len(buffer):
+                    break
+                i += width
+                continue
+            i += 1
+        self._pos = i
+        return i, False
+
+
+def _chunk_sender(analysis_id: str) -> TextCallback:
+    """LLM 텍스트 조각을 파싱해 필드별 report_chunk 이벤트로 WebSocket에 전송하는 콜백을 만든다."""
+    parser = SummaryStreamParser()
+
+    async def send(text: str) -> None:
+        for field, delta, value, done in parser.feed(text):
+            await manager.send_progress(analysis_id, {
+                "type": "report_chunk",
+                "field": field,
+                "delta": delta,
+                "text": value,
+                "done": done,
+            })
+
+    return send
+
+
+async def _call_llm(
+    prompt: str,
+    max_tokens: int = 4096,
+    *,
+    on_text: TextCallback | None = None,
+    system: str = REPORT_SYSTEM_PROMPT,
+    call_site: str = "report_generator",
+) -> str:
+    """LLM 게이트웨이를 통해 Claude를 호출한다.
+
+    고정 지시문은 system 블록으로 전달한다 (프롬프트 캐시 최소 길이보다 짧아 캐시하지 않음).
+    """
+    return await complete_text(
+        prompt,
+        call_site=call_site,
+        system=system,
         max_tokens=max_tokens,
-        messages=[{"role": "user", "content": prompt}],
+        on_text=on_text,
+        accept=_is_json_response,
     )
-    return response.content[0].text
 
 
 def _safe_dict(obj: object) -> str:
@@ -70,31 +201,127 @@ def _safe_dict(obj: object) -> str:
         return str(obj)[:3000]
 
 
-async def report_generator_node(state: AgentState) -> dict:
-    """보고서 생성 에이전트 노드.
+def _data_blocks(state: AgentState, inputs: list[tuple[str, str]] | tuple[tuple[str, str], ...]) -> str:
+    return "\n\n".join(f"## {title}\n{_safe_dict(state.get(key))}" for key, title in inputs)
+
+
+def _stream_callback(state: AgentState) -> TextCallback | None:
+    analysis_id = state.get("analysis_id")
+    return _chunk_sender(analysis_id) if analysis_id and settings.report_stream_enabled else None
 
-    처리 흐름:
-    1. 모든 분석 결과를 수집
-    2. Claude로 사용자 친화적 리포트 텍스트 생성
-    3. 최종 report dict를 partial dict로 반환
-    """
-    new_errors: list[str] = []
 
+async def _write_fields(
+    state: AgentState,
+    fields: list[str] | tuple[str, ...],
+    data: str,
+    *,
+    call_site: str,
+    max_tokens: int,
+    stream: bool = True,
+) -> dict:
+    """지정한 리포트 항목만 작성하는 LLM 호출. 응답에서 요청한 항목만 골라 반환한다."""
+    raw = await _call_llm(
+        REPORT_SECTION_PROMPT.format(fields=", ".join(fields), data=data),
+        max_tokens=max_tokens,
+        on_text=_stream_callback(state) if stream else None,
+        system=REPORT_SECTION_SYSTEM_PROMPT,
+        call_site=call_site,
+    )
+    parsed = _parse_json_response(raw)
+    return {field: parsed[field] for field in fields if parsed.get(field) is not None}
+
+
+async def write_report_section(state: AgentState, section: ReportSection) -> dict:
+    """분석 노드가 끝난 직후 그 결과로 작성할 수 있는 리포트 항목을 먼저 작성한다.
+
+    실패해도 분석 결과에는 영향을 주지 않도록 빈 dict를 반환하고, 빠진 항목은 report_generator가 작성한다.
+    """
     try:
+        written = await _write_fields(
+            state,
+            section.fields,
+            _data_blocks(state, section.inputs),
+            call_site=f"report_generator.{section.name}",
+            max_tokens=1500,
+        )
+    except Exception:
+        logger.warning("리포트 항목 선작성 실패 - 최종 보고서 생성 시 작성: %s", section.name, exc_info=True)
+        return {}
+    return {"report_sections": written} if written else {}
+
+
+async def _generate_summary(state: AgentState, *, stream: bool = True) -> dict:
+    """analysis_summary를 만든다.
+
+    먼저 작성된 항목(report_sections)이 없으면 전체 리포트를 한 번에 작성하고,
+    있으면 빠진 항목(가치평가 의존 항목 + 선작성에 실패한 항목)만 작성해 리포트 구조 순서대로 합친다.
+    stream=False이면 report_chunk 이벤트를 보내지 않는다.
+    """
+    sections = state.get("report_sections") or {}
+    missing = [field for field in REPORT_FIELDS if field not in sections]
+    if len(missing) == len(REPORT_FIELDS):
         prompt = REPORT_PROMPT.format(
             rights=_safe_dict(state.get("rights_analysis")),
             market=_safe_dict(state.get("market_data")),
             news=_safe_dict(state.get("news_analysis")),
             valuation=_safe_dict(state.get("valuation")),
         )
+        raw = await _call_llm(prompt, max_tokens=3000, on_text=_stream_callback(state) if stream else None)
+        return _parse_json_response(raw)
+
+    written: dict = {}
+    if missing:
+        inputs = [("valuation", "가치 평가")]
+        for section in REPORT_SECTIONS.values():
+            if any(field in missing for field in section.fields):
+                inputs.extend(item for item in section.inputs if item not in inputs)
+        written_json = json.dumps(sections, ensure_ascii=False)
+        data = f"{_data_blocks(state, inputs)}\n\n## 이미 작성된 리포트 항목\n{written_json}"
+        written = await _write_fields(
+            state, missing, data, call_site="report_generator", max_tokens=3000, stream=stream
+        )
+    merged = {**sections, **written}
+    return {field: merged[field] for field in REPORT_FIELDS if field in merged}
+
+
+def _render_template_summary(state: AgentState) -> dict:
+    return render_analysis_summary(
+        registry=state.get("registry"),
+        sale_item=state.get("sale_item"),
+        appraisal=state.get("appraisal"),
+        rights=state.get("rights_analysis"),
+        market=state.get("market_data"),
+        news=state.get("news_analysis"),
+        valuation=state.get("valuation"),
+    )
+
+
+async def polish_analysis_summary(state: AgentState) -> dict:
+    """템플릿 요약을 대체할 LLM 작성 요약을 만든다 (template 모드에서 분석 완료 후 호출).
+
+    analysis_complete 이후에 실행되므로 report_chunk로 스트리밍하지 않는다 (결과는 report_polished 이벤트 1건).
+    """
+    return await _generate_summary(state, stream=False)
 
-        raw = await _call_llm(prompt, max_tokens=3000)
-        analysis_summary = _parse_json_response(raw)
 
-        # 최종 리포트 조합: 프론트엔드가 기대하는 구조에 맞춰 생성
-        report: dict = {
-            "analysis_summary": analysis_summary,
-        }
+async def report_generator_node(state: AgentState) -> dict:
+    """보고서 생성 에이전트 노드.
+
+    처리 흐름:
+    1. 모든 분석 결과와 먼저 작성된 리포트 항목(report_sections)을 수집
+    2. Claude로 나머지 리포트 텍스트 생성 (스트리밍, 필드별 report_chunk 이벤트 전송)
+       - report_mode="template"이면 LLM 없이 분석 결과로 요약을 즉시 작성
+    3. 최종 report dict를 partial dict로 반환
+    """
+    new_errors: list[str] = []
+
+    try:
+        if settings.report_mode == "template":
+            # 분석 결과로 즉시 작성 (LLM 다듬기는 분석 완료 후 워크플로우에서 별도로 실행)
+            report: dict = {"analysis_summary": _render_template_summary(state), "summary_source": "template"}
+        else:
+            # 생성 중인 요약 필드는 report_chunk 이벤트로 먼저 보내고, 최종 보고서는 완성된 응답으로 만든다
+            report = {"analysis_summary": await _generate_summary(state)}
 
         # 가치평가 결과를 report 최상위 레벨로 플래튼
         valuation = state.get("valuation")
@@ -6,11 +6,9 @@ import json
 import logging
 import re
 
-from anthropic import AsyncAnthropic
-
-from app.agents.prompts.rights_prompts import RIGHTS_ANALYSIS_PROMPT
+from app.agents.llm import complete_text
+from app.agents.prompts.rights_prompts import RIGHTS_ANALYSIS_PROMPT, RIGHTS_ANALYSIS_SYSTEM_PROMPT
 from app.agents.state import AgentState
-from app.config import settings
 from app.schemas.document import OccupancyInfo, RightEntry
 from app.schemas.rights import RightsAnalysisResult, RiskLevel, TenantAnalysis
 
@@ -31,15 +29,6 @@ EXTINGUISHMENT_ELIGIBLE_TYPES = [
 # 소액임차인 최우선변제 기준 (서울 기준, 원)
 SMALL_DEPOSIT_THRESHOLD = 165_000_000
 
-_client: AsyncAnthropic | None = None
-
-
-def _get_client() -> AsyncAnthropic:
-    global _client
-    if _client is None:
-        _client = AsyncAnthropic(api_key=settings.anthropic_api_key)
-    return _client
-
 
 def _fix_json(text: str) -> str:
     """LLM이 생성한 JSON의 흔한 오류를 수정한다."""
@@ -65,15 +54,27 @@ def _parse_json_response(text: str) -> dict:
     return _try_parse(text.strip())
 
 
+def _is_json_response(text: str) -> bool:
+    """응답에서 JSON을 파싱할 수 있는지 확인한다 (응답 캐시 저장 조건)."""
+    try:
+        data = _parse_json_response(text)
+    except ValueError:
+        return False
+    return isinstance(data, dict)
+
+
 async def _call_llm(prompt: str, max_tokens: int = 4096) -> str:
-    """Anthropic Claude API를 호출한다."""
-    client = _get_client()
-    response = await client.messages.create(
-        model="claude-sonnet-4-5-20250929",
+    """LLM 게이트웨이를 통해 Claude를 호출한다.
+
+    고정 지시문은 system 블록으로 전달한다 (프롬프트 캐시 최소 길이보다 짧아 캐시하지 않음).
+    """
+    return await complete_text(
+        prompt,
+        call_site="rights_analysis",
+        system=RIGHTS_ANALYSIS_SYSTEM_PROMPT,
         max_tokens=max_tokens,
-        messages=[{"role": "user", "content": prompt}],
+        accept=_is_json_response,
     )
-    return response.content[0].text
 
 
 def _format_entry(entry: RightEntry) -> str:
@@ -1,4 +1,14 @@
-"""문서 유형 분류 및 데이터 추출용 LLM 프롬프트 템플릿"""
+"""문서 유형 분류 및 데이터 추출용 LLM 프롬프트 템플릿
+
+추출 프롬프트는 고정 블록과 가변 블록으로 나뉜다.
+- EXTRACTION_SYSTEM_PROMPT / STRUCTURED_EXTRACTION_SYSTEM_PROMPT: 모든 추출기가 공유하는 system 블록
+  (JSON 텍스트 응답 / tool_use 응답)
+- *_EXTRACTION_PROMPT: 추출기별 고정 지시문 (문서 텍스트 없음)
+- DOCUMENT_TEXT_TEMPLATE: 문서 텍스트 블록 (보통 맨 마지막에 위치)
+
+지시문 블록은 프롬프트 캐시 최소 길이보다 짧아 캐시되지 않는다. 캐시되는 것은 여러 추출기가 같은 원문을 받을 때
+앞에 두는 문서 텍스트 블록이다.
+"""
 
 CLASSIFY_PROMPT = """\
 다음 PDF 문서의 텍스트를 보고, 문서 유형을 분류해주세요.
@@ -23,8 +33,31 @@ CLASSIFY_PROMPT = """\
 {text}
 """
 
+_EXTRACTION_RULES = """\
+당신은 대한민국 법원 경매 문서(등기부등본, 감정평가서, 매각물건명세서, 현황조사보고서, 경매 포털 종합 페이지)에서
+구조화된 정보를 추출하는 전문가입니다.
+
+공통 규칙:
+- 문서에 실제로 적힌 내용만 추출하고, 찾을 수 없는 값은 null로 둡니다.
+- 금액은 원 단위 정수로 변환합니다 (예: "3억 2,000만원" → 320000000).
+- 날짜는 YYYY-MM-DD 형식으로 변환합니다 (예: "2021.03.15" → "2021-03-15").
+- 면적은 ㎡ 단위 숫자로 변환합니다.
+"""
+
+EXTRACTION_SYSTEM_PROMPT = (
+    _EXTRACTION_RULES + "- 응답은 요청한 필드만 포함한 JSON 객체 하나로만 작성합니다 (설명, 마크다운 없이).\n"
+)
+
+# tool_use 구조화 추출용 (document_extraction_mode="combined") - 응답 형식은 도구 스키마가 정한다
+STRUCTURED_EXTRACTION_SYSTEM_PROMPT = _EXTRACTION_RULES + "- 추출 결과는 지정된 도구 호출로만 저장합니다.\n"
+
+DOCUMENT_TEXT_TEMPLATE = """\
+문서 텍스트:
+{text}
+"""
+
 REGISTRY_EXTRACTION_PROMPT = """\
-다음 문서 텍스트에서 등기부등본 관련 정보를 추출하여 JSON으로 반환해주세요.
+주어진 문서 텍스트에서 등기부등본 관련 정보를 추출하여 JSON으로 반환해주세요.
 문서가 경매 포털 종합 페이지일 수 있으므로, 등기 관련 내용(갑구, 을구, 소유권, 근저당, 가압류 등)을 찾아 추출하세요.
 
 추출 대상:
@@ -43,13 +76,10 @@ REGISTRY_EXTRACTION_PROMPT = """\
 
 주의: 갑(4), 갑(5) 같은 표기는 갑구 항목이고, 을(2), 을(3) 같은 표기는 을구 항목입니다.
 반드시 JSON 형식으로만 응답해주세요 (다른 텍스트 없이).
-
-문서 텍스트:
-{text}
 """
 
 APPRAISAL_EXTRACTION_PROMPT = """\
-다음 문서 텍스트에서 감정평가 관련 정보를 추출하여 JSON으로 반환해주세요.
+주어진 문서 텍스트에서 감정평가 관련 정보를 추출하여 JSON으로 반환해주세요.
 문서가 경매 포털 종합 페이지일 수 있으므로, 감정가/평가액 관련 내용을 찾아 추출하세요.
 
 추출 대상:
@@ -60,13 +90,10 @@ APPRAISAL_EXTRACTION_PROMPT = """\
 - building_area: 건물 면적 (숫자, ㎡, 없으면 null. 전용면적 사용)
 
 반드시 JSON 형식으로만 응답해주세요 (다른 텍스트 없이).
-
-문서 텍스트:
-{text}
 """
 
 STATUS_REPORT_EXTRACTION_PROMPT = """\
-다음 문서 텍스트에서 현황조사보고서 관련 정보를 추출하여 JSON으로 반환해주세요.
+주어진 문서 텍스트에서 현황조사보고서 관련 정보를 추출하여 JSON으로 반환해주세요.
 
 추출 대상:
 - investigation_date: 조사일자 (문자열 YYYY-MM-DD, 없으면 null)
@@ -79,13 +106,10 @@ STATUS_REPORT_EXTRACTION_PROMPT = """\
 - special_notes: 특이사항 목록 (문자열 배열, 없으면 빈 배열)
 
 반드시 JSON 형식으로만 응답해주세요 (다른 텍스트 없이).
-
-문서 텍스트:
-{text}
 """
 
 SALE_ITEM_EXTRACTION_PROMPT = """\
-다음 문서 텍스트에서 매각물건명세서 관련 정보를 추출하여 JSON으로 반환해주세요.
+주어진 문서 텍스트에서 매각물건명세서 관련 정보를 추출하여 JSON으로 반환해주세요.
 문서가 경매 포털 종합 페이지일 수 있으므로, 사건번호, 임차인/점유 관계, 특별매각조건 등을 찾아 추출하세요.
 
 추출 대상:
@@ -107,7 +131,21 @@ SALE_ITEM_EXTRACTION_PROMPT = """\
 - 임차인 현황 테이블에서 확정일자와 배당여부 컬럼을 반드시 확인하세요.
 - 배당요구 여부는 "배당요구종기까지 배당요구를 한" 또는 "배당요구함", "배당신청" 등의 표현으로 판별합니다.
 반드시 JSON 형식으로만 응답해주세요 (다른 텍스트 없이).
+"""
 
-문서 텍스트:
-{text}
+STRUCTURED_EXTRACTION_PROMPT = """\
+주어진 문서 텍스트에서 save_document_extraction 도구 스키마의 각 항목(registry, appraisal, sale_item, status_report)을
+추출하여 도구로 저장해주세요. 문서가 경매 포털 종합 페이지이면 여러 항목이 함께 들어 있을 수 있습니다.
+문서에 해당 정보가 전혀 없는 항목은 null로 저장하세요.
+
+항목별 주의:
+- registry: 갑구/을구, 소유권, 근저당, 가압류 등 등기 내용.
+  갑(4), 갑(5) 같은 표기는 갑구 항목이고, 을(2), 을(3) 같은 표기는 을구 항목입니다.
+  property_type은 "물건종별", "물건종류", "건물유형", "용도", "대상물건" 등의 키워드에서 찾고,
+  등기부에 "집합건물"로 표기된 경우 문서 다른 부분에서 구체적 유형(아파트/다세대/연립/오피스텔)을 확인하세요.
+- appraisal: 감정가/평가액. 토지 면적은 대지권 면적, 건물 면적은 전용면적을 사용하세요.
+- sale_item: 사건번호, 임차인/점유 관계, 인수할 권리, 특별매각조건.
+  "임차인이 없으며 전부를 소유자가 점유 사용합니다" 같은 문구가 있으면 occupancy_info에 소유자 점유로 기록하세요.
+  임차인 현황 테이블의 확정일자와 배당요구 여부("배당요구함", "배당신청" 등)를 반드시 확인하세요.
+- status_report: 현황조사 일자, 점유자/점유 상태, 건물 상태, 접근도로, 주변 환경, 특이사항.
 """
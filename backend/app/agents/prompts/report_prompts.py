@@ -1,9 +1,39 @@
-"""보고서 생성 LLM 프롬프트 템플릿"""
+"""보고서 생성 LLM 프롬프트 템플릿
 
-REPORT_PROMPT = """\
-다음 경매 분석 결과를 기반으로 최종 분석 리포트를 생성해주세요.
+REPORT_SYSTEM_PROMPT는 리포트 구조/형식 지시문(system 블록)이고,
+REPORT_PROMPT는 분석 결과 데이터만 담아 맨 마지막에 전달한다.
+지시문은 프롬프트 캐시 최소 길이보다 짧아 캐시되지 않는다.
+
+REPORT_SECTION_*는 리포트 항목 일부만 작성하는 호출용이다. 권리/시세/뉴스 항목은 해당 분석이 끝나는 즉시
+먼저 작성하고, 마지막에 가치평가가 필요한 항목만 작성해 합친다.
+"""
+
+# 리포트 항목별 작성 지침 (전체 리포트 작성과 항목별 작성이 공유)
+REPORT_FIELD_GUIDE = """\
+1. property_overview: 물건 개요 - 물건 종류(아파트/다세대/다가구/오피스텔 등), 소재지, 면적, 감정가 등 핵심 정보 (2~3문장)
+2. rights_summary: 권리분석 핵심 요약 - 말소기준권리, 인수할 권리 유무, 임차인 대항력 여부, 위험도 판단 (3~5문장)
+3. market_summary: 시세 분석 요약 - 실거래 시세, 감정가 대비 시세 수준, 가격 추이(상승/보합/하락) (3~5문장)
+4. news_summary: 뉴스/동향 요약 - 해당 지역의 호재/악재, 개발 계획, 부동산 시장 전망 (3~5문장)
+5. bid_price_reasoning: 입찰 적정가 산출 근거 - 왜 이 가격대를 추천하는지 추정시세, 부대비용, 인수비용 등을 근거로 설명 (3~5문장)
+6. sale_price_reasoning: 매도 적정가 산출 근거 - 왜 이 가격에 매도할 수 있는지 시세추이, 호재/악재 등을 근거로 설명 (3~5문장)
+7. overall_opinion: 종합 의견 (5~7문장)
+"""
+
+REPORT_SYSTEM_PROMPT = (
+    """\
+주어지는 경매 분석 결과(권리분석, 시장 데이터, 뉴스 분석, 가치 평가)를 기반으로 최종 분석 리포트를 생성해주세요.
 비전문가도 쉽게 이해할 수 있는 용어를 사용하세요.
 
+리포트 구조:
+"""
+    + REPORT_FIELD_GUIDE
+    + """
+반드시 아래 JSON 형식으로만 응답해주세요 (다른 텍스트 없이):
+{"property_overview": "...", "rights_summary": "...", "market_summary": "...", "news_summary": "...", "bid_price_reasoning": "...", "sale_price_reasoning": "...", "overall_opinion": "..."}
+"""
+)
+
+REPORT_PROMPT = """\
 ## 권리분석 결과
 {rights}
 
@@ -15,16 +45,26 @@ REPORT_PROMPT = """\
 
 ## 가치 평가
 {valuation}
+"""
 
-리포트 구조:
-1. property_overview: 물건 개요 - 물건 종류(아파트/다세대/다가구/오피스텔 등), 소재지, 면적, 감정가 등 핵심 정보 (2~3문장)
-2. rights_summary: 권리분석 핵심 요약 - 말소기준권리, 인수할 권리 유무, 임차인 대항력 여부, 위험도 판단 (3~5문장)
-3. market_summary: 시세 분석 요약 - 실거래 시세, 감정가 대비 시세 수준, 가격 추이(상승/보합/하락) (3~5문장)
-4. news_summary: 뉴스/동향 요약 - 해당 지역의 호재/악재, 개발 계획, 부동산 시장 전망 (3~5문장)
-5. bid_price_reasoning: 입찰 적정가 산출 근거 - 왜 이 가격대를 추천하는지 추정시세, 부대비용, 인수비용 등을 근거로 설명 (3~5문장)
-6. sale_price_reasoning: 매도 적정가 산출 근거 - 왜 이 가격에 매도할 수 있는지 시세추이, 호재/악재 등을 근거로 설명 (3~5문장)
-7. overall_opinion: 종합 의견 (5~7문장)
+REPORT_SECTION_SYSTEM_PROMPT = (
+    """\
+주어지는 경매 분석 결과를 기반으로 최종 분석 리포트 중 "작성할 항목"으로 지정된 항목만 작성해주세요.
+나머지 항목은 별도로 작성되어 합쳐지므로 지정된 항목 외의 내용은 쓰지 마세요.
+이미 작성된 항목이 주어지면 내용이 서로 어긋나지 않도록 참고만 하고 다시 쓰지 마세요.
+비전문가도 쉽게 이해할 수 있는 용어를 사용하세요.
 
-반드시 아래 JSON 형식으로만 응답해주세요 (다른 텍스트 없이):
-{{"property_overview": "...", "rights_summary": "...", "market_summary": "...", "news_summary": "...", "bid_price_reasoning": "...", "sale_price_reasoning": "...", "overall_opinion": "..."}}
+항목별 작성 지침:
+"""
+    + REPORT_FIELD_GUIDE
+    + """
+반드시 작성할 항목만 키로 갖는 JSON 형식으로만 응답해주세요 (다른 텍스트 없이).
+예: 작성할 항목이 market_summary, news_summary이면 {"market_summary": "...", "news_summary": "..."}
+"""
+)
+
+REPORT_SECTION_PROMPT = """\
+작성할 항목: {fields}
+
+{data}
 """
@@ -1,10 +1,27 @@
-"""권리분석 LLM 프롬프트 템플릿"""
+"""권리분석 LLM 프롬프트 템플릿
 
-RIGHTS_ANALYSIS_PROMPT = """\
+RIGHTS_ANALYSIS_SYSTEM_PROMPT는 호출마다 같은 고정 지시문(system 블록)이고,
+RIGHTS_ANALYSIS_PROMPT는 물건별 권리 정보만 담아 맨 마지막에 전달한다.
+지시문은 프롬프트 캐시 최소 길이보다 짧아 캐시되지 않는다.
+"""
+
+RIGHTS_ANALYSIS_SYSTEM_PROMPT = """\
 당신은 대한민국 부동산 경매 권리분석 전문가입니다.
 
-다음 등기부등본 및 매각물건명세서 정보를 분석하여, 종합 위험도를 평가해주세요.
+주어지는 등기부등본 및 매각물건명세서 정보를 분석하여, 종합 위험도를 평가해주세요.
+말소기준권리는 이미 판단되어 함께 주어집니다.
 
+## 분석 요청 사항
+1. 특수 권리 위험을 확인하세요 (가처분, 유치권, 법정지상권, 예고등기, 신탁등기 등)
+2. 종합 위험도를 high / medium / low 중 하나로 평가하세요
+3. 구체적인 위험 요인을 나열하세요
+4. 분석 신뢰도 점수를 0.0~1.0으로 매기세요
+
+반드시 아래 JSON 형식으로만 응답해주세요 (다른 텍스트 없이):
+{"risk_level": "high|medium|low", "risk_factors": ["위험요인1", "위험요인2"], "confidence": 0.85, "warnings": ["경고사항1"]}
+"""
+
+RIGHTS_ANALYSIS_PROMPT = """\
 ## 말소기준권리 (이미 판단됨)
 {basis_description}
 
@@ -19,13 +36,4 @@ RIGHTS_ANALYSIS_PROMPT = """\
 
 ## 인수되는 권리 목록
 {assumed_rights}
-
-## 분석 요청 사항
-1. 특수 권리 위험을 확인하세요 (가처분, 유치권, 법정지상권, 예고등기, 신탁등기 등)
-2. 종합 위험도를 high / medium / low 중 하나로 평가하세요
-3. 구체적인 위험 요인을 나열하세요
-4. 분석 신뢰도 점수를 0.0~1.0으로 매기세요
-
-반드시 아래 JSON 형식으로만 응답해주세요 (다른 텍스트 없이):
-{{"risk_level": "high|medium|low", "risk_factors": ["위험요인1", "위험요인2"], "confidence": 0.85, "warnings": ["경고사항1"]}}
 """
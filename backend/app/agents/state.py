@@ -29,6 +29,9 @@ class AgentState(TypedDict, total=False):
     news_analysis: NewsAnalysisResult | None
     valuation: ValuationResult | None
 
+    # 분석 노드 직후 먼저 작성된 리포트 항목 (reducer: 병렬 노드의 항목을 합친다)
+    report_sections: Annotated[dict[str, str], operator.or_]
+
     # 최종 보고서
     report: dict | None
 
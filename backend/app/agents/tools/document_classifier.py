@@ -0,0 +1,117 @@
+"""규칙 기반 문서 분류기 - 키워드/정규식 점수로 LLM 호출 없이 문서 유형을 판별한다
+
+CLASSIFY_PROMPT의 판단 기준(경매 포털 URL, 여러 섹션 혼합, 공적 문서 제목)을 그대로 점수화한다.
+문서 제목 같은 강한 단서는 가중치가 크고, 본문 키워드는 1점씩 더한다.
+
+confidence = 1 - 0.5 ** (1위 점수 - 2위 점수)
+  점수 차 1 → 0.50, 2 → 0.75, 3 → 0.875, 4 → 0.94, 5 이상 → 0.97~0.99
+1위 점수가 _MIN_SCORE 미만이면 단서 부족으로 보고 confidence 0을 반환한다.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+
+from app.schemas.document import DocumentType
+
+_TITLE = 4
+_URL = 5
+_MIN_SCORE = 3
+_MAX_CONFIDENCE = 0.99
+
+# 유형별 (정규식, 가중치) - 같은 단서는 여러 번 나와도 한 번만 센다
+_RULES: dict[DocumentType, list[tuple[re.Pattern[str], int]]] = {
+    DocumentType.AUCTION_SUMMARY: [
+        (re.compile(r"tankauction|ggi\.co\.kr|goodauction|speedauction|auction1\.co\.kr|ddangi"), _URL),
+        (re.compile(r"매각기일|매각일자"), 1),
+        (re.compile(r"최저매각가격|최저가"), 1),
+        (re.compile(r"감정가"), 1),
+        (re.compile(r"임차인\s*현황"), 1),
+        (re.compile(r"건물등기"), 1),
+        (re.compile(r"매각사례|실거래가"), 1),
+        (re.compile(r"유찰|입찰"), 1),
+    ],
+    DocumentType.REGISTRY: [
+        (re.compile(r"등기사항\s*전부\s*증명서|부동산\s*등기부\s*등본|등기부\s*등본"), _TITLE),
+        (re.compile(r"표\s*제\s*부"), 1),
+        (re.compile(r"[\[【]\s*갑\s*구\s*[\]】]"), 1),
+        (re.compile(r"[\[【]\s*을\s*구\s*[\]】]"), 1),
+        (re.compile(r"고유번호|관할\s*등기소"), 1),
+        (re.compile(r"순위\s*번호|등기\s*목적"), 1),
+    ],
+    DocumentType.APPRAISAL: [
+        (re.compile(r"감정\s*평가\s*서|감정\s*평가\s*표"), _TITLE),
+        (re.compile(r"감정\s*평가액|평가\s*의견|산출\s*근거"), 1),
+        (re.compile(r"토지\s*평가액|건물\s*평가액"), 1),
+        (re.compile(r"감정\s*평가사|평가\s*기준일|가격\s*시점"), 1),
+    ],
+    DocumentType.SALE_ITEM: [
+        (re.compile(r"매각\s*물건\s*명세서"), _TITLE),
+        (re.compile(r"최선순위\s*설정"), 1),
+        (re.compile(r"배당요구\s*종기"), 1),
+        (re.compile(r"효력이\s*소멸되지\s*아니하는|지상권의\s*개요"), 1),
+        (re.compile(r"특별\s*매각\s*조건|인수할\s*권리"), 1),
+    ],
+    DocumentType.STATUS_REPORT: [
+        (re.compile(r"현황\s*조사\s*(보고서|서)"), _TITLE),
+        (re.compile(r"조사\s*일시"), 1),
+        (re.compile(r"점유\s*관계"), 1),
+        (re.compile(r"임대차\s*관계\s*조사서|부동산의\s*현황"), 1),
+    ],
+    DocumentType.CASE_NOTICE: [
+        (re.compile(r"사건\s*송달\s*내역|송달\s*내역"), _TITLE),
+        (re.compile(r"송달\s*물명|송달\s*결과"), 1),
+        (re.compile(r"도달|폐문부재|수취인\s*불명"), 1),
+    ],
+}
+
+
+def score_document(text: str) -> dict[DocumentType, int]:
+    """유형별 단서 점수를 계산한다."""
+    return {
+        doc_type: sum(weight for pattern, weight in rules if pattern.search(text))
+        for doc_type, rules in _RULES.items()
+    }
+
+
+def classify_by_rules(text: str) -> tuple[str, float]:
+    """키워드/정규식 점수로 문서 유형을 분류한다.
+
+    Returns:
+        (document_type, confidence) - 단서가 부족하면 confidence 0.0
+
+    >>> classify_by_rules("부동산등기부등본 [표제부] [갑구] [을구]")
+    ('registry', 0.99)
+    """
+    scores = score_document(text)
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (top_type, top), (_, runner_up) = ranked[0], ranked[1]
+    if top < _MIN_SCORE:
+        return top_type.value, 0.0
+    return top_type.value, round(min(_MAX_CONFIDENCE, 1 - 0.5 ** (top - runner_up)), 4)
+
+
+class ClassifierStats:
+    """분류 경로(rule/llm)별 호출 횟수"""
+
+    def __init__(self) -> None:
+        self.rule = 0
+        self.llm = 0
+        self._lock = threading.Lock()
+
+    def record(self, path: str) -> None:
+        with self._lock:
+            setattr(self, path, getattr(self, path) + 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.rule + self.llm
+            return {
+                "rule": self.rule,
+                "llm": self.llm,
+                "rule_rate": round(self.rule / total, 4) if total else 0.0,
+            }
+
+
+classifier_stats = ClassifierStats()
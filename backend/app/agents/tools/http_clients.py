@@ -0,0 +1,90 @@
+"""외부 API 공유 HTTP 클라이언트 - 호스트별 httpx.AsyncClient를 애플리케이션 수명 동안 재사용한다
+
+요청마다 AsyncClient를 새로 만들면 SSL 컨텍스트 생성 + TCP/TLS 핸드셰이크를 매번 반복한다
+(market_data_node 1회 실행에 MOLIT 호출 약 72건). 이름별(molit, naver) 클라이언트 1개씩을 두고
+커넥션 풀(keep-alive)을 공유한다.
+
+- 클라이언트 하나가 호스트 하나만 호출하므로 풀 한도(http_max_connections_per_host)가 곧 호스트별 연결 수 한도
+- http2_enabled이면 HTTP/2로 연결한다 (h2는 httpx[http2] 의존성으로 설치된다. 서버가 지원하지 않으면
+  ALPN 협상으로 HTTP/1.1 keep-alive, h2가 없는 환경이면 시작 시 경고를 남기고 HTTP/1.1)
+- 애플리케이션 시작 시 start_http_clients(), 종료 시 close_http_clients()로 연다/닫는다.
+  시작 전(테스트, 스크립트)에는 처음 사용할 때 만든다
+- 커넥션은 이벤트 루프에 묶이므로 루프가 바뀌면 기존 클라이언트를 버리고 새로 만든다
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 클라이언트 이름 → 요청 타임아웃(초)
+HTTP_CLIENT_TIMEOUTS: dict[str, float] = {
+    "molit": 30.0,
+    "naver": 15.0,
+}
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def http2_available() -> bool:
+    """HTTP/2 사용 여부 (설정이 켜져 있고 h2 패키지가 설치된 경우)."""
+    return settings.http2_enabled and importlib.util.find_spec("h2") is not None
+
+
+def _build_client(name: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_CLIENT_TIMEOUTS[name], connect=settings.http_connect_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections_per_host,
+            max_keepalive_connections=settings.http_max_connections_per_host,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+        http2=http2_available(),
+    )
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """이름에 해당하는 공유 클라이언트를 반환한다 (없으면 만든다)."""
+    global _loop
+    if name not in HTTP_CLIENT_TIMEOUTS:
+        raise KeyError(f"등록되지 않은 HTTP 클라이언트: {name}")
+    loop = asyncio.get_running_loop()
+    if _loop is not loop:
+        _loop = loop
+        _clients.clear()
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _clients[name] = _build_client(name)
+    return client
+
+
+async def start_http_clients() -> None:
+    """등록된 클라이언트를 모두 만든다 (애플리케이션 시작 시 호출)."""
+    for name in HTTP_CLIENT_TIMEOUTS:
+        get_http_client(name)
+    if settings.http2_enabled and not http2_available():
+        logger.warning("h2 패키지가 없어 외부 API를 HTTP/1.1로 연결합니다 (pip install 'httpx[http2]')")
+    logger.info(
+        "외부 API HTTP 클라이언트 준비: %s (HTTP/2=%s, 호스트별 연결 %d개)",
+        ", ".join(HTTP_CLIENT_TIMEOUTS),
+        http2_available(),
+        settings.http_max_connections_per_host,
+    )
+
+
+async def close_http_clients() -> None:
+    """공유 클라이언트의 커넥션 풀을 닫는다 (애플리케이션 종료 시 호출)."""
+    global _loop
+    clients = list(_clients.values())
+    _clients.clear()
+    _loop = None
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,231 @@
+"""MOLIT 실거래 XML 스트리밍 파서 - 응답 조각을 받는 대로 compact 레코드로 변환한다
+
+ElementTree 전체 트리를 만들고 <item>마다 별칭 태그를 findtext로 여러 번 찾던 방식 대신,
+XMLParser target 콜백으로 태그 이벤트만 받아 컴파일된 태그→필드 맵으로 바로 값을 채운다.
+
+- 태그 별칭(영문 신규 API / 한글 구 API)은 모듈 로드 시 {태그: (필드, 우선순위)}로 한 번만 컴파일한다.
+  같은 필드의 별칭이 여러 개 있으면 앞의 별칭 중 값이 있는 것을 쓴다
+- 요소(Element) 객체를 만들지 않으므로 메모리는 완성된 레코드 크기에만 비례한다
+- 레코드는 __slots__ dataclass (TradeRecord/RentRecord). 기존 dict 행과 같은 한글 키로도 읽을 수 있어
+  (Mapping) 시세 분석 코드는 그대로 동작한다
+- 반복되는 문자열(년/월/법정동/단지명 등)은 응답 단위로 같은 객체를 재사용한다
+- 호출 한도 초과·인증키 오류 등도 HTTP 200 XML(<header><resultCode> 또는 <cmmMsgHeader>)로 오므로
+  finish()에서 결과 코드를 확인해 정상 응답이 아니면 MolitApiError를 던진다 (빈 결과로 오인하지 않도록)
+"""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, fields
+from typing import Any, ClassVar
+
+# 정상 응답 resultCode (신규 API "000", 구 API "00"). "03"(NODATA)은 해당 기간 거래가 없다는 정상 응답이다
+_SUCCESS_CODES = frozenset({"000", "00", "03"})
+# <header>의 resultCode/resultMsg, 게이트웨이 오류 응답 <cmmMsgHeader>의 returnReasonCode/returnAuthMsg
+_HEADER_TAGS = frozenset({"resultCode", "resultMsg", "returnReasonCode", "returnAuthMsg"})
+
+
+class MolitApiError(RuntimeError):
+    """MOLIT API가 정상이 아닌 결과 코드를 돌려줌 (호출 한도 초과, 인증키 오류 등)"""
+
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(f"MOLIT API 오류 응답 (코드 {code or '없음'}): {message}")
+        self.code = code
+        self.message = message
+
+
+def _parse_int_amount(text: str | None) -> int:
+    """만원 단위 금액 문자열을 원 단위 정수로 변환한다."""
+    raw = (text or "0").strip().replace(",", "")
+    try:
+        return int(raw) * 10_000
+    except ValueError:
+        return 0
+
+
+def _parse_float(text: str | None) -> float:
+    """숫자 문자열을 float로 변환한다."""
+    raw = (text or "0").strip()
+    try:
+        return float(raw)
+    except ValueError:
+        return 0.0
+
+
+@dataclass(slots=True, eq=False)
+class TradeRecord(Mapping[str, Any]):
+    """매매 실거래 1건 (금액은 원 단위)"""
+
+    area: float = 0.0
+    build_year: str = ""
+    year: str = ""
+    month: str = ""
+    day: str = ""
+    floor: str = ""
+    name: str = ""
+    dong: str = ""
+    price: int = 0
+
+    # 한글 키 → 속성 (기존 dict 행과 같은 키)
+    KEYS: ClassVar[dict[str, str]] = {
+        "전용면적": "area",
+        "건축년도": "build_year",
+        "년": "year",
+        "월": "month",
+        "일": "day",
+        "층": "floor",
+        "아파트": "name",
+        "법정동": "dong",
+        "거래금액": "price",
+    }
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, self.KEYS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def row(self) -> list:
+        """속성 선언 순서의 값 목록 (저장용)."""
+        return [getattr(self, name) for name in _FIELD_NAMES[type(self)]]
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> TradeRecord:
+        """한글 키 dict 행에서 레코드를 만든다."""
+        return cls(**{attr: data[key] for key, attr in cls.KEYS.items() if key in data})
+
+
+@dataclass(slots=True, eq=False)
+class RentRecord(TradeRecord):
+    """전월세 실거래 1건 (금액은 원 단위, 거래금액 = 보증금액)"""
+
+    deposit: int = 0
+    monthly_rent: int = 0
+    contract_type: str = ""
+
+    KEYS: ClassVar[dict[str, str]] = {
+        **TradeRecord.KEYS,
+        "보증금액": "deposit",
+        "월세금액": "monthly_rent",
+        "계약구분": "contract_type",
+    }
+
+
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {
+    cls: tuple(field.name for field in fields(cls)) for cls in (TradeRecord, RentRecord)
+}
+
+_COMMON_ALIASES: dict[str, tuple[str, ...]] = {
+    "area": ("excluUseAr", "전용면적"),
+    "build_year": ("buildYear", "건축년도"),
+    "year": ("dealYear", "계약년도", "년"),
+    "month": ("dealMonth", "계약월", "월"),
+    "day": ("dealDay", "계약일", "일"),
+    "floor": ("floor", "층"),
+    "name": ("aptNm", "단지명", "아파트", "연립다세대"),
+    "dong": ("umdNm", "법정동"),
+}
+_TRADE_ALIASES = {**_COMMON_ALIASES, "price": ("dealAmount", "거래금액")}
+_RENT_ALIASES = {
+    **_COMMON_ALIASES,
+    "deposit": ("deposit", "보증금액"),
+    "monthly_rent": ("monthlyRent", "월세금액"),
+    "contract_type": ("contractType", "계약구분"),
+}
+_AMOUNT_FIELDS = frozenset({"price", "deposit", "monthly_rent"})
+
+
+def _compile(aliases: dict[str, tuple[str, ...]]) -> dict[str, tuple[str, int]]:
+    return {tag: (field, rank) for field, tags in aliases.items() for rank, tag in enumerate(tags)}
+
+
+_TRADE_TAGS = _compile(_TRADE_ALIASES)
+_RENT_TAGS = _compile(_RENT_ALIASES)
+
+
+class MolitXmlParser:
+    """MOLIT 응답 XML을 조각 단위로 받아 레코드 목록과 totalCount를 만든다.
+
+    사용법: feed(chunk)를 응답 조각마다 호출하고 마지막에 finish()로 (레코드 목록, totalCount)를 받는다.
+    결과 코드 태그는 header에 모아 두고, 정상 resultCode가 없으면 finish()가 MolitApiError를 던진다.
+    data/end/close는 XMLParser가 호출하는 target 콜백이다. 태그마다 부르는 콜백을 줄이려고 start는 두지 않고
+    (앞 태그 사이 공백은 strip으로 제거) data는 텍스트 조각 목록의 append를 그대로 쓴다.
+    """
+
+    def __init__(self, *, rent: bool = False) -> None:
+        self.rent = rent
+        self.records: list[TradeRecord] = []
+        self.total_count = 0
+        self.header: dict[str, str] = {}
+        self._tags = _RENT_TAGS if rent else _TRADE_TAGS
+        self._values: dict[str, str] = {}
+        self._ranks: dict[str, int] = {}
+        self._chunks: list[str] = []
+        self._strings: dict[str, str] = {}
+        self.data = self._chunks.append
+        self._parser: ET.XMLParser | None = ET.XMLParser(target=self)
+
+    def feed(self, chunk: bytes | str) -> None:
+        self._parser.feed(chunk)
+
+    def finish(self) -> tuple[list[TradeRecord], int]:
+        # XMLParser ↔ target 순환 참조를 끊어 파서 버퍼가 GC 전까지 남지 않게 한다
+        parser, self._parser = self._parser, None
+        result = parser.close()
+        code = self.header.get("resultCode")
+        if code not in _SUCCESS_CODES:
+            raise MolitApiError(
+                code or self.header.get("returnReasonCode", ""),
+                self.header.get("resultMsg") or self.header.get("returnAuthMsg", ""),
+            )
+        return result
+
+    # --- XMLParser target 콜백 ---
+
+    def end(self, tag: str) -> None:
+        mapped = self._tags.get(tag)
+        if mapped is not None:
+            field, rank = mapped
+            text = "".join(self._chunks).strip()
+            if text and rank < self._ranks.get(field, len(self._tags)):
+                self._values[field] = text
+                self._ranks[field] = rank
+        elif tag == "item":
+            self.records.append(self._build())
+            self._values = {}
+            self._ranks = {}
+        elif tag == "totalCount":
+            self.total_count = int(_parse_float("".join(self._chunks)))
+        elif tag in _HEADER_TAGS:
+            self.header[tag] = "".join(self._chunks).strip()
+        self._chunks.clear()
+
+    def close(self) -> tuple[list[TradeRecord], int]:
+        return self.records, self.total_count
+
+    def _build(self) -> TradeRecord:
+        values: dict[str, Any] = {}
+        for field, text in self._values.items():
+            if field in _AMOUNT_FIELDS:
+                values[field] = _parse_int_amount(text)
+            elif field == "area":
+                values[field] = _parse_float(text)
+            else:
+                values[field] = self._strings.setdefault(text, text)
+        if self.rent:
+            return RentRecord(**values, price=values.get("deposit", 0))
+        return TradeRecord(**values)
+
+
+def parse_molit_xml(xml: bytes | str, *, rent: bool = False) -> tuple[list[TradeRecord], int]:
+    """응답 전체를 한 번에 파싱해 (레코드 목록, totalCount)를 반환한다. 오류 응답이면 MolitApiError."""
+    parser = MolitXmlParser(rent=rent)
+    parser.feed(xml)
+    return parser.finish()
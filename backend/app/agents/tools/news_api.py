@@ -5,8 +5,7 @@ from __future__ import annotations
 import logging
 import re
 
-import httpx
-
+from app.agents.tools.http_clients import get_http_client
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -110,9 +109,8 @@ async def search_news(
         "sort": sort,
     }
 
-    async with httpx.AsyncClient(timeout=15) as client:
-        response = await client.get(NAVER_SEARCH_URL, headers=headers, params=params)
-        response.raise_for_status()
+    response = await get_http_client("naver").get(NAVER_SEARCH_URL, headers=headers, params=params)
+    response.raise_for_status()
 
     data = response.json()
     return data.get("items", [])
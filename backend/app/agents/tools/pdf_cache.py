@@ -0,0 +1,170 @@
+"""PDF 추출 결과 캐시 - 파일 내용(SHA-256) 기준 content-addressed 디스크 캐시
+
+같은 법원 서류(매각물건명세서, 등기부등본 등)가 여러 분석에서 반복 업로드되므로
+페이지별 텍스트/테이블을 파일 해시로 저장해 두고 재사용한다.
+
+저장 형식: {digest}.json.z (페이지 목록 [[text, tables], ...]을 zlib 압축한 JSON,
+          테이블을 아직 계산하지 않은 페이지는 tables가 null)
+축출 정책: 캐시 디렉터리 총 용량이 상한을 넘으면 가장 오래 사용되지 않은(mtime 기준) 항목부터 삭제
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from pathlib import Path
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".json.z"
+_FORMAT_VERSION = 1
+
+
+def file_sha256(file_path: str) -> str:
+    """파일 내용의 SHA-256 hex digest를 반환한다."""
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class PdfExtractionCache:
+    """페이지별 PDF 추출 결과를 저장하는 LRU 디스크 캐시.
+
+    모든 메서드는 블로킹 I/O이므로 이벤트 루프에서는 asyncio.to_thread로 호출한다.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None
+
+    def _path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}{_SUFFIX}"
+
+    def get(self, digest: str) -> list[tuple[str, list]] | None:
+        """캐시된 페이지 목록을 반환한다. 없거나 손상되었으면 None."""
+        path = self._path(digest)
+        try:
+            payload = json.loads(zlib.decompress(path.read_bytes()))
+            if payload.get("v") != _FORMAT_VERSION:
+                raise ValueError(f"unsupported cache format: {payload.get('v')}")
+            pages = [(text, tables) for text, tables in payload["pages"]]
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except Exception:
+            logger.warning("손상된 PDF 캐시 항목 삭제: %s", path.name)
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # LRU: 최근 사용 시각을 mtime에 기록
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return pages
+
+    def put(self, digest: str, pages: list[tuple[str, list]]) -> None:
+        """페이지 목록을 저장하고 용량 상한을 넘으면 오래된 항목을 축출한다."""
+        data = zlib.compress(
+            json.dumps({"v": _FORMAT_VERSION, "pages": pages}, ensure_ascii=False, separators=(",", ":")).encode(),
+        )
+        if len(data) > self.max_bytes:
+            logger.debug("PDF 캐시 상한보다 큰 항목은 저장하지 않음: %s (%d bytes)", digest, len(data))
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(digest)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+
+        with self._lock:
+            total = self._current_total()
+            try:
+                previous = path.stat().st_size
+            except FileNotFoundError:
+                previous = 0
+            os.replace(tmp, path)
+            self._total_bytes = total + len(data) - previous
+            self._evict()
+
+    def stats(self) -> dict:
+        """적중/미스 카운터와 현재 용량을 반환한다."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "size_bytes": self._current_total(),
+                "max_bytes": self.max_bytes,
+            }
+
+    def _current_total(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(stat.st_size for _path, stat in self._stat_entries())
+        return self._total_bytes
+
+    def _entries(self) -> list[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob(f"*{_SUFFIX}"))
+
+    def _stat_entries(self) -> list[tuple[Path, os.stat_result]]:
+        """항목별 stat (다른 워커/프로세스가 그사이 지운 항목은 건너뜀)."""
+        stats = []
+        for path in self._entries():
+            try:
+                stats.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return stats
+
+    def _evict(self) -> None:
+        """용량 상한을 넘으면 mtime이 가장 오래된 항목부터 삭제한다 (lock 보유 상태에서 호출)."""
+        if self._current_total() <= self.max_bytes:
+            return
+        entries = sorted(self._stat_entries(), key=lambda e: e[1].st_mtime)
+        # 다른 프로세스가 지운 항목이 있을 수 있으므로 지금 남은 항목 기준으로 다시 센다
+        self._total_bytes = sum(stat.st_size for _path, stat in entries)
+        for path, stat in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            self._total_bytes -= stat.st_size
+            self.evictions += 1
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+_cache: PdfExtractionCache | None = None
+
+
+def get_pdf_cache() -> PdfExtractionCache | None:
+    """설정에 따라 전역 PDF 캐시를 반환한다 (비활성화 시 None)."""
+    global _cache
+    if not settings.pdf_cache_enabled:
+        return None
+    if _cache is None:
+        _cache = PdfExtractionCache(settings.pdf_cache_dir, settings.pdf_cache_max_mb * 1024 * 1024)
+    return _cache
@@ -1,57 +1,459 @@
-"""PDF 텍스트 추출 도구 - pdfplumber 기반 텍스트/테이블 추출 + OCR 폴백"""
+"""PDF 텍스트 추출 도구 - pdfplumber 기반 텍스트/테이블 추출 + OCR 폴백
+
+추출 결과는 파일 SHA-256 기준으로 디스크에 캐시되어 같은 서류 재업로드 시 재파싱하지 않는다.
+페이지 범위를 여러 청크로 나누어 프로세스 풀에서 병렬로 추출한 뒤 페이지 순서대로 합친다.
+iter_pdf_pages는 같은 과정을 페이지가 준비되는 대로 내보내는 스트리밍 버전이다.
+pdfplumber는 순수 파이썬 CPU 작업이므로 이벤트 루프 스레드에서 직접 실행하지 않는다.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
+import multiprocessing
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import TypeVar
 
 import pdfplumber
 
+from app.agents.tools.pdf_cache import file_sha256, get_pdf_cache
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-async def extract_text_from_pdf(file_path: str) -> tuple[str, list[list[list[str | None]]]]:
-    """PDF에서 텍스트와 테이블을 추출한다.
+Table = list[list[str | None]]
+# 페이지 1장에서 추출한 (텍스트, 테이블 목록) - 테이블을 아직 계산하지 않았으면 None
+PageResult = tuple[str, list[Table] | None]
+# 워커가 반환하는 원시 결과 (텍스트, 테이블 목록 또는 None, 페이지 내 이미지 수)
+RawPage = tuple[str, list[Table] | None, int]
 
-    1차: pdfplumber로 디지털 텍스트 + 테이블 추출
-    2차: 텍스트가 50자 미만이면 OCR 폴백 시도
+# 폰트 매핑이 없어 pdfminer가 글리프 ID로 출력한 문자 (예: "(cid:1234)") - 읽을 수 있는 텍스트가 아님
+_CID_PATTERN = re.compile(r"\(cid:\d+\)")
 
-    Returns:
-        (추출된 텍스트, 테이블 목록)
+_executor: ProcessPoolExecutor | None = None
+_ocr_executor: ProcessPoolExecutor | None = None
+
+
+def _init_worker() -> None:
+    """워커 프로세스 초기화 - spawn된 프로세스는 앱 로깅 설정을 물려받지 않는다."""
+    # pdfminer: 폰트 메타데이터 누락 경고가 반복되므로 ERROR 이상만 출력
+    logging.getLogger("pdfminer").setLevel(logging.ERROR)
+
+
+def _new_executor(max_workers: int) -> ProcessPoolExecutor:
+    # fork는 이벤트 루프/스레드 상태를 복제하므로 spawn으로 깨끗한 워커를 띄운다
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """PDF 추출용 프로세스 풀을 반환한다 (최초 호출 시 생성)."""
+    global _executor
+    if _executor is None:
+        _executor = _new_executor(settings.pdf_extract_workers)
+    return _executor
+
+
+def _get_ocr_executor() -> ProcessPoolExecutor:
+    """OCR(tesseract) 전용 프로세스 풀을 반환한다.
+
+    텍스트 추출 풀과 분리하여 느린 OCR 페이지가 디지털 PDF 추출을 막지 않도록 한다.
+    """
+    global _ocr_executor
+    if _ocr_executor is None:
+        _ocr_executor = _new_executor(settings.ocr_workers)
+    return _ocr_executor
+
+
+def shutdown_pdf_executor() -> None:
+    """PDF 추출/OCR 프로세스 풀을 종료한다 (앱 shutdown 시 호출)."""
+    global _executor, _ocr_executor
+    for executor in (_executor, _ocr_executor):
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _ocr_executor = None
+
+
+def _count_pages(file_path: str) -> int:
+    """PDF 페이지 수를 반환한다."""
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def _read_page(page: pdfplumber.page.Page, with_tables: bool) -> RawPage:
+    """페이지 1장의 텍스트, 테이블, 이미지 수를 읽는다.
+
+    테이블 탐지는 pdfplumber에서 가장 비싼 단계이므로 with_tables=False면 건너뛰고 None을 둔다.
     """
-    text = ""
-    tables: list[list[list[str | None]]] = []
+    tables = (page.extract_tables() or []) if with_tables else None
+    return page.extract_text() or "", tables, len(page.images)
+
+
+def _extract_page_range(file_path: str, start: int, end: int | None, with_tables: bool) -> list[RawPage]:
+    """[start, end) 범위 페이지를 추출한다.
+
+    프로세스 풀 워커에서 실행되므로 모듈 최상위 함수로 두고 picklable한 값만 반환한다.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        return [_read_page(page, with_tables) for page in pdf.pages[start:end]]
+
 
+def _extract_page_tables(file_path: str, page_indexes: list[int]) -> list[list[Table]]:
+    """지정한 페이지의 테이블만 추출한다."""
     with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            text += page_text + "\n"
+        return [pdf.pages[index].extract_tables() or [] for index in page_indexes]
+
+
+def has_text_layer(page_text: str, min_chars: int) -> bool:
+    """페이지에 쓸 만한 텍스트 레이어가 있는지 판단한다.
+
+    공백과 매핑되지 않은 글리프((cid:N))를 제외한 문자가 min_chars 이상이어야 한다.
+    """
+    visible = _CID_PATTERN.sub("", page_text)
+    return len("".join(visible.split())) >= min_chars
+
+
+def select_ocr_pages(pages: list[RawPage], min_chars: int) -> list[int]:
+    """OCR이 필요한 페이지 번호(0부터)를 반환한다.
+
+    텍스트 레이어가 없고 이미지가 있는 페이지만 대상이다 (빈 페이지는 OCR해도 얻을 것이 없다).
+    """
+    return [
+        index
+        for index, (page_text, _tables, image_count) in enumerate(pages)
+        if image_count > 0 and not has_text_layer(page_text, min_chars)
+    ]
+
+
+def split_page_ranges(page_count: int, workers: int, min_pages: int) -> list[tuple[int, int]]:
+    """페이지 범위를 워커 수에 맞게 연속된 청크로 나눈다.
+
+    워커당 2개 청크를 목표로 해서 페이지별 처리 시간 편차를 흡수하되,
+    청크마다 PDF를 다시 여는 비용이 있으므로 최소 min_pages장은 묶는다.
+
+    Examples:
+        >>> split_page_ranges(10, 2, 3)
+        [(0, 3), (3, 6), (6, 9), (9, 10)]
+    """
+    if page_count <= 0:
+        return []
+    chunk = max(min_pages, math.ceil(page_count / max(workers * 2, 1)))
+    return [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+
+
+async def _run_cpu(func: Callable[..., T], *args: object) -> T:
+    """CPU 작업을 프로세스 풀(워커가 1개면 스레드)에서 실행한다."""
+    if settings.pdf_extract_workers <= 1:
+        return await asyncio.to_thread(func, *args)
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), func, *args)
+
+
+async def _iter_pages_in_thread(file_path: str, with_tables: bool) -> AsyncIterator[list[RawPage]]:
+    """워커 스레드 1개에서 PDF를 한 번만 열고, 페이지가 디코딩될 때마다 1장씩 전달한다."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[list[RawPage] | BaseException | None] = asyncio.Queue()
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            with pdfplumber.open(file_path) as pdf:
+                for page in pdf.pages:
+                    if stop.is_set():
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, [_read_page(page, with_tables)])
+        except BaseException as exc:
+            loop.call_soon_threadsafe(queue.put_nowait, exc)
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    producer = asyncio.ensure_future(asyncio.to_thread(produce))
+    try:
+        while (item := await queue.get()) is not None:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # 소비자가 중간에 멈추면 다음 페이지에서 스레드를 종료시킨다
+        stop.set()
+        await producer
+
+
+async def _iter_raw_chunks(file_path: str, with_tables: bool) -> AsyncIterator[list[RawPage]]:
+    """페이지를 청크 단위로 페이지 순서대로 전달한다.
+
+    워커가 여러 개면 모든 청크를 프로세스 풀에 동시에 제출하고 앞 청크부터 차례로 기다린다.
+    페이지가 적거나 워커가 1개면 프로세스 간 전송 비용이 더 크므로 스레드 1개에서 처리한다.
+    """
+    workers = settings.pdf_extract_workers
+    ranges: list[tuple[int, int]] = []
+    if workers > 1:
+        page_count = await asyncio.to_thread(_count_pages, file_path)
+        ranges = split_page_ranges(page_count, workers, settings.pdf_min_pages_per_task)
+
+    if len(ranges) <= 1:
+        async for chunk in _iter_pages_in_thread(file_path, with_tables):
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    futures = [
+        loop.run_in_executor(executor, _extract_page_range, file_path, start, end, with_tables)
+        for start, end in ranges
+    ]
+    logger.debug("PDF 병렬 추출: %s (%d페이지, %d청크)", file_path, ranges[-1][1], len(ranges))
+    try:
+        for future in futures:
+            yield await future
+    finally:
+        for future in futures:
+            future.cancel()
+
 
-            page_tables = page.extract_tables()
-            if page_tables:
-                tables.extend(page_tables)
+async def _stream_extracted_pages(
+    file_path: str,
+    digest: str | None,
+    with_tables: bool,
+) -> AsyncIterator[PageResult]:
+    """pdfplumber 추출 + 선택적 OCR 결과를 페이지 순서대로 스트리밍한다.
 
-    # 텍스트가 너무 짧으면 OCR 시도
-    if len(text.strip()) < 50:
-        text = await _extract_with_ocr(file_path)
+    텍스트 레이어가 없는 (스캔) 페이지는 청크가 도착하는 즉시 OCR을 시작하고,
+    OCR이 끝난 청크부터 순서대로 내보낸다. 끝까지 소비되면 결과를 캐시에 저장한다.
+    """
+    pages: list[PageResult] = []
+    pending: deque[tuple[list[PageResult], int, asyncio.Task[dict[int, str]] | None]] = deque()
+    ocr_count = 0
+
+    async def merge(chunk: list[PageResult], start: int, task: asyncio.Task[dict[int, str]] | None) -> list[PageResult]:
+        if task is None:
+            return chunk
+        ocr_texts = await task
+        return [
+            (ocr_texts[start + i], page_tables) if ocr_texts.get(start + i, "").strip() else (page_text, page_tables)
+            for i, (page_text, page_tables) in enumerate(chunk)
+        ]
+
+    try:
+        next_index = 0
+        async for raw_chunk in _iter_raw_chunks(file_path, with_tables):
+            start, next_index = next_index, next_index + len(raw_chunk)
+            targets = [start + i for i in select_ocr_pages(raw_chunk, settings.ocr_min_page_chars)]
+            task = asyncio.create_task(_extract_with_ocr(file_path, targets)) if targets else None
+            ocr_count += len(targets)
+            pending.append(([(page_text, page_tables) for page_text, page_tables, _ in raw_chunk], start, task))
+
+            while pending and (pending[0][2] is None or pending[0][2].done()):
+                for page in await merge(*pending.popleft()):
+                    pages.append(page)
+                    yield page
+
+        while pending:
+            for page in await merge(*pending.popleft()):
+                pages.append(page)
+                yield page
+    finally:
+        for _chunk, _start, task in pending:
+            if task is not None:
+                task.cancel()
+
+    if ocr_count:
+        logger.info("OCR 대상 페이지: %d/%d - %s", ocr_count, len(pages), file_path)
+
+    # 텍스트가 비어 있으면 저장하지 않음 (OCR 미설치 등 일시적 실패를 고정하지 않도록)
+    cache = get_pdf_cache()
+    if digest and cache and any(page_text.strip() for page_text, _ in pages):
+        await asyncio.to_thread(cache.put, digest, pages)
+
+
+async def _lookup_cache(file_path: str) -> tuple[str | None, list[PageResult] | None]:
+    """파일 해시로 캐시를 조회한다. Returns: (digest, 캐시된 페이지 목록 또는 None)"""
+    cache = get_pdf_cache()
+    if cache is None:
+        return None, None
+    try:
+        digest = await asyncio.to_thread(file_sha256, file_path)
+    except OSError:
+        # 파일을 읽을 수 없으면 캐시 없이 진행 (추출 단계에서 원래 오류가 발생)
+        return None, None
+    return digest, await asyncio.to_thread(cache.get, digest)
+
+
+async def _load_pages(file_path: str, with_tables: bool) -> tuple[str | None, list[PageResult]]:
+    """캐시 조회 → (미스 시) pdfplumber 추출 + 선택적 OCR → 캐시 저장.
+
+    Returns:
+        (파일 digest 또는 None, 페이지 목록)
+    """
+    digest, pages = await _lookup_cache(file_path)
+    if pages is not None:
+        logger.info("PDF 캐시 적중: %s (%d페이지)", file_path, len(pages))
+        if with_tables:
+            pages = await _fill_tables(file_path, digest, pages, list(range(len(pages))))
+        return digest, pages
+
+    pages = [page async for page in _stream_extracted_pages(file_path, digest, with_tables)]
+    return digest, pages
+
+
+async def _fill_tables(
+    file_path: str,
+    digest: str | None,
+    pages: list[PageResult],
+    page_indexes: list[int],
+) -> list[PageResult]:
+    """아직 테이블을 계산하지 않은 페이지만 테이블을 추출해 채우고 캐시를 갱신한다."""
+    missing = [index for index in page_indexes if pages[index][1] is None]
+    if not missing:
+        return pages
+
+    computed = await _run_cpu(_extract_page_tables, file_path, missing)
+    pages = list(pages)
+    for index, page_tables in zip(missing, computed):
+        pages[index] = (pages[index][0], page_tables)
+    logger.debug("테이블 지연 추출: %s (%d페이지)", file_path, len(missing))
+
+    cache = get_pdf_cache()
+    if digest and cache:
+        await asyncio.to_thread(cache.put, digest, pages)
+    return pages
+
+
+async def extract_text_from_pdf(
+    file_path: str,
+    *,
+    with_tables: bool = False,
+) -> tuple[str, list[Table]]:
+    """PDF에서 텍스트(와 테이블)를 추출한다.
+
+    0차: 파일 SHA-256으로 추출 결과 캐시 조회 (적중 시 pdfplumber/OCR 생략)
+    1차: pdfplumber로 디지털 텍스트 추출 (프로세스 풀, 페이지 병렬)
+    2차: 텍스트 레이어가 없는 스캔 페이지만 골라 OCR 후 페이지 순서대로 병합
+
+    테이블 탐지는 비용이 크므로 기본값은 텍스트만 추출한다 (빈 테이블 목록 반환).
+    테이블이 필요하면 with_tables=True로 전체를 받거나, extract_tables_from_pdf로 필요한 페이지만 요청한다.
+
+    Returns:
+        (추출된 텍스트, 테이블 목록)
+    """
+    _digest, pages = await _load_pages(file_path, with_tables)
 
+    text = "".join(page_text + "\n" for page_text, _ in pages)
+    tables: list[Table] = [table for _, page_tables in pages for table in page_tables or []]
     return text, tables
 
 
-async def _extract_with_ocr(file_path: str) -> str:
-    """스캔된 PDF를 OCR로 텍스트 추출한다."""
+async def iter_pdf_pages(file_path: str) -> AsyncIterator[str]:
+    """extract_text_from_pdf의 스트리밍 버전 - 페이지 텍스트를 디코딩되는 대로 페이지 순서대로 yield한다.
+
+    문서 앞부분만 필요한 작업(문서 분류 등)이 나머지 페이지 추출과 겹쳐서 실행될 수 있다.
+    캐시 적중 시에는 캐시된 페이지를, 미스 시에는 텍스트 전용 추출 + 선택적 OCR 결과를 내보낸다.
+    """
+    digest, cached = await _lookup_cache(file_path)
+    if cached is not None:
+        logger.info("PDF 캐시 적중: %s (%d페이지)", file_path, len(cached))
+        for page_text, _ in cached:
+            yield page_text
+        return
+
+    async for page_text, _ in _stream_extracted_pages(file_path, digest, with_tables=False):
+        yield page_text
+
+
+async def extract_tables_from_pdf(
+    file_path: str,
+    page_indexes: list[int] | None = None,
+) -> list[list[Table]]:
+    """요청한 페이지의 테이블만 추출한다 (지연 테이블 추출).
+
+    이미 계산된 페이지의 테이블은 캐시에서 재사용하고, 새로 계산한 테이블은 캐시에 추가한다.
+
+    Args:
+        file_path: PDF 경로
+        page_indexes: 페이지 번호 목록 (0부터, None이면 전체)
+
+    Returns:
+        page_indexes 순서대로 각 페이지의 테이블 목록
+    """
+    if get_pdf_cache() is None:
+        # 캐시가 없으면 텍스트를 다시 뽑을 이유가 없으므로 테이블만 계산
+        if page_indexes is None:
+            page_indexes = list(range(await asyncio.to_thread(_count_pages, file_path)))
+        return await _run_cpu(_extract_page_tables, file_path, page_indexes)
+
+    digest, pages = await _load_pages(file_path, with_tables=False)
+    if page_indexes is None:
+        page_indexes = list(range(len(pages)))
+    pages = await _fill_tables(file_path, digest, pages, page_indexes)
+    return [pages[index][1] or [] for index in page_indexes]
+
+
+def _ocr_page(file_path: str, page_index: int, dpi: int) -> tuple[str, float]:
+    """한 페이지만 래스터화하여 OCR한다 (OCR 프로세스 풀 워커에서 실행).
+
+    convert_from_path에 first_page/last_page를 지정해 해당 페이지 이미지만 메모리에 올리므로
+    워커당 메모리 사용량이 문서 페이지 수와 무관하게 페이지 1장 분량으로 제한된다.
+
+    Returns:
+        (OCR 텍스트, 래스터화+OCR 소요 시간(초))
+    """
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    started = time.perf_counter()
+    # pdf2image의 페이지 번호는 1부터 시작
+    images = convert_from_path(file_path, dpi=dpi, first_page=page_index + 1, last_page=page_index + 1)
+    text = "".join(pytesseract.image_to_string(image, lang="kor") for image in images)
+    return text, time.perf_counter() - started
+
+
+async def _extract_with_ocr(file_path: str, page_indexes: list[int]) -> dict[int, str]:
+    """지정한 페이지만 OCR 프로세스 풀에서 병렬로 텍스트 추출한다.
+
+    동시에 처리되는 페이지는 OCR 워커 수(ocr_workers)로 제한되고, 대기 중인 페이지는
+    (파일 경로, 페이지 번호)만 큐에 있으므로 전체 메모리 사용량이 페이지 수에 비례하지 않는다.
+
+    Returns:
+        {페이지 번호: 텍스트} - 실패한 페이지는 포함되지 않음
+    """
     try:
-        import pytesseract
-        from pdf2image import convert_from_path
+        import pytesseract  # noqa: F401
+        from pdf2image import convert_from_path  # noqa: F401
     except ImportError:
         logger.warning("pytesseract 또는 pdf2image가 설치되지 않아 OCR을 건너뜁니다.")
-        return ""
+        return {}
 
-    try:
-        images = convert_from_path(file_path)
-        text = ""
-        for image in images:
-            text += pytesseract.image_to_string(image, lang="kor") + "\n"
-        return text
-    except Exception:
-        logger.exception("OCR 처리 중 오류 발생")
-        return ""
+    loop = asyncio.get_running_loop()
+    executor = _get_ocr_executor()
+
+    async def ocr_one(page_index: int) -> tuple[int, str | None, float]:
+        try:
+            text, elapsed = await loop.run_in_executor(
+                executor, _ocr_page, file_path, page_index, settings.ocr_dpi,
+            )
+        except Exception:
+            logger.exception("OCR 처리 중 오류 발생 (page %d)", page_index + 1)
+            return page_index, None, 0.0
+        logger.debug("  OCR page %d: %.2fs (%d자)", page_index + 1, elapsed, len(text))
+        return page_index, text, elapsed
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*[ocr_one(i) for i in page_indexes])
+    latencies = [elapsed for _, text, elapsed in outcomes if text is not None]
+    if latencies:
+        logger.debug(
+            "OCR 완료: %d페이지, 총 %.2fs (페이지당 평균 %.2fs, 최대 %.2fs)",
+            len(latencies), time.perf_counter() - started, sum(latencies) / len(latencies), max(latencies),
+        )
+    return {page_index: text for page_index, text, _ in outcomes if text is not None}
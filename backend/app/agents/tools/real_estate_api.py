@@ -2,18 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
+from datetime import date
 from urllib.parse import quote, unquote, urlencode
-import xml.etree.ElementTree as ET
-
-import httpx
 
+from app.agents.tools.http_clients import get_http_client
+from app.agents.tools.molit_parser import MolitXmlParser, TradeRecord, parse_molit_xml
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 MOLIT_BASE_URL = "https://apis.data.go.kr/1613000"
 
+# 페이지당 행 수 (API 최대값)
+MOLIT_PAGE_SIZE = 1000
+# 한 달치 조회에서 2페이지 이후를 동시에 받는 수 (전체 연결 수는 공유 클라이언트 풀 한도를 따른다)
+MOLIT_PAGE_CONCURRENCY = 4
+
 # 부동산 유형별 API 경로 (공공데이터포털 신규 엔드포인트)
 # 키 형식: "{부동산유형}{거래유형}" (예: "아파트매매", "아파트전월세")
 API_ENDPOINTS: dict[str, str] = {
@@ -40,67 +47,45 @@ PROPERTY_TYPE_MAP: dict[str, str] = {
 }
 
 
-def _parse_int_amount(text: str | None) -> int:
-    """만원 단위 금액 문자열을 원 단위 정수로 변환한다."""
-    raw = (text or "0").strip().replace(",", "")
-    try:
-        return int(raw) * 10_000
-    except ValueError:
-        return 0
+class DailyCallCounter:
+    """오늘(로컬 날짜 기준) 보낸 API 호출 수 - 일일 호출 한도 관리용 (프로세스 메모리에만 유지)"""
+
+    def __init__(self) -> None:
+        self._day = date.today()
+        self._count = 0
+        self._lock = threading.Lock()
 
+    def _roll(self) -> None:
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._count = 0
 
-def _parse_float(text: str | None) -> float:
-    """숫자 문자열을 float로 변환한다."""
-    raw = (text or "0").strip()
-    try:
-        return float(raw)
-    except ValueError:
-        return 0.0
+    def record(self) -> None:
+        with self._lock:
+            self._roll()
+            self._count += 1
 
+    def used(self) -> int:
+        with self._lock:
+            self._roll()
+            return self._count
 
-def _text(item: ET.Element, *tag_names: str) -> str:
-    """여러 태그명 중 첫 번째로 값이 있는 것을 반환한다 (한글/영어 호환)."""
-    for tag in tag_names:
-        val = (item.findtext(tag) or "").strip()
-        if val:
-            return val
-    return ""
 
+molit_calls = DailyCallCounter()
 
-def parse_xml_response(xml_text: str, response_type: str = "trade") -> list[dict]:
-    """MOLIT API XML 응답을 dict 리스트로 변환한다.
+
+def parse_xml_response(xml_text: str, response_type: str = "trade") -> list[TradeRecord]:
+    """MOLIT API XML 응답을 실거래 레코드 리스트로 변환한다.
 
     Args:
         xml_text: XML 응답 문자열
         response_type: "trade" (매매) 또는 "rent" (전월세)
+
+    Raises:
+        MolitApiError: 정상 결과 코드가 아닌 응답 (호출 한도 초과, 인증키 오류 등)
     """
-    root = ET.fromstring(xml_text)
-    items = root.findall(".//item")
-
-    transactions: list[dict] = []
-    for item in items:
-        record: dict = {
-            "전용면적": _parse_float(_text(item, "excluUseAr", "전용면적")),
-            "건축년도": _text(item, "buildYear", "건축년도"),
-            "년": _text(item, "dealYear", "계약년도", "년"),
-            "월": _text(item, "dealMonth", "계약월", "월"),
-            "일": _text(item, "dealDay", "계약일", "일"),
-            "층": _text(item, "floor", "층"),
-            "아파트": _text(item, "aptNm", "단지명", "아파트", "연립다세대"),
-            "법정동": _text(item, "umdNm", "법정동"),
-        }
-
-        if response_type == "rent":
-            record["보증금액"] = _parse_int_amount(_text(item, "deposit", "보증금액"))
-            record["월세금액"] = _parse_int_amount(_text(item, "monthlyRent", "월세금액"))
-            record["계약구분"] = _text(item, "contractType", "계약구분")
-            record["거래금액"] = record["보증금액"]
-        else:
-            record["거래금액"] = _parse_int_amount(_text(item, "dealAmount", "거래금액"))
-
-        transactions.append(record)
-
-    return transactions
+    return parse_molit_xml(xml_text, rent=response_type == "rent")[0]
 
 
 def resolve_property_type(property_type_text: str) -> str:
@@ -118,9 +103,11 @@ async def fetch_transactions(
     deal_ymd: str,
     property_type: str = "아파트",
     transaction_type: str = "매매",
-) -> list[dict]:
+) -> list[TradeRecord]:
     """국토교통부 실거래가 API를 호출한다.
 
+    첫 페이지의 totalCount가 MOLIT_PAGE_SIZE를 넘으면 나머지 페이지를 동시에 받아 이어 붙인다.
+
     Args:
         lawd_cd: 법정동코드 5자리
         deal_ymd: 계약년월 (YYYYMM)
@@ -128,30 +115,76 @@ async def fetch_transactions(
         transaction_type: "매매" 또는 "전월세"
 
     Returns:
-        거래 내역 dict 리스트
+        거래 내역 레코드 리스트 (전월세는 RentRecord)
+
+    Raises:
+        MolitApiError: 정상 결과 코드가 아닌 응답 (호출 한도 초과, 인증키 오류 등)
+    """
+    return (await fetch_month(lawd_cd, deal_ymd, property_type, transaction_type))[0]
+
+
+async def fetch_month(
+    lawd_cd: str,
+    deal_ymd: str,
+    property_type: str = "아파트",
+    transaction_type: str = "매매",
+) -> tuple[list[TradeRecord], int]:
+    """fetch_transactions와 같지만 정상 응답이 알려 준 totalCount도 함께 반환한다.
+
+    지원하지 않는 유형은 API를 부르지 않고 ([], 0)을 반환한다.
     """
     endpoint_key = f"{property_type}{transaction_type}"
     endpoint = API_ENDPOINTS.get(endpoint_key)
     if not endpoint:
         logger.warning("지원하지 않는 API 유형: %s", endpoint_key)
-        return []
-
+        return [], 0
+
+    rent = transaction_type == "전월세"
+    transactions, total_count = await _fetch_page(endpoint, lawd_cd, deal_ymd, 1, rent=rent)
+
+    # totalCount가 페이지 크기를 넘으면 나머지 페이지를 동시에 받는다
+    pages = -(-total_count // MOLIT_PAGE_SIZE)
+    if pages > 1:
+        sem = asyncio.Semaphore(MOLIT_PAGE_CONCURRENCY)
+
+        async def fetch_rest(page_no: int) -> list[TradeRecord]:
+            async with sem:
+                return (await _fetch_page(endpoint, lawd_cd, deal_ymd, page_no, rent=rent))[0]
+
+        for rows in await asyncio.gather(*(fetch_rest(page_no) for page_no in range(2, pages + 1))):
+            transactions.extend(rows)
+
+    if total_count and len(transactions) != total_count:
+        logger.warning(
+            "  MOLIT API [%s] %s %s: totalCount %d건 중 %d건 수신",
+            deal_ymd, property_type, transaction_type, total_count, len(transactions),
+        )
+    logger.debug(
+        "  MOLIT API [%s] %s %s: %d건 (%d페이지)",
+        deal_ymd, property_type, transaction_type, len(transactions), max(pages, 1),
+    )
+    return transactions, total_count
+
+
+async def _fetch_page(
+    endpoint: str, lawd_cd: str, deal_ymd: str, page_no: int, *, rent: bool
+) -> tuple[list[TradeRecord], int]:
+    """API 1페이지를 받으면서 응답 조각을 바로 파서에 넣어 (레코드 목록, totalCount)를 반환한다."""
     # serviceKey의 +, /, = 등 특수문자를 percent-encoding 처리
     raw_key = unquote(settings.molit_api_key)
     encoded_key = quote(raw_key, safe="")
     other_params = urlencode({
         "LAWD_CD": lawd_cd,
         "DEAL_YMD": deal_ymd,
-        "pageNo": 1,
-        "numOfRows": 1000,
+        "pageNo": page_no,
+        "numOfRows": MOLIT_PAGE_SIZE,
     })
     url = f"{MOLIT_BASE_URL}{endpoint}?serviceKey={encoded_key}&{other_params}"
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.get(url)
+    molit_calls.record()
+    parser = MolitXmlParser(rent=rent)
+    async with get_http_client("molit").stream("GET", url) as response:
         response.raise_for_status()
-
-    resp_type = "rent" if transaction_type == "전월세" else "trade"
-    transactions = parse_xml_response(response.text, response_type=resp_type)
-    logger.debug("  MOLIT API [%s] %s %s: %d건", deal_ymd, property_type, transaction_type, len(transactions))
-    return transactions
+        async for chunk in response.aiter_bytes():
+            parser.feed(chunk)
+    return parser.finish()
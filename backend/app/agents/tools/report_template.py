@@ -0,0 +1,229 @@
+"""템플릿 기반 리포트 요약 렌더러 - 분석 결과 dataclass로 analysis_summary를 LLM 없이 만든다
+
+가치평가 노드가 이미 계산한 입찰/매도가, 수익률, 비용과 권리/시세/뉴스 분석 결과를 정해진 문장에 채운다.
+LLM 리포트와 같은 7개 항목을 같은 순서로 만들며, 항목마다 입력이 없으면 확인할 수 없다는 문장으로 채운다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import astuple
+
+from app.schemas.document import AppraisalExtraction, RegistryExtraction, SaleItemExtraction
+from app.schemas.market import MarketDataResult
+from app.schemas.news import NewsAnalysisResult
+from app.schemas.rights import RightsAnalysisResult
+from app.schemas.valuation import Recommendation, ValuationResult
+
+_RISK_LABELS = {"high": "높음", "medium": "보통", "low": "낮음"}
+
+_RECOMMENDATION_LABELS = {
+    Recommendation.RECOMMEND: "입찰 추천",
+    Recommendation.HOLD: "입찰 보류",
+    Recommendation.NOT_RECOMMEND: "입찰 비추천",
+}
+
+_SQM_PER_PYEONG = 3.305785
+
+
+def format_won(amount: int | float) -> str:
+    """금액을 "3억 2,500만원" 형태로 표시한다 (만원 미만 절사)."""
+    amount = int(amount)
+    sign = "-" if amount < 0 else ""
+    man = abs(amount) // 10_000
+    eok, rest = divmod(man, 10_000)
+    if eok and rest:
+        return f"{sign}{eok}억 {rest:,}만원"
+    if eok:
+        return f"{sign}{eok}억원"
+    if man:
+        return f"{sign}{man:,}만원"
+    return f"{sign}{abs(amount):,}원"
+
+
+def _list(items: list[str], limit: int = 3) -> str:
+    return ", ".join(items[:limit]) + (f" 외 {len(items) - limit}건" if len(items) > limit else "")
+
+
+def render_property_overview(
+    registry: RegistryExtraction | None,
+    sale_item: SaleItemExtraction | None,
+    appraisal: AppraisalExtraction | None,
+) -> str:
+    address = (registry.property_address if registry else "") or (sale_item.property_address if sale_item else "")
+    if not address and appraisal is None:
+        return "제출된 문서에서 물건 정보를 확인할 수 없습니다."
+
+    details: list[str] = []
+    if registry and registry.building_name:
+        details.append(registry.building_name)
+    if registry and registry.area:
+        details.append(f"전용 {registry.area:g}㎡, 약 {registry.area / _SQM_PER_PYEONG:.1f}평")
+    kind = (registry.property_type if registry else "") or "부동산"
+    if details:
+        kind += f"({', '.join(details)})"
+    sentences = [f"{address or '소재지 미확인'} 소재 {kind}입니다."]
+    if sale_item and sale_item.case_number:
+        sentences.append(f"사건번호는 {sale_item.case_number}입니다.")
+    if appraisal and appraisal.appraised_value > 0:
+        sentences.append(f"감정가는 {format_won(appraisal.appraised_value)}입니다.")
+    return " ".join(sentences)
+
+
+def render_rights_summary(rights: RightsAnalysisResult | None) -> str:
+    if rights is None:
+        return "권리분석 결과가 없어 인수할 권리를 확인하지 못했습니다. 입찰 전 등기부등본을 직접 확인하세요."
+
+    sentences = [f"말소기준권리는 {rights.extinguishment_basis or '확인되지 않은 권리'}입니다."]
+    if rights.assumed_rights:
+        amount = f"(총 {format_won(rights.total_assumed_amount)})" if rights.total_assumed_amount else ""
+        sentences.append(f"낙찰자가 인수해야 하는 권리{amount}: {_list(rights.assumed_rights)}.")
+    else:
+        sentences.append("말소기준권리보다 앞선 권리가 없어 낙찰 후 인수할 권리는 없습니다.")
+
+    opposing = [tenant for tenant in rights.tenants if tenant.has_opposition_right]
+    if opposing:
+        sentences.append(
+            f"대항력 있는 임차인이 {len(opposing)}명이며, 보증금 {format_won(rights.total_assumed_deposit)}을 "
+            "낙찰자가 인수할 수 있습니다."
+        )
+    elif rights.tenants:
+        sentences.append(f"임차인 {len(rights.tenants)}명은 모두 대항력이 없어 보증금 인수 부담이 없습니다.")
+
+    risk = f"종합 위험도는 '{_RISK_LABELS.get(rights.risk_level.value, rights.risk_level.value)}'입니다"
+    if rights.risk_factors:
+        risk += f" (주요 위험 요인: {_list(rights.risk_factors)})"
+    sentences.append(risk + ".")
+    return " ".join(sentences)
+
+
+def render_market_summary(market: MarketDataResult | None) -> str:
+    if market is None or not (market.recent_transactions or market.avg_price_per_pyeong):
+        return "주변 실거래 데이터가 없어 시세를 확인하지 못했습니다. 감정가 기준으로 평가했습니다."
+
+    sentences: list[str] = []
+    if market.recent_transactions:
+        sentences.append(f"유사 면적 최근 실거래 {len(market.recent_transactions)}건을 분석했습니다.")
+    if market.avg_price_per_pyeong:
+        sentences.append(f"평균 평당가는 {format_won(market.avg_price_per_pyeong)}입니다.")
+    if market.price_range_high:
+        sentences.append(
+            f"거래가는 {format_won(market.price_range_low)}~{format_won(market.price_range_high)} 범위입니다."
+        )
+    if market.appraisal_vs_market_gap:
+        direction = "높습니다" if market.appraisal_vs_market_gap > 0 else "낮습니다"
+        sentences.append(f"평균 시세가 감정가보다 {abs(market.appraisal_vs_market_gap) * 100:.1f}% {direction}.")
+    if market.price_trend:
+        sentences.append(f"가격 추이는 '{market.price_trend}'입니다.")
+    if market.jeonse_ratio:
+        sentences.append(f"전세가율은 {market.jeonse_ratio * 100:.1f}%입니다.")
+    return " ".join(sentences)
+
+
+def render_news_summary(news: NewsAnalysisResult | None) -> str:
+    if news is None or not (news.collected_news or news.market_trend_summary):
+        return "지역 뉴스를 수집하지 못해 동향을 반영하지 않았습니다."
+
+    sentences: list[str] = []
+    if news.market_trend_summary:
+        sentences.append(news.market_trend_summary.rstrip(".") + ".")
+    if news.positive_factors:
+        sentences.append(f"호재: {_list(news.positive_factors)}.")
+    if news.negative_factors:
+        sentences.append(f"악재: {_list(news.negative_factors)}.")
+    outlook = f"6개월 전망은 '{news.outlook_6month or '중립'}'"
+    if news.area_attractiveness_score:
+        outlook += f", 지역 매력도는 100점 만점에 {news.area_attractiveness_score:.0f}점"
+    sentences.append(outlook + "입니다.")
+    return " ".join(sentences)
+
+
+def _reasoning_line(valuation: ValuationResult, prefix: str) -> str:
+    """가치평가 산출 근거에서 해당 항목 줄을 찾는다."""
+    for line in valuation.reasoning.splitlines():
+        if line.startswith(prefix):
+            return line.removeprefix(prefix).lstrip(": ").rstrip(".") + "."
+    return ""
+
+
+def render_bid_price_reasoning(valuation: ValuationResult | None) -> str:
+    if valuation is None:
+        return "시세를 추정할 수 없어 입찰 적정가를 산출하지 못했습니다."
+
+    bid = valuation.bid_price
+    costs = valuation.cost_breakdown
+    cost_total = sum(astuple(costs))
+    sentences = [
+        f"입찰 적정가는 {format_won(bid.moderate)}이며, 보수적으로는 {format_won(bid.conservative)}, "
+        f"공격적으로는 {format_won(bid.aggressive)}까지 고려할 수 있습니다."
+    ]
+    for prefix in ("추정 시세", "입찰 적정가"):
+        line = _reasoning_line(valuation, prefix)
+        if line:
+            sentences.append(f"{prefix}: {line}")
+    if cost_total:
+        sentences.append(
+            f"부대비용은 취득세 {format_won(costs.acquisition_tax)}, 명도비 {format_won(costs.eviction_cost)} 등 "
+            f"약 {format_won(cost_total)}입니다."
+        )
+    return " ".join(sentences)
+
+
+def render_sale_price_reasoning(valuation: ValuationResult | None) -> str:
+    if valuation is None:
+        return "시세를 추정할 수 없어 매도 적정가를 산출하지 못했습니다."
+
+    sale = valuation.sale_price
+    sentences = [
+        f"매도 적정가는 {format_won(sale.moderate)}이며, 비관적으로는 {format_won(sale.conservative)}, "
+        f"낙관적으로는 {format_won(sale.aggressive)}입니다."
+    ]
+    line = _reasoning_line(valuation, "매도 적정가")
+    if line:
+        sentences.append(f"산출 근거: {line}")
+    if valuation.cost_breakdown.capital_gains_tax:
+        tax = format_won(valuation.cost_breakdown.capital_gains_tax)
+        sentences.append(f"매도 시 양도소득세 약 {tax}를 고려했습니다.")
+    return " ".join(sentences)
+
+
+def render_overall_opinion(valuation: ValuationResult | None, rights: RightsAnalysisResult | None) -> str:
+    if valuation is None:
+        return "가치평가를 완료하지 못해 종합 의견을 제시할 수 없습니다. 시세와 권리 관계를 직접 확인하세요."
+
+    label = _RECOMMENDATION_LABELS.get(valuation.recommendation, valuation.recommendation.value)
+    sentences = [
+        f"종합 판단은 '{label}'입니다.",
+        f"적정 입찰가 {format_won(valuation.bid_price.moderate)}에 낙찰받아 적정 매도가 "
+        f"{format_won(valuation.sale_price.moderate)}에 매도하면 예상 수익률은 {valuation.expected_roi:.1f}%입니다.",
+    ]
+    if valuation.risk_summary:
+        sentences.append(f"권리 측면의 {valuation.risk_summary}.")
+    reason = valuation.reasoning.splitlines()[-1] if valuation.reasoning else ""
+    if reason:
+        sentences.append(reason.rstrip(".") + ".")
+    if rights is None:
+        sentences.append("권리분석 결과가 없으므로 입찰 전 등기부등본과 매각물건명세서를 반드시 확인하세요.")
+    sentences.append(f"분석 신뢰도는 {valuation.confidence_score * 100:.0f}%입니다.")
+    return " ".join(sentences)
+
+
+def render_analysis_summary(
+    *,
+    registry: RegistryExtraction | None = None,
+    sale_item: SaleItemExtraction | None = None,
+    appraisal: AppraisalExtraction | None = None,
+    rights: RightsAnalysisResult | None = None,
+    market: MarketDataResult | None = None,
+    news: NewsAnalysisResult | None = None,
+    valuation: ValuationResult | None = None,
+) -> dict[str, str]:
+    """LLM 리포트와 같은 구조의 analysis_summary를 템플릿으로 만든다."""
+    return {
+        "property_overview": render_property_overview(registry, sale_item, appraisal),
+        "rights_summary": render_rights_summary(rights),
+        "market_summary": render_market_summary(market),
+        "news_summary": render_news_summary(news),
+        "bid_price_reasoning": render_bid_price_reasoning(valuation),
+        "sale_price_reasoning": render_sale_price_reasoning(valuation),
+        "overall_opinion": render_overall_opinion(valuation, rights),
+    }
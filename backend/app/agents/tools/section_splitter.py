@@ -0,0 +1,102 @@
+"""복합문서 섹션 분할기 - 경매 포털 종합 페이지를 섹션별로 나눠 추출기별 입력을 줄인다
+
+탱크옥션/지지옥션 등의 종합 페이지는 등기(갑구/을구), 감정평가, 임차인 현황, 매각물건,
+현황조사 외에도 매각사례·실거래가·단지정보 같은 추출과 무관한 섹션이 절반 이상을 차지한다.
+줄 단위로 섹션 제목(앵커)을 찾아 문서를 연속 구간으로 나누고, 추출기마다 필요한 섹션만 이어 붙인다.
+
+- 첫 앵커 이전 구간(header)은 사건번호·소재지·감정가 요약이 들어 있으므로 모든 추출기에 포함한다.
+- 앵커를 하나도 찾지 못했거나 추출기에 필요한 섹션이 없으면 원문 전체를 그대로 돌려준다.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+HEADER = "header"
+OTHER = "other"
+
+# 섹션 이름 → 제목 줄 패턴 (공백/괄호를 제거한 줄 전체와 매칭)
+_ANCHORS: list[tuple[str, re.Pattern[str]]] = [
+    ("registry", re.compile(r"(건물|토지|집합건물)등기|등기(부등본|사항전부증명서|사항)|갑구|을구|표제부")),
+    ("appraisal", re.compile(r"토지/?건물현황|감정평가(서|요항표|명세표|의견|액)?|감정평가액의산출근거")),
+    ("tenant", re.compile(r"임차인현황|임대차(관계|현황|정보)|점유관계")),
+    ("sale_item", re.compile(r"매각물건(명세서)?|주의사항|특별매각조건|인수(할|되는)권리")),
+    ("status", re.compile(r"현황조사(보고서|서)?|현황·?위치|주변환경|기타사항|부동산의현황")),
+    (
+        OTHER,
+        re.compile(
+            r"매각사례|국토부실거래가|단지정보|건축물정보|예상대출한도|상세설명|인근역세권"
+            r"|행정기관|교육환경|체납내역|동호수/공시가격N?"
+        ),
+    ),
+]
+
+# 제목 줄은 짧다 - 긴 줄은 본문으로 본다
+_MAX_TITLE_CHARS = 30
+# 제목 앞뒤 장식 문자 및 "(소유권에 관한 사항)" 같은 괄호 설명
+_DECORATION = re.compile(r"[\s\[\]【】<>〈〉「」■□▶◆]+")
+_TRAILING_NOTE = re.compile(r"\(.*\)$")
+
+# 추출기별로 필요한 섹션 (header는 항상 포함)
+EXTRACTOR_SECTIONS: dict[str, tuple[str, ...]] = {
+    "registry": ("registry",),
+    "appraisal": ("appraisal",),
+    "sale_item": ("sale_item", "tenant", "registry"),
+    "status_report": ("status", "tenant", "appraisal"),
+}
+
+
+@dataclass
+class Section:
+    """원문에서 [start, end) 구간을 차지하는 섹션"""
+
+    name: str
+    title: str
+    start: int
+    end: int
+
+
+def _match_anchor(line: str) -> str | None:
+    """줄이 섹션 제목이면 섹션 이름을, 아니면 None을 반환한다."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > _MAX_TITLE_CHARS:
+        return None
+    compact = _TRAILING_NOTE.sub("", _DECORATION.sub("", stripped))
+    for name, pattern in _ANCHORS:
+        if pattern.fullmatch(compact):
+            return name
+    return None
+
+
+def split_sections(text: str) -> list[Section]:
+    """텍스트를 섹션 제목 기준의 연속 구간으로 나눈다.
+
+    구간은 빈틈 없이 원문 전체를 덮으며, 첫 앵커 이전 구간은 header가 된다.
+    앵커가 없으면 header 하나만 반환한다.
+
+    >>> [s.name for s in split_sections("사건 2025타경1\\n임차인 현황\\n없음\\n건물등기\\n을(1)\\n")]
+    ['header', 'tenant', 'registry']
+    """
+    sections = [Section(HEADER, "", 0, len(text))]
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        name = _match_anchor(line)
+        if name is not None:
+            sections[-1].end = offset
+            sections.append(Section(name, line.strip(), offset, len(text)))
+        offset += len(line)
+    return [s for s in sections if s.end > s.start or s.name != HEADER]
+
+
+def slice_for_extractor(text: str, extractor: str, sections: list[Section] | None = None) -> str:
+    """추출기(registry/appraisal/sale_item/status_report)에 필요한 섹션만 원문 순서대로 이어 붙인다.
+
+    필요한 섹션을 하나도 찾지 못하면 누락을 피하기 위해 원문 전체를 반환한다.
+    """
+    if sections is None:
+        sections = split_sections(text)
+    wanted = EXTRACTOR_SECTIONS[extractor]
+    if not any(s.name in wanted for s in sections):
+        return text
+    return "".join(text[s.start : s.end] for s in sections if s.name == HEADER or s.name in wanted)
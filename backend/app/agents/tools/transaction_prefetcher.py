@@ -0,0 +1,170 @@
+"""실거래 미리 받기 - 최근 분석이 몰린 법정동의 실거래 데이터를 백그라운드에서 갱신한다
+
+새 분석의 시세 단계가 MOLIT API를 기다리지 않고 실거래 저장소(transaction_store)에서 바로 읽도록
+prefetch_interval_seconds마다 다음을 수행한다.
+
+- 최근 prefetch_window_hours 동안 만든 분석의 소재지를 법정동코드(LAWD_CODE_MAP)/부동산 유형으로 묶어
+  분석 수가 많은 순으로 최대 prefetch_max_districts개를 고른다
+- 고른 법정동의 매매/전월세 중 마감 전 달(이번 달 등)을 다음 갱신 전에 TTL이 지나기 전에 다시 받고,
+  그다음 수집 기간 중 저장소에 없는 달을 받는다
+- 오늘 MOLIT 호출 수(분석 요청 포함)가 molit_daily_quota × prefetch_quota_ratio에 이르면 멈춘다
+  (나머지 한도는 분석 요청용)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select
+
+from app.agents.tools.address_converter import address_to_lawd_code
+from app.agents.tools.real_estate_api import molit_calls, resolve_property_type
+from app.agents.tools.transaction_store import (
+    COLLECTION_MONTHS,
+    MonthKey,
+    get_transaction_store,
+    recent_deal_ymds,
+    sync_month,
+)
+from app.config import settings
+from app.database import async_session
+from app.models.analysis import Analysis
+
+logger = logging.getLogger(__name__)
+
+
+def prefetch_budget_left() -> bool:
+    """미리 받기에 쓸 수 있는 API 호출 한도가 남아 있는지."""
+    if settings.molit_daily_quota <= 0:
+        return True
+    return molit_calls.used() < settings.molit_daily_quota * settings.prefetch_quota_ratio
+
+
+class TransactionPrefetcher:
+    """최근 분석 지역의 실거래 데이터를 주기적으로 받아 두는 백그라운드 작업"""
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+        self.runs = 0
+        self.fetched_months = 0
+        self.failed = 0
+        self.quota_skipped = 0
+        self.districts = 0
+        self.last_run_at: float | None = None
+
+    async def hot_districts(self) -> list[tuple[str, str]]:
+        """최근 분석이 많은 (법정동코드, 부동산 유형)을 분석 수 내림차순으로 반환한다."""
+        cutoff = datetime.now(UTC) - timedelta(hours=settings.prefetch_window_hours)
+        async with async_session() as db:
+            result = await db.execute(
+                select(Analysis.property_address, Analysis.property_type).where(
+                    Analysis.created_at >= cutoff.replace(tzinfo=None),
+                    Analysis.property_address.is_not(None),
+                )
+            )
+            rows = result.all()
+
+        base_types: dict[str, str] = {}
+        counts: Counter[tuple[str, str]] = Counter()
+        for address, property_type in rows:
+            lawd_cd = address_to_lawd_code(address)
+            if not lawd_cd:
+                continue
+            property_type = property_type or ""
+            if property_type not in base_types:
+                base_types[property_type] = resolve_property_type(property_type)
+            counts[(lawd_cd, base_types[property_type])] += 1
+        return [district for district, _ in counts.most_common(settings.prefetch_max_districts)]
+
+    async def _due_months(self, districts: list[tuple[str, str]]) -> list[MonthKey]:
+        """받아야 할 달 목록 - 마감 전 달 갱신을 먼저, 저장소에 없는 달을 나중에 (각각 인기 지역/최근 달 순)."""
+        store = get_transaction_store()
+        if store is None:
+            return []
+        now = time.time()
+        # 다음 실행 전에 TTL이 지나는 달도 지금 다시 받는다
+        max_age = max(0, settings.transaction_store_open_ttl_seconds - settings.prefetch_interval_seconds)
+        refresh: list[MonthKey] = []
+        missing: list[MonthKey] = []
+        for lawd_cd, property_type in districts:
+            for transaction_type, months in COLLECTION_MONTHS.items():
+                deal_ymds = recent_deal_ymds(months)
+                stored = await asyncio.to_thread(
+                    store.get_months, lawd_cd, property_type, transaction_type, deal_ymds, count=False
+                )
+                for deal_ymd in reversed(deal_ymds):
+                    key = (lawd_cd, property_type, transaction_type, deal_ymd)
+                    month = stored.get(deal_ymd)
+                    if month is None:
+                        missing.append(key)
+                    elif not month.closed and now - month.fetched_at >= max_age:
+                        refresh.append(key)
+        return refresh + missing
+
+    async def run_once(self) -> int:
+        """한 번 갱신하고 받은 달 수를 반환한다 (1000건이 넘는 달은 API 호출이 여러 건)."""
+        districts = await self.hot_districts()
+        due = await self._due_months(districts)
+        fetched = 0
+        for index, key in enumerate(due):
+            if not prefetch_budget_left():
+                self.quota_skipped += len(due) - index
+                logger.info("실거래 미리 받기: 일일 호출 한도 도달, %d개월 다음으로 미룸", len(due) - index)
+                break
+            fetched += 1
+            try:
+                await sync_month(key)
+            except Exception as exc:
+                self.failed += 1
+                logger.warning("실거래 미리 받기 실패 %s: %s", key, exc)
+        self.runs += 1
+        self.fetched_months += fetched
+        self.districts = len(districts)
+        self.last_run_at = time.time()
+        if fetched:
+            logger.info("실거래 미리 받기: 지역 %d곳, %d개월 갱신", len(districts), fetched)
+        return fetched
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.warning("실거래 미리 받기 실행 오류", exc_info=True)
+            await asyncio.sleep(settings.prefetch_interval_seconds)
+
+    def start(self) -> None:
+        """백그라운드 갱신을 시작한다 (애플리케이션 시작 시 호출)."""
+        if not (settings.prefetch_enabled and settings.transaction_store_enabled and settings.molit_api_key):
+            logger.info("실거래 미리 받기 비활성화 (설정 또는 MOLIT API 키 없음)")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """백그라운드 갱신을 멈춘다 (애플리케이션 종료 시 호출)."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "runs": self.runs,
+            "fetched_months": self.fetched_months,
+            "failed": self.failed,
+            "quota_skipped": self.quota_skipped,
+            "districts": self.districts,
+            "last_run_at": self.last_run_at,
+            "molit_calls_today": molit_calls.used(),
+        }
+
+
+transaction_prefetcher = TransactionPrefetcher()
@@ -0,0 +1,288 @@
+"""실거래가 로컬 저장소 - MOLIT 응답을 (법정동코드, 부동산 유형, 거래 구분, 계약년월) 단위로 SQLite에 보관한다
+
+분석마다 매매 60개월 + 전월세 12개월을 다시 받지 않도록, 받은 달은 저장해 두고 필요한 달만 증분으로 받는다.
+
+- 마감된 달: 계약월 말일 + transaction_store_close_days 이후에 받은 데이터는 더 바뀌지 않는 것으로 보고 다시 받지 않음
+  (실거래 신고기한 30일)
+- 마감 전 달(이번 달, 지난달 등): 받은 지 transaction_store_open_ttl_seconds가 지나면 다시 받음
+- 같은 달을 동시에 요청하면 API 호출 1건을 함께 기다린다 (같은 구의 분석 동시 실행)
+- API 호출이 실패하거나 오류 응답(호출 한도 초과 등)이 오면 저장하지 않고, 저장된 데이터가 있으면
+  기간이 지났더라도 그대로 쓴다. 마감 처리는 정상 응답의 totalCount만큼 다 받은 달에만 한다
+- 레코드는 키 없이 값 배열(TradeRecord.row())로 저장하고 읽을 때 레코드로 되돌린다
+"""
+
+from __future__ import annotations
+
+import asyncio
+import calendar
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from app.agents.tools.molit_parser import RentRecord, TradeRecord
+from app.agents.tools.real_estate_api import fetch_month
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# market_data_node 1회 실행에서 동시에 보내는 MOLIT 호출 수
+FETCH_CONCURRENCY = 10
+
+# 시세 분석에 쓰는 거래 구분별 수집 기간 (개월)
+COLLECTION_MONTHS: dict[str, int] = {"매매": 60, "전월세": 12}
+
+# (법정동코드, 부동산 유형, 거래 구분, 계약년월)
+MonthKey = tuple[str, str, str, str]
+
+
+def recent_deal_ymds(months: int, today: date | None = None) -> list[str]:
+    """오늘부터 최근 N개월의 계약년월(YYYYMM) 목록을 반환한다 (중복 제거, 오름차순)."""
+    today = today or date.today()
+    deal_ymds: set[str] = set()
+    for months_ago in range(months):
+        target_date = today - timedelta(days=30 * months_ago)
+        deal_ymds.add(target_date.strftime("%Y%m"))
+    return sorted(deal_ymds)
+
+
+def month_closed(deal_ymd: str, fetched_at: float) -> bool:
+    """fetched_at에 받은 deal_ymd 데이터가 마감된 달의 것인지 판단한다."""
+    year, month = int(deal_ymd[:4]), int(deal_ymd[4:])
+    month_end = date(year, month, calendar.monthrange(year, month)[1])
+    closes_on = month_end + timedelta(days=settings.transaction_store_close_days)
+    return datetime.fromtimestamp(fetched_at).date() > closes_on
+
+
+def _record_class(transaction_type: str) -> type[TradeRecord]:
+    return RentRecord if transaction_type == "전월세" else TradeRecord
+
+
+@dataclass(frozen=True)
+class StoredMonth:
+    records: list[TradeRecord]
+    fetched_at: float
+    closed: bool
+
+    def fresh(self, now: float) -> bool:
+        """다시 받지 않고 그대로 써도 되는지 (마감되었거나 마감 전 TTL 이내)."""
+        return self.closed or now - self.fetched_at < settings.transaction_store_open_ttl_seconds
+
+
+class TransactionStore:
+    """월 단위 실거래 내역을 저장하는 SQLite 저장소.
+
+    모든 메서드는 블로킹 I/O이므로 이벤트 루프에서는 asyncio.to_thread로 호출한다.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = Path(db_path)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS molit_months (
+                    lawd_cd TEXT NOT NULL,
+                    property_type TEXT NOT NULL,
+                    transaction_type TEXT NOT NULL,
+                    deal_ymd TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    closed INTEGER NOT NULL,
+                    PRIMARY KEY (lawd_cd, property_type, transaction_type, deal_ymd)
+                )
+                """
+            )
+        return self._conn
+
+    def get_months(
+        self,
+        lawd_cd: str,
+        property_type: str,
+        transaction_type: str,
+        deal_ymds: list[str],
+        *,
+        count: bool = True,
+    ) -> dict[str, StoredMonth]:
+        """저장된 달의 거래 내역을 {계약년월: StoredMonth}로 반환한다 (없는 달은 빠짐).
+
+        count=False이면 적중/미스 카운터에 반영하지 않는다 (미리 받기 작업의 조회).
+        """
+        if not deal_ymds:
+            return {}
+        placeholders = ",".join("?" * len(deal_ymds))
+        now = time.time()
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT deal_ymd, payload, fetched_at, closed FROM molit_months "
+                f"WHERE lawd_cd = ? AND property_type = ? AND transaction_type = ? AND deal_ymd IN ({placeholders})",
+                (lawd_cd, property_type, transaction_type, *deal_ymds),
+            ).fetchall()
+        months: dict[str, StoredMonth] = {}
+        for deal_ymd, payload, fetched_at, closed in rows:
+            try:
+                record_cls = _record_class(transaction_type)
+                # 이전 형식(한글 키 dict 행)도 읽는다
+                records = [
+                    record_cls.from_mapping(row) if isinstance(row, dict) else record_cls(*row)
+                    for row in json.loads(zlib.decompress(payload))
+                ]
+            except Exception:
+                logger.warning(
+                    "손상된 실거래 저장 항목 무시: %s %s%s %s", lawd_cd, property_type, transaction_type, deal_ymd
+                )
+                continue
+            months[deal_ymd] = StoredMonth(records, fetched_at, bool(closed))
+        if not count:
+            return months
+        with self._lock:
+            fresh = sum(1 for month in months.values() if month.fresh(now))
+            self.hits += fresh
+            self.misses += len(deal_ymds) - fresh
+        return months
+
+    def put_month(
+        self,
+        key: MonthKey,
+        records: list[TradeRecord],
+        fetched_at: float | None = None,
+        total_count: int | None = None,
+    ) -> None:
+        """받은 달의 거래 내역을 저장한다 (있으면 교체).
+
+        total_count는 응답이 알려 준 그 달 전체 건수 (None이면 records가 그 달 전체).
+        다 받지 못한 달은 마감 기한이 지났어도 닫지 않아 TTL이 지나면 다시 받는다.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        rows = [record.row() for record in records]
+        data = zlib.compress(json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode())
+        complete = total_count is None or len(records) >= total_count
+        closed = complete and month_closed(key[3], fetched_at)
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO molit_months VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, data, len(records), fetched_at, int(closed)),
+            )
+
+    def stats(self) -> dict:
+        """저장된 달 수/거래 수와 조회 적중률을 반환한다."""
+        with self._lock:
+            months, closed, rows = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(closed), 0), COALESCE(SUM(row_count), 0) FROM molit_months"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "months": months,
+                "closed_months": closed,
+                "transactions": rows,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_store: TransactionStore | None = None
+
+
+def get_transaction_store() -> TransactionStore | None:
+    """설정에 따라 전역 실거래 저장소를 반환한다 (비활성화 시 None)."""
+    global _store
+    if not settings.transaction_store_enabled:
+        return None
+    if _store is None:
+        _store = TransactionStore(settings.transaction_store_path)
+    return _store
+
+
+def close_transaction_store() -> None:
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+
+
+# 같은 달을 받고 있는 작업 (동시 요청이 API 호출 1건을 공유)
+_inflight: dict[MonthKey, asyncio.Task[list[TradeRecord]]] = {}
+
+
+async def _sync_month(key: MonthKey) -> list[TradeRecord]:
+    """한 달치를 MOLIT에서 받아 저장한다.
+
+    오류 응답(호출 한도 초과 등)은 fetch_month가 MolitApiError로 올리므로 저장하지 않는다.
+    빈 달은 정상 응답이 totalCount=0을 알려 준 경우에만 저장된다.
+    """
+    lawd_cd, property_type, transaction_type, deal_ymd = key
+    records, total_count = await fetch_month(lawd_cd, deal_ymd, property_type, transaction_type)
+    store = get_transaction_store()
+    if store is not None:
+        await asyncio.to_thread(store.put_month, key, records, total_count=total_count)
+    return records
+
+
+async def sync_month(key: MonthKey) -> list[TradeRecord]:
+    """한 달치를 받는다. 같은 달을 이미 받는 중이면 그 결과를 기다린다."""
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.get_running_loop().create_task(_sync_month(key))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _inflight.pop(key, None) if _inflight.get(key) is done else None)
+    return await asyncio.shield(task)
+
+
+async def load_transactions(
+    lawd_cd: str,
+    property_type: str,
+    transaction_type: str,
+    deal_ymds: list[str],
+) -> list[TradeRecord]:
+    """계약년월 목록의 거래 내역을 최근 달부터 이어 붙여 반환한다.
+
+    저장소에 없거나 다시 받아야 하는 달만 MOLIT API를 호출한다.
+    """
+    deal_ymds = sorted(set(deal_ymds), reverse=True)
+    store = get_transaction_store()
+    stored = (
+        await asyncio.to_thread(store.get_months, lawd_cd, property_type, transaction_type, deal_ymds)
+        if store is not None
+        else {}
+    )
+    now = time.time()
+    missing = [ymd for ymd in deal_ymds if ymd not in stored or not stored[ymd].fresh(now)]
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def fetch_one(deal_ymd: str) -> list[TradeRecord]:
+        async with sem:
+            try:
+                return await sync_month((lawd_cd, property_type, transaction_type, deal_ymd))
+            except Exception as exc:
+                logger.warning("  MOLIT %s API 호출 실패 [%s]: %s", transaction_type, deal_ymd, exc)
+                # 다시 받지 못하면 기간이 지난 저장본이라도 쓴다
+                return stored[deal_ymd].records if deal_ymd in stored else []
+
+    fetched = dict(zip(missing, await asyncio.gather(*(fetch_one(ymd) for ymd in missing)), strict=True))
+    if missing:
+        logger.debug(
+            "  실거래 저장소 [%s %s%s]: %d개월 중 %d개월 API 조회",
+            lawd_cd, property_type, transaction_type, len(deal_ymds), len(missing),
+        )
+    return [t for ymd in deal_ymds for t in (fetched[ymd] if ymd in fetched else stored[ymd].records)]
@@ -8,11 +8,12 @@ from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, Query, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Form, HTTPException, Query, UploadFile
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.agents.graph import run_analysis_workflow
+from app.agents.graph import run_analysis_workflow, run_batch_reanalysis
+from app.agents.llm import LLMPriority
 from app.api.deps import get_db
 from app.config import settings
 from app.database import async_session
@@ -71,12 +72,16 @@ async def create_analysis(
     files: list[UploadFile] = [],
     description: str | None = Form(None),
     case_number: str | None = Form(None),
+    use_llm_cache: bool = Form(True),
+    priority: LLMPriority = Form(LLMPriority.INTERACTIVE),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """새 분석 작업을 생성하고 백그라운드 워크플로우를 시작합니다.
 
     파일과 메타데이터를 multipart/form-data로 함께 받습니다.
     파일이 없으면 분석을 생성만 하고 워크플로우는 시작하지 않습니다.
+    use_llm_cache=false이면 캐시된 LLM 응답을 쓰지 않고 모두 새로 생성합니다.
+    priority=bulk이면 일괄 작업으로 보고 LLM 호출을 단건 분석보다 뒤에 처리합니다.
     """
     analysis = Analysis()
     analysis.description = description
@@ -113,12 +118,40 @@ async def create_analysis(
 
     # 파일이 있을 때만 워크플로우 시작
     if file_paths:
-        background_tasks.add_task(run_analysis_workflow, analysis.id, file_paths)
+        background_tasks.add_task(
+            run_analysis_workflow,
+            analysis.id,
+            file_paths,
+            use_llm_cache=use_llm_cache,
+            priority=priority,
+        )
 
     logger.debug("created analysis: %s with %d files", analysis.id, len(file_paths))
     return {"id": analysis.id, "status": analysis.status.value}
 
 
+@router.post("/reanalyze", status_code=202)
+async def reanalyze_analyses(
+    background_tasks: BackgroundTasks,
+    analysis_ids: list[str] = Body(..., embed=True),
+    use_llm_cache: bool = Body(False, embed=True),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """여러 분석을 배치 모드로 다시 실행합니다.
+
+    LLM 호출을 Message Batches API로 모아 보내므로 단건 분석보다 느리지만 비용이 낮습니다.
+    """
+    result = await db.execute(select(Analysis.id).where(Analysis.id.in_(analysis_ids)))
+    found = {row[0] for row in result.all()}
+    missing = [analysis_id for analysis_id in analysis_ids if analysis_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"분석 작업을 찾을 수 없습니다: {', '.join(missing)}")
+
+    ids = list(dict.fromkeys(analysis_ids))
+    background_tasks.add_task(run_batch_reanalysis, ids, use_llm_cache=use_llm_cache)
+    return {"ids": ids, "status": "queued"}
+
+
 @router.get("")
 async def list_analyses(
     db: AsyncSession = Depends(get_db),
@@ -1,8 +1,34 @@
+import asyncio
+
 from fastapi import APIRouter
 
+from app.agents.llm import batch_collector, get_llm_cache, llm_metrics, rate_limiter
+from app.agents.tools.document_classifier import classifier_stats
+from app.agents.tools.pdf_cache import get_pdf_cache
+from app.agents.tools.transaction_prefetcher import transaction_prefetcher
+from app.agents.tools.transaction_store import get_transaction_store
+
 router = APIRouter()
 
 
 @router.get("/health")
 async def health_check() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/health/metrics")
+async def metrics() -> dict:
+    """캐시 적중률 등 파이프라인 성능 지표를 반환한다."""
+    pdf_cache = get_pdf_cache()
+    llm_cache = get_llm_cache()
+    transaction_store = get_transaction_store()
+    return {
+        "pdf_cache": pdf_cache.stats() if pdf_cache else None,
+        "document_classifier": classifier_stats.stats(),
+        "llm": llm_metrics.snapshot(),
+        "llm_rate_limiter": rate_limiter.stats(),
+        "llm_batches": batch_collector.stats(),
+        "llm_cache": await asyncio.to_thread(llm_cache.stats) if llm_cache else None,
+        "transaction_store": await asyncio.to_thread(transaction_store.stats) if transaction_store else None,
+        "transaction_prefetcher": transaction_prefetcher.stats(),
+    }
@@ -1,4 +1,6 @@
+import os
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -21,8 +23,84 @@ class Settings(BaseSettings):
     # Anthropic
     anthropic_api_key: str = ""
 
+    # LLM 게이트웨이 (공유 커넥션 풀, 동시 호출 수 제한, 타임아웃)
+    llm_model: str = "claude-sonnet-4-5-20250929"
+    llm_max_connections: int = 32
+    llm_max_concurrency: int = 16
+    llm_default_model_concurrency: int = 8
+    # 모델별 동시 호출 수 개별 지정 (예: {"claude-sonnet-4-5-20250929": 4})
+    llm_model_concurrency: dict[str, int] = {}
+    llm_timeout_seconds: float = 120.0
+    llm_connect_timeout_seconds: float = 10.0
+    llm_max_retries: int = 2
+    # 작업(호출 위치)별 모델 라우팅 - 키는 호출 위치 또는 "document_parser" 같은 접두어, 없으면 llm_model
+    llm_model_routing: dict[str, str] = {
+        "document_parser.classify": "claude-haiku-4-5-20251001",
+        "document_parser.appraisal": "claude-haiku-4-5-20251001",
+        "document_parser.status_report": "claude-haiku-4-5-20251001",
+    }
+    # 라우팅된 모델의 결과가 검증에 실패하거나 confidence가 이 값 미만이면 llm_model로 다시 호출
+    llm_escalation_min_confidence: float = 0.7
+
+    # LLM 응답 캐시 (요청 내용 해시 기준 SQLite, 호출 위치별 TTL, 용량 초과 시 LRU 축출)
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "./cache/llm_responses.sqlite3"
+    llm_cache_max_mb: int = 200
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    # 호출 위치별 TTL(초), "document_parser"처럼 접두어로도 지정 가능, 0 이하이면 캐시하지 않음
+    llm_cache_ttl_overrides: dict[str, int] = {"news_analysis": 6 * 3600}
+
+    # Anthropic 프롬프트 캐싱 (캐시 최소 길이 이상인 고정 접두부 끝에 cache_control 지정 - 주로 공유 문서 원문)
+    llm_prompt_cache_enabled: bool = True
+    # 복합문서 원문을 여러 추출기가 공유할 때 첫 호출로 캐시를 채운 뒤 나머지를 동시 실행
+    llm_prompt_cache_warmup: bool = True
+
+    # LLM 호출 속도 제한 (모델별 분당 요청 수/입력 토큰/출력 토큰 버킷, 0이면 해당 항목 제한 없음)
+    llm_rate_limit_enabled: bool = True
+    llm_requests_per_minute: int = 50
+    llm_input_tokens_per_minute: int = 30000
+    llm_output_tokens_per_minute: int = 8000
+    # 모델별 한도 개별 지정 (예: {"claude-haiku-4-5": {"requests": 100, "input_tokens": 50000}})
+    llm_model_rate_limits: dict[str, dict[str, int]] = {}
+    # 호출 전 입력 토큰 추정용 글자/토큰 비율 (응답 후 실제 usage로 정산)
+    llm_rate_limit_chars_per_token: float = 1.5
+    # 호출 전 출력 토큰 예약량 (max_tokens가 더 작으면 max_tokens, 0이면 항상 max_tokens)
+    # 작을수록 동시에 더 많이 내보내고, 실제 출력이 더 많으면 정산 후 다음 호출이 그만큼 기다린다
+    llm_rate_limit_output_estimate_tokens: int = 1024
+
+    # 배치 모드 (일괄 재분석): 마지막 요청 후 idle초 동안 새 요청이 없으면 모은 요청을 Message Batches API로 제출
+    llm_batch_idle_seconds: float = 2.0
+    # 첫 요청 후 이 시간이 지나거나 요청이 max_requests개 모이면 바로 제출
+    llm_batch_max_wait_seconds: float = 30.0
+    llm_batch_max_requests: int = 10000
+    # 제출한 배치의 처리 상태 확인 간격
+    llm_batch_poll_seconds: float = 30.0
+
+    # 외부 API 공유 HTTP 클라이언트 (MOLIT, 네이버 - 클라이언트별 커넥션 풀 = 호스트별 연결 수 한도)
+    http_max_connections_per_host: int = 10
+    http_keepalive_expiry_seconds: float = 30.0
+    http_connect_timeout_seconds: float = 5.0
+    # HTTP/2 사용 (h2는 httpx[http2] 의존성으로 설치, 서버가 지원하지 않으면 HTTP/1.1 keep-alive)
+    http2_enabled: bool = True
+
     # 국토교통부 API
     molit_api_key: str = ""
+    # 일일 호출 한도 (0이면 제한 없음)
+    molit_daily_quota: int = 10000
+    # 실거래 로컬 저장소 (법정동코드/유형/거래 구분/계약년월 단위 SQLite, 없거나 마감 전인 달만 API로 받음)
+    transaction_store_enabled: bool = True
+    transaction_store_path: str = "./cache/transactions.sqlite3"
+    # 계약월 말일 후 이 일수가 지나서 받은 데이터는 마감으로 보고 다시 받지 않음 (실거래 신고기한 30일)
+    transaction_store_close_days: int = 35
+    # 마감 전 달은 받은 지 이 시간이 지나면 다시 받음
+    transaction_store_open_ttl_seconds: int = 6 * 3600
+    # 실거래 미리 받기: 최근 분석이 많은 법정동의 마감 전 달/빠진 달을 주기적으로 받아 둠
+    prefetch_enabled: bool = True
+    prefetch_interval_seconds: int = 1800
+    prefetch_window_hours: int = 72
+    prefetch_max_districts: int = 20
+    # 오늘 MOLIT 호출 수가 일일 한도의 이 비율에 이르면 미리 받기를 멈춤 (나머지는 분석 요청용)
+    prefetch_quota_ratio: float = 0.5
 
     # Naver News API
     naver_client_id: str = ""
@@ -33,6 +111,40 @@ class Settings(BaseSettings):
     max_file_size_mb: int = 50
     max_total_size_mb: int = 200
 
+    # PDF 추출 (프로세스 풀 워커 수, 워커 1개가 한 번에 처리할 최소 페이지 수)
+    pdf_extract_workers: int = min(4, os.cpu_count() or 1)
+    pdf_min_pages_per_task: int = 4
+
+    # 페이지별 OCR 판단 기준 (공백 제외 글자 수가 이보다 적고 이미지가 있으면 스캔 페이지로 간주)
+    ocr_min_page_chars: int = 20
+    # OCR 워커 프로세스 수 (동시에 래스터화되는 페이지 수 상한) 및 래스터화 해상도
+    ocr_workers: int = min(4, os.cpu_count() or 1)
+    ocr_dpi: int = 200
+
+    # PDF 추출 결과 캐시 (파일 SHA-256 기준, 용량 초과 시 LRU 축출)
+    pdf_cache_enabled: bool = True
+    pdf_cache_dir: str = "./cache/pdf"
+    pdf_cache_max_mb: int = 500
+
+    # 복합문서(auction_summary) 추출 시 섹션별로 잘라 각 추출 프롬프트에 필요한 부분만 전달
+    section_slicing_enabled: bool = True
+    # 규칙 기반 문서 분류 (confidence가 기준 이상이면 LLM 분류 생략)
+    classify_fast_path_enabled: bool = True
+    classify_rule_min_confidence: float = 0.9
+    # 분석 1건에서 동시에 파싱할 PDF 파일 수
+    document_parse_concurrency: int = 4
+    # 구조화 추출 방식: "per_type"(유형별 JSON 텍스트 응답) / "combined"(tool_use, 복합문서는 4개 유형을 1회 호출로)
+    document_extraction_mode: Literal["per_type", "combined"] = "per_type"
+
+    # 보고서 요약 작성 방식: "llm"(Claude 작성) / "template"(분석 결과로 즉시 작성, 완료 후 LLM 다듬기 선택)
+    report_mode: Literal["llm", "template"] = "llm"
+    # template 모드에서 분석 완료 알림 후 LLM으로 요약 문장을 다시 작성해 교체
+    report_llm_polish: bool = True
+    # 보고서 생성 LLM 응답을 스트리밍하여 요약 필드를 report_chunk WebSocket 이벤트로 먼저 전송
+    report_stream_enabled: bool = True
+    # 권리/시세/뉴스 리포트 항목을 해당 분석 직후 먼저 작성하고, 마지막에는 가치평가 의존 항목만 작성
+    report_speculative_sections: bool = True
+
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
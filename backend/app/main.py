@@ -6,6 +6,11 @@ from collections.abc import AsyncGenerator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.agents.llm import close_llm_client
+from app.agents.tools.http_clients import close_http_clients, start_http_clients
+from app.agents.tools.pdf_extractor import shutdown_pdf_executor
+from app.agents.tools.transaction_prefetcher import transaction_prefetcher
+from app.agents.tools.transaction_store import close_transaction_store
 from app.api.router import api_router
 from app.config import settings
 from app.database import engine, async_session, Base
@@ -51,8 +56,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await run_migrations(session)
     # Backfill summary fields for existing analyses
     await backfill_summary_fields()
+    # Shared HTTP clients for external APIs (MOLIT, Naver)
+    await start_http_clients()
+    # Background warming of transaction data for recently analyzed districts
+    transaction_prefetcher.start()
     yield
     # Shutdown
+    await transaction_prefetcher.stop()
+    shutdown_pdf_executor()
+    await close_http_clients()
+    close_transaction_store()
+    await close_llm_client()
     await engine.dispose()
 
 
@@ -0,0 +1,131 @@
+"""외부 API HTTP 클라이언트 벤치마크 - 호출마다 새 클라이언트 vs 공유 커넥션 풀
+
+로컬 스텁 서버(uvicorn, MOLIT XML 응답)를 띄우고 fetch_transactions와 같은 요청을
+market_data_node 1회분(기본 72건)만큼 보내 호출당 지연 시간과 열린 TCP 연결 수를 비교한다.
+
+- per_call: 변경 전 방식 (요청마다 httpx.AsyncClient 생성 → 호출 → 종료)
+- shared:   공유 클라이언트(http_clients.get_http_client("molit"))를 쓰는 현재 fetch_transactions
+- 순차 호출과 market_data_node와 같은 동시 10건 제한 호출을 각각 측정한다
+
+로컬 스텁은 평문 HTTP/1.1이므로 TLS 핸드셰이크 비용은 포함되지 않는다 (실제 HTTPS API에서는 차이가 더 크다).
+
+실행:
+    cd backend
+    python -m benchmarks.bench_http_client [--calls 72] [--concurrency 10] [--latency-ms 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from unittest.mock import patch
+
+import httpx
+import uvicorn
+
+from app.agents.tools import http_clients, real_estate_api
+from app.agents.tools.real_estate_api import fetch_transactions
+
+STUB_XML = (
+    "<response><header><resultCode>000</resultCode></header><body><items>"
+    + "<item><dealAmount>85,000</dealAmount><excluUseAr>84.9</excluUseAr><dealYear>2025</dealYear></item>" * 20
+    + "</items></body></response>"
+).encode()
+
+
+class StubServer:
+    """MOLIT XML을 돌려주는 로컬 ASGI 서버 (클라이언트 주소로 열린 연결 수를 센다)"""
+
+    def __init__(self, latency_ms: float) -> None:
+        self.latency = latency_ms / 1000
+        self.peers: set[tuple[str, int]] = set()
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning", interface="asgi3")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    async def app(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return
+        self.peers.add(tuple(scope["client"]))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/xml")]})
+        await send({"type": "http.response.body", "body": STUB_XML})
+
+    def __enter__(self) -> StubServer:
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+async def fetch_per_call(url: str) -> None:
+    """변경 전 방식: 요청마다 클라이언트를 새로 만든다."""
+    async with httpx.AsyncClient(timeout=30) as client:
+        response = await client.get(url)
+        response.raise_for_status()
+
+
+async def run(fetch: Callable[[int], Awaitable[None]], calls: int, concurrency: int) -> tuple[float, list[float]]:
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(i: int) -> None:
+        async with sem:
+            start = time.perf_counter()
+            await fetch(i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return time.perf_counter() - start, latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="외부 API HTTP 클라이언트 벤치마크")
+    parser.add_argument("--calls", type=int, default=72, help="호출 수 (market_data_node 1회 ≈ 72건)")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 호출 수 (market_data_node와 동일)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="스텁 서버 응답 지연(ms)")
+    args = parser.parse_args()
+
+    with StubServer(args.latency_ms) as stub:
+        base_url = f"http://127.0.0.1:{stub.port}"
+        endpoint = real_estate_api.API_ENDPOINTS["아파트매매"]
+
+        async def per_call(i: int) -> None:
+            await fetch_per_call(f"{base_url}{endpoint}?LAWD_CD=41570&DEAL_YMD={202401 + i % 12}")
+
+        async def shared(i: int) -> None:
+            await fetch_transactions("41570", str(202401 + i % 12))
+
+        print(f"호출 {args.calls}건, HTTP/2={http_clients.http2_available()} (로컬 스텁은 HTTP/1.1)")
+        print(f"{'방식':<10} {'동시':>4} {'전체(ms)':>10} {'호출 평균(ms)':>14} {'p95(ms)':>9} {'TCP 연결':>9}")
+        with patch.object(real_estate_api, "MOLIT_BASE_URL", base_url):
+            for concurrency in (1, args.concurrency):
+                for name, fetch in (("per_call", per_call), ("shared", shared)):
+                    await http_clients.close_http_clients()
+                    await fetch(0)  # 워밍업 (import, 첫 연결)
+                    stub.peers.clear()
+                    total, latencies = await run(fetch, args.calls, concurrency)
+                    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+                    print(
+                        f"{name:<10} {concurrency:>4} {total * 1000:>10.1f} "
+                        f"{statistics.mean(latencies) * 1000:>14.2f} {p95 * 1000:>9.2f} {len(stub.peers):>9}"
+                    )
+        await http_clients.close_http_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+"""MOLIT XML 파서 벤치마크 - ElementTree + findtext dict 행 vs 스트리밍 파서 + compact 레코드
+
+실제 응답과 같은 태그 구성(매핑하지 않는 태그 포함)으로 N건(기본 10,000건)짜리 매매/전월세 XML을 만들어
+파싱 시간(중앙값)과 메모리(tracemalloc 최대 사용량, 파싱 후 남는 결과 크기)를 비교한다.
+
+- legacy: 변경 전 방식 (응답 전체 디코딩 → ET.fromstring → <item>마다 별칭 태그 findtext → 한글 키 dict)
+- stream: MolitXmlParser에 응답 전체를 한 번에 넣음
+- stream/64KB: 응답을 64KB 조각으로 나눠 넣음 (aiter_bytes로 받는 실제 경로)
+
+실행:
+    cd backend
+    python -m benchmarks.bench_molit_parser [--rows 10000] [--repeat 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from collections.abc import Callable
+
+from app.agents.tools.molit_parser import MolitXmlParser, _parse_float, _parse_int_amount
+
+CHUNK_SIZE = 64 * 1024
+DONGS = ("역삼동", "대치동", "개포동", "도곡동", "삼성동", "청담동", "논현동", "압구정동")
+NAMES = ("래미안대치팰리스", "은마", "타워팰리스", "도곡렉슬", "개포자이", "아이파크", "현대", "한양")
+
+
+def build_xml(rows: int, *, rent: bool) -> bytes:
+    items = []
+    for i in range(rows):
+        common = (
+            f"<aptDong></aptDong><aptNm>{NAMES[i % len(NAMES)]}</aptNm><buildYear>{1990 + i % 35}</buildYear>"
+            f"<dealDay>{1 + i % 28}</dealDay><dealMonth>{1 + i % 12}</dealMonth><dealYear>2025</dealYear>"
+            f"<excluUseAr>{59 + i % 60}.{i % 100:02d}</excluUseAr><floor>{1 + i % 30}</floor>"
+            f"<jibun>{i % 900}</jibun><sggCd>11680</sggCd><umdNm>{DONGS[i % len(DONGS)]}</umdNm>"
+        )
+        if rent:
+            amounts = (
+                f"<contractTerm>25.03~27.03</contractTerm><contractType>{'신규' if i % 3 else '갱신'}</contractType>"
+                f"<deposit>{30_000 + i % 500 * 100:,}</deposit><monthlyRent>{i % 4 * 50}</monthlyRent>"
+                "<preDeposit></preDeposit><preMonthlyRent></preMonthlyRent><useRRRight></useRRRight>"
+            )
+        else:
+            amounts = (
+                "<buyerGbn>개인</buyerGbn><cdealDay> </cdealDay><cdealType> </cdealType>"
+                f"<dealAmount>{80_000 + i % 2_000 * 50:,}</dealAmount><dealingGbn>중개거래</dealingGbn>"
+                "<estateAgentSggNm>서울 강남구</estateAgentSggNm><rgstDate> </rgstDate><slerGbn>개인</slerGbn>"
+            )
+        items.append(f"<item>{common}{amounts}</item>")
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        "<response><header><resultCode>000</resultCode><resultMsg>OK</resultMsg></header><body><items>"
+        + "".join(items)
+        + f"</items><numOfRows>{rows}</numOfRows><pageNo>1</pageNo><totalCount>{rows}</totalCount></body></response>"
+    ).encode()
+
+
+# --- 변경 전 파서 (real_estate_api._parse_page 당시 코드) ---
+
+
+def _text(item: ET.Element, *tag_names: str) -> str:
+    for tag in tag_names:
+        val = (item.findtext(tag) or "").strip()
+        if val:
+            return val
+    return ""
+
+
+def legacy_parse(xml_text: str, response_type: str) -> tuple[list[dict], int]:
+    root = ET.fromstring(xml_text)
+    items = root.findall(".//item")
+    total_count = int(_parse_float(root.findtext(".//totalCount")))
+
+    transactions: list[dict] = []
+    for item in items:
+        record: dict = {
+            "전용면적": _parse_float(_text(item, "excluUseAr", "전용면적")),
+            "건축년도": _text(item, "buildYear", "건축년도"),
+            "년": _text(item, "dealYear", "계약년도", "년"),
+            "월": _text(item, "dealMonth", "계약월", "월"),
+            "일": _text(item, "dealDay", "계약일", "일"),
+            "층": _text(item, "floor", "층"),
+            "아파트": _text(item, "aptNm", "단지명", "아파트", "연립다세대"),
+            "법정동": _text(item, "umdNm", "법정동"),
+        }
+        if response_type == "rent":
+            record["보증금액"] = _parse_int_amount(_text(item, "deposit", "보증금액"))
+            record["월세금액"] = _parse_int_amount(_text(item, "monthlyRent", "월세금액"))
+            record["계약구분"] = _text(item, "contractType", "계약구분")
+            record["거래금액"] = record["보증금액"]
+        else:
+            record["거래금액"] = _parse_int_amount(_text(item, "dealAmount", "거래금액"))
+        transactions.append(record)
+    return transactions, total_count
+
+
+def stream_parse(data: bytes, rent: bool, chunk_size: int | None) -> tuple[list, int]:
+    parser = MolitXmlParser(rent=rent)
+    if chunk_size is None:
+        parser.feed(data)
+    else:
+        for start in range(0, len(data), chunk_size):
+            parser.feed(data[start : start + chunk_size])
+    return parser.finish()
+
+
+def measure(fn: Callable[[], tuple[list, int]], repeat: int) -> tuple[float, float, float, tuple[list, int]]:
+    """(중앙값 ms, tracemalloc 최대 MB, 결과 유지 MB, 결과)"""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+        del result
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), (peak - base) / 2**20, (retained - base) / 2**20, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    for rent in (False, True):
+        data = build_xml(args.rows, rent=rent)
+        response_type = "rent" if rent else "trade"
+        print(f"\n{response_type}: rows={args.rows} xml={len(data) / 2**20:.2f}MB")
+        print(f"{'parser':<14} {'median':>10} {'peak':>10} {'retained':>10}")
+
+        cases = {
+            # 변경 전에는 response.text(디코딩)를 거쳐 파싱했다
+            "legacy": lambda: legacy_parse(data.decode(), response_type),
+            "stream": lambda: stream_parse(data, rent, None),
+            "stream/64KB": lambda: stream_parse(data, rent, CHUNK_SIZE),
+        }
+        results = {}
+        for name, fn in cases.items():
+            median_ms, peak_mb, retained_mb, results[name] = measure(fn, args.repeat)
+            print(f"{name:<14} {median_ms:>8.1f}ms {peak_mb:>8.2f}MB {retained_mb:>8.2f}MB")
+
+        legacy_rows, legacy_total = results["legacy"]
+        for name in ("stream", "stream/64KB"):
+            rows, total = results[name]
+            assert total == legacy_total and rows == legacy_rows, f"{name} 결과가 legacy와 다름"
+
+
+if __name__ == "__main__":
+    main()
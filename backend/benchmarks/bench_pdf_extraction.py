@@ -0,0 +1,76 @@
+"""PDF 페이지 병렬 추출 벤치마크 - 워커 수에 따른 pages/sec 측정
+
+resource/test.pdf 페이지를 반복 복제해 대용량 경매 서류 묶음을 흉내 낸 뒤
+pdf_extract_workers 값을 바꿔가며 extract_text_from_pdf 처리량을 비교한다.
+
+실행:
+    cd backend
+    python -m benchmarks.bench_pdf_extraction --pages 200 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from PyPDF2 import PdfReader, PdfWriter
+
+from app.agents.tools import pdf_extractor
+from app.config import settings
+
+SAMPLE_PDF = Path(__file__).resolve().parents[2] / "resource" / "test.pdf"
+
+
+def build_bundle(source: Path, pages: int, dest: Path) -> None:
+    """source PDF의 페이지를 반복해서 pages장짜리 PDF를 만든다."""
+    reader = PdfReader(str(source))
+    writer = PdfWriter()
+    for i in range(pages):
+        writer.add_page(reader.pages[i % len(reader.pages)])
+    with open(dest, "wb") as f:
+        writer.write(f)
+
+
+async def run_once(file_path: str, workers: int) -> float:
+    """워커 수를 설정하고 1회 추출에 걸린 시간(초)을 반환한다."""
+    pdf_extractor.shutdown_pdf_executor()
+    settings.pdf_extract_workers = workers
+    # 프로세스 기동 비용은 앱 수명 동안 한 번만 발생하므로 측정에서 제외한다
+    if workers > 1:
+        pdf_extractor._get_executor().submit(pdf_extractor._count_pages, file_path).result()
+
+    started = time.perf_counter()
+    await pdf_extractor.extract_text_from_pdf(file_path)
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    logging.getLogger("pdfminer").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = Path(tmp) / "bundle.pdf"
+        build_bundle(SAMPLE_PDF, args.pages, bundle)
+        print(f"cpu_count={os.cpu_count()} pages={args.pages}")
+        print(f"{'workers':>8} {'seconds':>9} {'pages/sec':>10} {'speedup':>8}")
+
+        baseline: float | None = None
+        for workers in sorted(set(args.workers)):
+            elapsed = await run_once(str(bundle), workers)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {args.pages / elapsed:>10.1f} {baseline / elapsed:>7.2f}x")
+
+    pdf_extractor.shutdown_pdf_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
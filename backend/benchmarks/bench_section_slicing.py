@@ -0,0 +1,123 @@
+"""복합문서 섹션 분할 벤치마크 - 추출기별 입력 토큰/지연 시간 원문 대비 비교
+
+auction_summary 문서(기본: resource/test.pdf)에서 registry/appraisal/sale_item/status_report
+각 추출 프롬프트의 입력 크기를 원문 전체 전달과 섹션 슬라이스 전달로 비교한다.
+
+- 토큰 수: ANTHROPIC_API_KEY가 설정되어 있으면 messages.count_tokens로 실측,
+  없으면 글자 수 기반 추정치(한글 약 1.5자/토큰)를 표시한다.
+- --live: 실제 추출 호출(extract_*_data)을 원문/슬라이스로 각각 실행해 지연 시간을 측정한다 (API 비용 발생).
+
+단독 문서(registry, appraisal 등)는 분할하지 않으므로 원문 그대로 전달된다.
+
+실행:
+    cd backend
+    python -m benchmarks.bench_section_slicing [--pdf PATH ...] [--live]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+from app.agents.llm import gateway
+from app.agents.nodes import document_parser
+from app.agents.prompts.document_prompts import (
+    APPRAISAL_EXTRACTION_PROMPT,
+    DOCUMENT_TEXT_TEMPLATE,
+    EXTRACTION_SYSTEM_PROMPT,
+    REGISTRY_EXTRACTION_PROMPT,
+    SALE_ITEM_EXTRACTION_PROMPT,
+    STATUS_REPORT_EXTRACTION_PROMPT,
+)
+from app.agents.tools.pdf_extractor import extract_text_from_pdf
+from app.agents.tools.section_splitter import slice_for_extractor, split_sections
+from app.config import settings
+
+SAMPLE_PDF = Path(__file__).resolve().parents[2] / "resource" / "test.pdf"
+
+PROMPTS = {
+    "registry": REGISTRY_EXTRACTION_PROMPT,
+    "appraisal": APPRAISAL_EXTRACTION_PROMPT,
+    "sale_item": SALE_ITEM_EXTRACTION_PROMPT,
+    "status_report": STATUS_REPORT_EXTRACTION_PROMPT,
+}
+EXTRACTORS = {
+    "registry": document_parser.extract_registry_data,
+    "appraisal": document_parser.extract_appraisal_data,
+    "sale_item": document_parser.extract_sale_item_data,
+    "status_report": document_parser.extract_status_report_data,
+}
+
+
+def build_prompt(instructions: str, text: str) -> str:
+    """추출 요청 전체(system + 지시문 + 문서 텍스트)를 하나의 문자열로 합친다 (토큰 수 비교용)."""
+    return EXTRACTION_SYSTEM_PROMPT + instructions + DOCUMENT_TEXT_TEMPLATE.format(text=text)
+
+
+async def count_tokens(prompt: str) -> tuple[int, bool]:
+    """프롬프트 입력 토큰 수와 실측 여부를 반환한다."""
+    if not settings.anthropic_api_key:
+        return round(len(prompt) / 1.5), False
+    result = await gateway._get_client().messages.count_tokens(
+        model=settings.llm_model,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    return result.input_tokens, True
+
+
+async def timed(extractor: str, text: str) -> float:
+    started = time.perf_counter()
+    await EXTRACTORS[extractor](text)
+    return time.perf_counter() - started
+
+
+async def bench_file(pdf: Path, live: bool) -> None:
+    text, _tables = await extract_text_from_pdf(str(pdf))
+
+    started = time.perf_counter()
+    sections = split_sections(text)
+    split_ms = (time.perf_counter() - started) * 1000
+    print(f"\nfile={pdf.name} chars={len(text)} sections={len(sections)} split={split_ms:.2f}ms")
+
+    header = f"{'extractor':<14} {'full tok':>9} {'slice tok':>9} {'saved':>6}"
+    if live:
+        header += f" {'full(s)':>8} {'slice(s)':>8}"
+    print(header)
+
+    total_full = total_slice = 0
+    for extractor, prompt in PROMPTS.items():
+        sliced = slice_for_extractor(text, extractor, sections)
+        full_tokens, exact = await count_tokens(build_prompt(prompt, text))
+        slice_tokens, _ = await count_tokens(build_prompt(prompt, sliced))
+        total_full += full_tokens
+        total_slice += slice_tokens
+        row = f"{extractor:<14} {full_tokens:>9} {slice_tokens:>9} {1 - slice_tokens / full_tokens:>6.0%}"
+        if live:
+            row += f" {await timed(extractor, text):>8.2f} {await timed(extractor, sliced):>8.2f}"
+        print(row)
+
+    print(f"{'total':<14} {total_full:>9} {total_slice:>9} {1 - total_slice / total_full:>6.0%}")
+    if not exact:
+        print("(토큰 수는 글자 수 기반 추정치 - ANTHROPIC_API_KEY 설정 시 count_tokens로 실측)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", type=Path, nargs="+", default=[SAMPLE_PDF])
+    parser.add_argument("--live", action="store_true", help="실제 LLM 추출 호출로 지연 시간 측정")
+    args = parser.parse_args()
+
+    logging.getLogger("pdfminer").setLevel(logging.ERROR)
+    settings.pdf_extract_workers = 1
+    if args.live and not settings.anthropic_api_key:
+        parser.error("--live requires ANTHROPIC_API_KEY")
+
+    for pdf in args.pdf:
+        await bench_file(pdf, args.live)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""테이블 추출 모드 벤치마크 - 텍스트 전용(기본) vs 테이블 즉시 추출
+
+resource/test.pdf를 캐시 없이 반복 추출하여 두 모드의 평균 소요 시간을 비교한다.
+
+실행:
+    cd backend
+    python -m benchmarks.bench_table_modes --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from pathlib import Path
+
+from app.agents.tools.pdf_extractor import extract_tables_from_pdf, extract_text_from_pdf
+from app.config import settings
+
+SAMPLE_PDF = Path(__file__).resolve().parents[2] / "resource" / "test.pdf"
+
+
+async def measure(repeat: int, **kwargs: bool) -> list[float]:
+    """extract_text_from_pdf를 repeat회 실행한 소요 시간(초) 목록을 반환한다."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await extract_text_from_pdf(str(SAMPLE_PDF), **kwargs)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger("pdfminer").setLevel(logging.ERROR)
+    # 캐시가 켜져 있으면 두 번째 실행부터 추출 비용이 측정되지 않는다
+    settings.pdf_cache_enabled = False
+    settings.pdf_extract_workers = 1
+
+    text_only = await measure(args.repeat)
+    eager = await measure(args.repeat, with_tables=True)
+
+    started = time.perf_counter()
+    await extract_tables_from_pdf(str(SAMPLE_PDF), [0])
+    one_page_tables = time.perf_counter() - started
+
+    text_mean = statistics.mean(text_only)
+    eager_mean = statistics.mean(eager)
+    print(f"file={SAMPLE_PDF.name} repeat={args.repeat}")
+    print(f"{'mode':<22} {'mean(s)':>8} {'min(s)':>8}")
+    print(f"{'text only (default)':<22} {text_mean:>8.3f} {min(text_only):>8.3f}")
+    print(f"{'with_tables=True':<22} {eager_mean:>8.3f} {min(eager):>8.3f}")
+    print(f"{'lazy tables, 1 page':<22} {one_page_tables:>8.3f}")
+    print(f"text-only saves {1 - text_mean / eager_mean:.0%} of extraction time")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+"""로컬 가짜 Anthropic 배치 서버 - 네트워크 없이 Message Batches 흐름을 실행/테스트한다
+
+실제 SDK 클라이언트가 그대로 붙을 수 있도록 다음 HTTP 엔드포인트를 흉내 낸다.
+
+- POST /v1/messages                          단건 호출
+- POST /v1/messages/batches                  배치 생성
+- GET  /v1/messages/batches/{id}             배치 상태 (processing_delay 초가 지나면 ended)
+- GET  /v1/messages/batches/{id}/results     결과 JSONL
+
+응답 내용은 responder(params) → 응답 텍스트 또는 content 블록 목록 으로 정한다 (예외를 던지면 errored 결과).
+테스트에서는 httpx ASGITransport로 프로세스 안에서 연결하고, 로컬 개발 시에는 서버로 띄워
+ANTHROPIC_BASE_URL을 가리키게 한다.
+
+실행:
+    cd backend
+    python -m tests.fake_batch_server [--port 8787] [--delay 2]
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
+
+Responder = Callable[[dict], str | list[dict]]
+
+
+def _default_responder(params: dict) -> str | list[dict]:
+    """도구가 지정되면 빈 입력의 tool_use를, 아니면 빈 JSON 텍스트를 돌려준다."""
+    tools = params.get("tools") or []
+    if tools:
+        return [{"type": "tool_use", "id": "toolu_fake", "name": tools[0]["name"], "input": {}}]
+    return "{}"
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, UTC).isoformat()
+
+
+@dataclass
+class _FakeBatch:
+    id: str
+    requests: list[dict]
+    created_at: float
+    results: list[dict] = field(default_factory=list)
+
+
+class FakeBatchServer:
+    """Message Batches API를 흉내 내는 ASGI 앱과 호출 기록"""
+
+    def __init__(self, responder: Responder | None = None, *, processing_delay: float = 0.0) -> None:
+        self.responder = responder or _default_responder
+        self.processing_delay = processing_delay
+        self.batches: dict[str, _FakeBatch] = {}
+        self.single_calls = 0
+        self._ids = itertools.count(1)
+        self.app = self._build_app()
+
+    def _message(self, params: dict) -> dict:
+        output = self.responder(params)
+        content = [{"type": "text", "text": output}] if isinstance(output, str) else output
+        stop_reason = "tool_use" if any(block["type"] == "tool_use" for block in content) else "end_turn"
+        prompt_chars = len(json.dumps(params.get("messages", []), ensure_ascii=False))
+        return {
+            "id": f"msg_fake_{next(self._ids)}",
+            "type": "message",
+            "role": "assistant",
+            "model": params["model"],
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {"input_tokens": prompt_chars // 2 + 1, "output_tokens": 10},
+        }
+
+    def _result(self, request: dict) -> dict:
+        try:
+            result = {"type": "succeeded", "message": self._message(request["params"])}
+        except Exception as exc:
+            result = {
+                "type": "errored",
+                "error": {"type": "error", "error": {"type": "invalid_request_error", "message": str(exc)}},
+            }
+        return {"custom_id": request["custom_id"], "result": result}
+
+    def _batch_json(self, batch: _FakeBatch, base_url: str) -> dict:
+        ended = time.time() - batch.created_at >= self.processing_delay
+        if ended and not batch.results:
+            batch.results = [self._result(request) for request in batch.requests]
+        counts = {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0}
+        if ended:
+            for entry in batch.results:
+                counts[entry["result"]["type"]] += 1
+        else:
+            counts["processing"] = len(batch.requests)
+        return {
+            "id": batch.id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": counts,
+            "created_at": _iso(batch.created_at),
+            "expires_at": _iso(batch.created_at + timedelta(days=1).total_seconds()),
+            "ended_at": _iso(batch.created_at + self.processing_delay) if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{base_url}v1/messages/batches/{batch.id}/results" if ended else None,
+        }
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(title="fake-anthropic-batches")
+
+        @app.post("/v1/messages")
+        async def create_message(request: Request) -> dict:
+            self.single_calls += 1
+            return self._message(await request.json())
+
+        @app.post("/v1/messages/batches")
+        async def create_batch(request: Request) -> dict:
+            body = await request.json()
+            batch = _FakeBatch(id=f"msgbatch_fake_{next(self._ids)}", requests=body["requests"], created_at=time.time())
+            self.batches[batch.id] = batch
+            return self._batch_json(batch, str(request.base_url))
+
+        @app.get("/v1/messages/batches/{batch_id}")
+        async def retrieve_batch(batch_id: str, request: Request) -> dict:
+            return self._batch_json(self._get(batch_id), str(request.base_url))
+
+        @app.get("/v1/messages/batches/{batch_id}/results")
+        async def batch_results(batch_id: str) -> Response:
+            batch = self._get(batch_id)
+            if not batch.results:
+                raise HTTPException(status_code=400, detail="batch is still processing")
+            body = "\n".join(json.dumps(entry, ensure_ascii=False) for entry in batch.results) + "\n"
+            return Response(content=body, media_type="application/binary")
+
+        return app
+
+    def _get(self, batch_id: str) -> _FakeBatch:
+        if batch_id not in self.batches:
+            raise HTTPException(status_code=404, detail="batch not found")
+        return self.batches[batch_id]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--delay", type=float, default=2.0, help="배치 처리 완료까지 걸리는 시간(초)")
+    args = parser.parse_args()
+    print(f"ANTHROPIC_BASE_URL=http://127.0.0.1:{args.port}")
+    uvicorn.run(FakeBatchServer(processing_delay=args.delay).app, host="127.0.0.1", port=args.port)
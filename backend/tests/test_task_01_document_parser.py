@@ -5,23 +5,43 @@ LLM 호출은 모두 mock 처리하여 외부 의존성 없이 테스트한다.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.agents.llm import llm_batch_scope, model_for
+from app.agents.llm.metrics import LLMMetrics
 from app.agents.nodes.document_parser import (
+    CLASSIFY_PREFIX_CHARS,
+    EXTRACTION_FIELDS,
+    _parse_file,
     _parse_json_response,
     classify_document,
     document_parser_node,
     extract_appraisal_data,
     extract_registry_data,
     extract_sale_item_data,
+    extract_structured_data,
 )
+from app.agents.prompts.document_prompts import EXTRACTION_SYSTEM_PROMPT, REGISTRY_EXTRACTION_PROMPT
 from app.agents.state import AgentState
-from app.agents.tools.pdf_extractor import extract_text_from_pdf
+from app.agents.tools.document_classifier import ClassifierStats, classify_by_rules
+from app.agents.tools.pdf_cache import PdfExtractionCache
+from app.agents.tools.pdf_extractor import (
+    _extract_with_ocr,
+    extract_tables_from_pdf,
+    extract_text_from_pdf,
+    iter_pdf_pages,
+    select_ocr_pages,
+    split_page_ranges,
+)
+from app.agents.tools.section_splitter import slice_for_extractor, split_sections
+from app.config import settings
 from app.schemas.document import AppraisalExtraction, RegistryExtraction, SaleItemExtraction
 
 
@@ -71,6 +91,16 @@ def sample_sale_item_text() -> str:
     """
 
 
+def _page_stream(extract):
+    """(text, tables)를 반환하는 추출 mock을 iter_pdf_pages 형태의 async generator로 감싼다."""
+
+    async def stream(file_path: str):
+        text, _tables = await extract(file_path)
+        yield text
+
+    return stream
+
+
 # ---------------------------------------------------------------------------
 # T-1: PDF 텍스트 추출 (디지털 PDF)
 # ---------------------------------------------------------------------------
@@ -88,7 +118,7 @@ async def test_extract_text_digital_pdf():
         # MagicMock의 context manager 체인을 따라감:
         # pdfplumber.open(path) -> return_value -> __enter__() -> return_value
         mock_pdfplumber.open.return_value.__enter__.return_value.pages = [mock_page]
-        text, tables = await extract_text_from_pdf("/fake/path.pdf")
+        text, tables = await extract_text_from_pdf("/fake/path.pdf", with_tables=True)
 
     assert len(text.strip()) > 50
     assert "등기부등본" in text
@@ -103,10 +133,13 @@ async def test_extract_text_digital_pdf():
 
 @pytest.mark.asyncio
 async def test_classify_registry(sample_registry_text: str):
-    """등기부등본 텍스트를 registry로 분류한다."""
+    """등기부등본 텍스트를 registry로 분류한다 (LLM 경로)."""
     mock_response = json.dumps({"document_type": "registry", "confidence": 0.95})
 
-    with patch("app.agents.nodes.document_parser._call_llm", new_callable=AsyncMock, return_value=mock_response):
+    with (
+        patch("app.agents.nodes.document_parser.settings.classify_fast_path_enabled", False),
+        patch("app.agents.nodes.document_parser._call_llm", new_callable=AsyncMock, return_value=mock_response),
+    ):
         doc_type, confidence = await classify_document(sample_registry_text)
 
     assert doc_type == "registry"
@@ -120,10 +153,13 @@ async def test_classify_registry(sample_registry_text: str):
 
 @pytest.mark.asyncio
 async def test_classify_appraisal(sample_appraisal_text: str):
-    """감정평가서 텍스트를 appraisal로 분류한다."""
+    """감정평가서 텍스트를 appraisal로 분류한다 (LLM 경로)."""
     mock_response = json.dumps({"document_type": "appraisal", "confidence": 0.92})
 
-    with patch("app.agents.nodes.document_parser._call_llm", new_callable=AsyncMock, return_value=mock_response):
+    with (
+        patch("app.agents.nodes.document_parser.settings.classify_fast_path_enabled", False),
+        patch("app.agents.nodes.document_parser._call_llm", new_callable=AsyncMock, return_value=mock_response),
+    ):
         doc_type, confidence = await classify_document(sample_appraisal_text)
 
     assert doc_type == "appraisal"
@@ -220,7 +256,7 @@ async def test_document_parser_node():
     mock_appraisal = AppraisalExtraction(appraised_value=350000000)
 
     with (
-        patch("app.agents.nodes.document_parser.extract_text_from_pdf", side_effect=mock_extract),
+        patch("app.agents.nodes.document_parser.iter_pdf_pages", _page_stream(mock_extract)),
         patch("app.agents.nodes.document_parser.classify_document", side_effect=mock_classify),
         patch(
             "app.agents.nodes.document_parser.extract_registry_data",
@@ -270,8 +306,7 @@ async def test_document_parser_node_handles_extraction_error():
     }
 
     with patch(
-        "app.agents.nodes.document_parser.extract_text_from_pdf",
-        new_callable=AsyncMock,
+        "app.agents.nodes.document_parser.iter_pdf_pages",
         side_effect=Exception("PDF 손상"),
     ):
         result = await document_parser_node(state)
@@ -322,7 +357,7 @@ async def test_document_parser_node_auction_summary():
     )
 
     with (
-        patch("app.agents.nodes.document_parser.extract_text_from_pdf", side_effect=mock_extract),
+        patch("app.agents.nodes.document_parser.iter_pdf_pages", _page_stream(mock_extract)),
         patch("app.agents.nodes.document_parser.classify_document", side_effect=mock_classify),
         patch(
             "app.agents.nodes.document_parser.extract_registry_data",
@@ -339,6 +374,11 @@ async def test_document_parser_node_auction_summary():
             new_callable=AsyncMock,
             return_value=mock_sale_item,
         ),
+        patch(
+            "app.agents.nodes.document_parser.extract_status_report_data",
+            new_callable=AsyncMock,
+            return_value=None,
+        ),
     ):
         result = await document_parser_node(state)
 
@@ -375,7 +415,7 @@ async def test_document_parser_node_auction_summary_partial_failure():
     mock_appraisal = AppraisalExtraction(appraised_value=546000000)
 
     with (
-        patch("app.agents.nodes.document_parser.extract_text_from_pdf", side_effect=mock_extract),
+        patch("app.agents.nodes.document_parser.iter_pdf_pages", _page_stream(mock_extract)),
         patch("app.agents.nodes.document_parser.classify_document", side_effect=mock_classify),
         patch(
             "app.agents.nodes.document_parser.extract_registry_data",
@@ -392,6 +432,11 @@ async def test_document_parser_node_auction_summary_partial_failure():
             new_callable=AsyncMock,
             side_effect=Exception("매각물건 추출 실패"),
         ),
+        patch(
+            "app.agents.nodes.document_parser.extract_status_report_data",
+            new_callable=AsyncMock,
+            return_value=None,
+        ),
     ):
         result = await document_parser_node(state)
 
@@ -400,3 +445,949 @@ async def test_document_parser_node_auction_summary_partial_failure():
     assert result["appraisal"] is not None
     assert result["sale_item"] is None
     assert len(result.get("errors", [])) == 0  # 개별 추출 실패는 warning 로그만, errors에 추가하지 않음
+
+
+# ---------------------------------------------------------------------------
+# T-7: 페이지 병렬 추출
+# ---------------------------------------------------------------------------
+
+
+def test_split_page_ranges():
+    """페이지 범위를 빈틈/중복 없이 연속된 청크로 나눈다."""
+    ranges = split_page_ranges(200, 4, 4)
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == 200
+    assert all(prev[1] == cur[0] for prev, cur in zip(ranges, ranges[1:]))
+    assert len(ranges) == 8
+
+    # 최소 청크 크기보다 작은 문서는 한 청크로 처리
+    assert split_page_ranges(3, 4, 4) == [(0, 3)]
+    assert split_page_ranges(0, 4, 4) == []
+
+
+@pytest.mark.asyncio
+async def test_extract_text_parallel_preserves_page_order():
+    """청크별로 병렬 추출한 페이지가 원래 페이지 순서대로 합쳐진다."""
+
+    def fake_extract_range(file_path: str, start: int, end: int | None, with_tables: bool):
+        return [(f"page-{i}", [[[f"t{i}"]]], 0) for i in range(start, end)]
+
+    with (
+        patch("app.agents.tools.pdf_extractor.settings") as mock_settings,
+        patch("app.agents.tools.pdf_extractor._count_pages", return_value=10),
+        patch("app.agents.tools.pdf_extractor._extract_page_range", side_effect=fake_extract_range),
+        patch("app.agents.tools.pdf_extractor._get_executor", return_value=ThreadPoolExecutor(max_workers=3)),
+    ):
+        mock_settings.pdf_extract_workers = 3
+        mock_settings.pdf_min_pages_per_task = 1
+        text, tables = await extract_text_from_pdf("/fake/bundle.pdf", with_tables=True)
+
+    assert text.split() == [f"page-{i}" for i in range(10)]
+    assert [t[0][0] for t in tables] == [f"t{i}" for i in range(10)]
+
+
+# ---------------------------------------------------------------------------
+# T-8: PDF 추출 결과 캐시
+# ---------------------------------------------------------------------------
+
+
+def _raw_chunk_stream(raw_pages: list[tuple]):
+    """_iter_raw_chunks 대체용: 원시 페이지를 1장씩 청크로 흘려보내는 async generator 함수."""
+
+    async def stream(file_path: str, with_tables: bool):
+        for page in raw_pages:
+            yield [page]
+
+    return stream
+
+
+def test_pdf_cache_roundtrip_and_counters(tmp_path: Path):
+    """저장한 페이지를 그대로 돌려주고 적중/미스를 집계한다."""
+    cache = PdfExtractionCache(str(tmp_path), max_bytes=1024 * 1024)
+    pages = [("등기부등본 1페이지", [[["갑구", None]]]), ("2페이지", [])]
+
+    assert cache.get("abc") is None
+    cache.put("abc", pages)
+    assert cache.get("abc") == pages
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size_bytes"] > 0
+
+
+def test_pdf_cache_evicts_least_recently_used(tmp_path: Path):
+    """용량 상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제한다."""
+    import os
+    import random
+    import string
+
+    rng = random.Random(0)
+    # 압축이 거의 안 되는 텍스트로 항목 크기를 고정
+    blob = "".join(rng.choices(string.ascii_letters, k=4000))
+    cache = PdfExtractionCache(str(tmp_path), max_bytes=8000)
+
+    cache.put("old", [(blob, [])])
+    cache.put("recent", [(blob[::-1], [])])
+    os.utime(tmp_path / "old.json.z", (1, 1))
+    os.utime(tmp_path / "recent.json.z", (2, 2))
+    assert cache.get("old") is not None  # old를 최근 사용으로 갱신
+
+    cache.put("new", [(blob.upper(), [])])
+
+    assert cache.get("recent") is None
+    assert cache.get("old") is not None
+    assert cache.get("new") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_pdf_cache_evict_tolerates_concurrent_delete(tmp_path: Path):
+    """다른 워커/프로세스가 그사이 지운 항목이 있어도 put은 실패하지 않는다."""
+    import random
+    import string
+
+    rng = random.Random(0)
+    blob = "".join(rng.choices(string.ascii_letters, k=4000))
+    cache = PdfExtractionCache(str(tmp_path), max_bytes=8000)
+    cache.put("a", [(blob, [])])
+    cache.put("b", [(blob[::-1], [])])
+    listed = cache._entries()
+    (tmp_path / "a.json.z").unlink()
+
+    # 목록을 읽은 뒤 a가 지워진 상황 (stat 시점에 파일 없음)
+    with patch.object(cache, "_entries", return_value=listed):
+        cache.put("c", [(blob.upper(), [])])
+
+    assert cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_extract_text_cache_hit_skips_pdfplumber(tmp_path: Path):
+    """같은 내용의 파일은 두 번째부터 pdfplumber/OCR 없이 캐시에서 반환한다."""
+    pdf_file = tmp_path / "sale_item.pdf"
+    pdf_file.write_bytes(b"%PDF-1.4 fake bytes")
+    copy_file = tmp_path / "sale_item_copy.pdf"
+    copy_file.write_bytes(pdf_file.read_bytes())
+
+    cache = PdfExtractionCache(str(tmp_path / "cache"), max_bytes=1024 * 1024)
+    page_text = "매각물건명세서 사건번호 2025타경33712 임차인 현황 충분히 긴 텍스트를 포함한 페이지입니다."
+
+    with (
+        patch("app.agents.tools.pdf_extractor.get_pdf_cache", return_value=cache),
+        patch(
+            "app.agents.tools.pdf_extractor._iter_raw_chunks",
+            side_effect=_raw_chunk_stream([(page_text, [[["임차인", "보증금"]]], 0)]),
+        ) as mock_extract,
+        patch("app.agents.tools.pdf_extractor._extract_with_ocr", new_callable=AsyncMock) as mock_ocr,
+    ):
+        first = await extract_text_from_pdf(str(pdf_file))
+        second = await extract_text_from_pdf(str(copy_file))
+
+    assert first == second
+    assert mock_extract.call_count == 1
+    mock_ocr.assert_not_awaited()
+    assert cache.stats()["hits"] == 1
+
+
+# ---------------------------------------------------------------------------
+# T-9: 페이지별 텍스트 레이어 판별 + 선택적 OCR
+# ---------------------------------------------------------------------------
+
+
+def test_select_ocr_pages_only_scanned():
+    """텍스트 레이어가 없고 이미지가 있는 페이지만 OCR 대상으로 고른다."""
+    pages = [
+        ("등기부등본 표제부 서울특별시 강남구 역삼동 123-45 집합건물", [], 1),  # 디지털
+        ("", [], 1),  # 스캔 이미지
+        ("(cid:1234)(cid:5678) (cid:42)", [], 2),  # 글리프만 있는 깨진 텍스트 레이어
+        ("", [], 0),  # 빈 페이지
+    ]
+    assert select_ocr_pages(pages, min_chars=20) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_extract_text_mixed_bundle_ocr_only_scanned_pages():
+    """디지털/스캔 혼합 문서에서 스캔 페이지만 OCR하여 페이지 순서대로 병합한다."""
+    digital = "매각물건명세서 사건번호 2025타경33712 소재지 경기도 김포시 운양동"
+    raw_pages = [(digital, [], 0), ("", [], 1), (digital + " 2페이지", [], 0)]
+
+    with (
+        patch("app.agents.tools.pdf_extractor.get_pdf_cache", return_value=None),
+        patch("app.agents.tools.pdf_extractor._iter_raw_chunks", side_effect=_raw_chunk_stream(raw_pages)),
+        patch(
+            "app.agents.tools.pdf_extractor._extract_with_ocr",
+            new_callable=AsyncMock,
+            return_value={1: "임차인 현황 스캔 페이지 OCR 결과"},
+        ) as mock_ocr,
+    ):
+        text, _tables = await extract_text_from_pdf("/fake/mixed.pdf")
+
+    mock_ocr.assert_awaited_once_with("/fake/mixed.pdf", [1])
+    lines = text.splitlines()
+    assert lines == [digital, "임차인 현황 스캔 페이지 OCR 결과", digital + " 2페이지"]
+
+
+@pytest.mark.asyncio
+async def test_ocr_pages_fan_out_per_page():
+    """OCR은 페이지 단위로 워커에 분배되고, 실패한 페이지만 결과에서 빠진다."""
+    calls: list[int] = []
+
+    def fake_ocr_page(file_path: str, page_index: int, dpi: int):
+        calls.append(page_index)
+        if page_index == 5:
+            raise RuntimeError("tesseract crashed")
+        return f"ocr-{page_index}", 0.01
+
+    with (
+        patch("app.agents.tools.pdf_extractor._ocr_page", side_effect=fake_ocr_page),
+        patch("app.agents.tools.pdf_extractor._get_ocr_executor", return_value=ThreadPoolExecutor(max_workers=2)),
+    ):
+        result = await _extract_with_ocr("/fake/scanned.pdf", [1, 3, 5])
+
+    assert sorted(calls) == [1, 3, 5]
+    assert result == {1: "ocr-1", 3: "ocr-3"}
+
+
+# ---------------------------------------------------------------------------
+# T-10: 테이블 지연 추출
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_extract_text_default_skips_table_detection():
+    """기본 추출 경로는 텍스트만 뽑고 테이블 탐지를 호출하지 않는다."""
+    mock_page = MagicMock()
+    mock_page.extract_text.return_value = "감정평가서 감정가 350,000,000원 토지평가액 건물평가액 충분히 긴 텍스트"
+
+    with patch("app.agents.tools.pdf_extractor.pdfplumber") as mock_pdfplumber:
+        mock_pdfplumber.open.return_value.__enter__.return_value.pages = [mock_page]
+        text, tables = await extract_text_from_pdf("/fake/appraisal.pdf")
+
+    assert "감정평가서" in text
+    assert tables == []
+    mock_page.extract_tables.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_extract_tables_on_demand_per_page(tmp_path: Path):
+    """요청한 페이지의 테이블만 계산하고, 계산한 테이블은 캐시에 남아 재사용된다."""
+    pdf_file = tmp_path / "bundle.pdf"
+    pdf_file.write_bytes(b"%PDF-1.4 lazy tables")
+    cache = PdfExtractionCache(str(tmp_path / "cache"), max_bytes=1024 * 1024)
+    raw_pages = [(f"페이지 {i} 임차인 현황 매각물건명세서 충분히 긴 텍스트", None, 0) for i in range(3)]
+
+    def fake_tables(file_path: str, page_indexes: list[int]):
+        return [[[[f"표{i}"]]] for i in page_indexes]
+
+    with (
+        patch("app.agents.tools.pdf_extractor.get_pdf_cache", return_value=cache),
+        patch("app.agents.tools.pdf_extractor._iter_raw_chunks", side_effect=_raw_chunk_stream(raw_pages)),
+        patch("app.agents.tools.pdf_extractor._extract_page_tables", side_effect=fake_tables) as mock_tables,
+    ):
+        await extract_text_from_pdf(str(pdf_file))
+        first = await extract_tables_from_pdf(str(pdf_file), [2])
+        second = await extract_tables_from_pdf(str(pdf_file), [0, 2])
+
+    assert first == [[[["표2"]]]]
+    assert second == [[[["표0"]]], [[["표2"]]]]
+    # 2페이지는 캐시에서 재사용, 0페이지만 새로 계산
+    assert [c.args[1] for c in mock_tables.call_args_list] == [[2], [0]]
+
+
+# ---------------------------------------------------------------------------
+# T-11: 페이지 스트리밍 + 조기 문서 분류
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_iter_pdf_pages_streams_in_page_order(tmp_path: Path):
+    """iter_pdf_pages는 페이지 텍스트를 순서대로 내보내고 결과는 캐시에 남는다."""
+    pdf_file = tmp_path / "registry.pdf"
+    pdf_file.write_bytes(b"%PDF-1.4 stream")
+    cache = PdfExtractionCache(str(tmp_path / "cache"), max_bytes=1024 * 1024)
+    raw_pages = [(f"등기부등본 {i}쪽 갑구 을구 충분히 긴 텍스트", None, 0) for i in range(4)]
+
+    with (
+        patch("app.agents.tools.pdf_extractor.get_pdf_cache", return_value=cache),
+        patch("app.agents.tools.pdf_extractor._iter_raw_chunks", side_effect=_raw_chunk_stream(raw_pages)),
+    ):
+        pages = [page async for page in iter_pdf_pages(str(pdf_file))]
+        cached = [page async for page in iter_pdf_pages(str(pdf_file))]
+
+    assert pages == [text for text, _, _ in raw_pages]
+    assert cached == pages
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_document_parser_node_classifies_before_stream_finishes():
+    """앞부분 텍스트가 모이면 나머지 페이지 추출이 끝나기 전에 분류를 시작한다."""
+    state: AgentState = {
+        "analysis_id": "test-stream",
+        "file_paths": ["/fake/registry.pdf"],
+    }
+    events: list[str] = []
+    first_page = "등기부등본 갑구 을구 " + "가" * CLASSIFY_PREFIX_CHARS
+
+    async def stream(file_path: str):
+        yield first_page
+        events.append("first_page_consumed")
+        await asyncio.sleep(0)
+        events.append("last_page_extracted")
+        yield "마지막 페이지"
+
+    async def mock_classify(text: str):
+        events.append("classify")
+        assert len(text) == CLASSIFY_PREFIX_CHARS
+        return "registry", 0.95
+
+    mock_registry = RegistryExtraction(property_address="서울시 강남구", property_type="아파트")
+
+    with (
+        patch("app.agents.nodes.document_parser.iter_pdf_pages", stream),
+        patch("app.agents.nodes.document_parser.classify_document", side_effect=mock_classify),
+        patch(
+            "app.agents.nodes.document_parser.extract_registry_data",
+            new_callable=AsyncMock,
+            return_value=mock_registry,
+        ) as mock_registry_extract,
+    ):
+        result = await document_parser_node(state)
+
+    assert events == ["first_page_consumed", "classify", "last_page_extracted"]
+    # 구조화 추출은 전체 텍스트로 수행
+    assert mock_registry_extract.call_args.args[0] == first_page + "\n마지막 페이지\n"
+    assert result["registry"] is mock_registry
+
+
+# ---------------------------------------------------------------------------
+# T-12: 복합문서 섹션 분할
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def sample_auction_summary_text() -> str:
+    return """경매 2025타경33712
+경기도 김포시 운양동 1301-1 한강신도시롯데캐슬 301동 6층 601호
+대지권 50.7099㎡ 소유자 윤미라 감정가 546,000,000
+토지/건물 현황
+토지(1) 50.7099㎡ 273,000,000원
+건물(1) 84.9823㎡ 273,000,000원
+주변환경
+* 도시가스보일러에 의한 난방설비가 되어 있음.
+임차인 현황
+===== 임차인이 없으며 전부를 소유자가 점유 사용합니다. =====
+건물등기
+을(2) 2024-03-29 근저당권설정 404,250,000 소멸
+갑(7) 2025-06-10 임의경매 한국자산관리공사 소멸
+[ 매각사례 ]
+최근1개월(2건) 689,000,000원 521,656,900원 75.48%
+국토부 실거래가
+매매 2025.11.08 매 5억 3,500만 84.9823㎡
+"""
+
+
+def test_split_sections_finds_portal_anchors(sample_auction_summary_text: str):
+    """섹션 제목 줄을 찾아 원문 전체를 빈틈 없이 연속 구간으로 나눈다."""
+    sections = split_sections(sample_auction_summary_text)
+
+    assert [s.name for s in sections] == [
+        "header", "appraisal", "status", "tenant", "registry", "other", "other",
+    ]  # fmt: skip
+    assert sections[0].start == 0
+    assert sections[-1].end == len(sample_auction_summary_text)
+    assert all(a.end == b.start for a, b in zip(sections, sections[1:]))
+    # 본문 줄("갑(7) ..." 등)은 제목으로 인식하지 않음
+    assert sections[4].title == "건물등기"
+
+
+def test_slice_for_extractor_keeps_only_relevant_sections(sample_auction_summary_text: str):
+    """추출기마다 header + 관련 섹션만 받고, 무관한 섹션은 제외된다."""
+    registry = slice_for_extractor(sample_auction_summary_text, "registry")
+    appraisal = slice_for_extractor(sample_auction_summary_text, "appraisal")
+    sale_item = slice_for_extractor(sample_auction_summary_text, "sale_item")
+
+    for sliced in (registry, appraisal, sale_item):
+        assert "2025타경33712" in sliced  # header는 항상 포함
+        assert "매각사례" not in sliced
+        assert "국토부 실거래가" not in sliced
+    assert "근저당권설정" in registry and "토지(1)" not in registry
+    assert "토지(1)" in appraisal and "근저당권설정" not in appraisal
+    assert "임차인이 없으며" in sale_item and "근저당권설정" in sale_item
+
+
+def test_slice_for_extractor_falls_back_to_full_text():
+    """관련 섹션을 찾지 못하면 원문 전체를 그대로 전달한다."""
+    text = "경매 2025타경33712 매각기일 감정가 546000000 건물등기 임차인 현황 tankauction"
+    assert slice_for_extractor(text, "registry") == text
+    assert slice_for_extractor(text, "status_report") == text
+
+
+@pytest.mark.asyncio
+async def test_document_parser_node_auction_summary_sends_slices(sample_auction_summary_text: str):
+    """auction_summary 추출기들은 원문 대신 각자의 섹션 슬라이스를 받는다."""
+    state: AgentState = {
+        "analysis_id": "test-slices",
+        "file_paths": ["/fake/tankauction.pdf"],
+    }
+
+    async def mock_extract(file_path: str):
+        return sample_auction_summary_text, []
+
+    extract_mocks = {
+        name: AsyncMock(return_value=None)
+        for name in ("registry", "appraisal", "sale_item", "status_report")
+    }
+
+    with (
+        patch("app.agents.nodes.document_parser.iter_pdf_pages", _page_stream(mock_extract)),
+        patch(
+            "app.agents.nodes.document_parser.classify_document",
+            new_callable=AsyncMock,
+            return_value=("auction_summary", 0.93),
+        ),
+        patch("app.agents.nodes.document_parser.extract_registry_data", extract_mocks["registry"]),
+        patch("app.agents.nodes.document_parser.extract_appraisal_data", extract_mocks["appraisal"]),
+        patch("app.agents.nodes.document_parser.extract_sale_item_data", extract_mocks["sale_item"]),
+        patch("app.agents.nodes.document_parser.extract_status_report_data", extract_mocks["status_report"]),
+    ):
+        await document_parser_node(state)
+
+    full_text = sample_auction_summary_text + "\n"
+    for name, mock in extract_mocks.items():
+        sent = mock.call_args.args[0]
+        assert sent == slice_for_extractor(full_text, name)
+        assert len(sent) < len(full_text)
+
+
+# ---------------------------------------------------------------------------
+# T-13: 다중 파일 동시 처리 및 결정적 병합
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_document_parser_node_parses_files_concurrently():
+    """여러 파일을 동시에 처리하되 동시 처리 수는 document_parse_concurrency로 제한된다."""
+    state: AgentState = {
+        "analysis_id": "test-concurrent",
+        "file_paths": [f"/fake/registry_{i}.pdf" for i in range(4)],
+    }
+    in_flight = 0
+    peak = 0
+
+    async def mock_extract(file_path: str):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return f"등기부등본 {file_path}", []
+
+    with (
+        patch("app.agents.nodes.document_parser.settings.document_parse_concurrency", 2),
+        patch("app.agents.nodes.document_parser.iter_pdf_pages", _page_stream(mock_extract)),
+        patch(
+            "app.agents.nodes.document_parser.classify_document",
+            new_callable=AsyncMock,
+            return_value=("registry", 0.9),
+        ),
+        patch(
+            "app.agents.nodes.document_parser.extract_registry_data",
+            new_callable=AsyncMock,
+            return_value=RegistryExtraction(property_address="서울시", property_type="아파트"),
+        ),
+    ):
+        result = await document_parser_node(state)
+
+    assert peak == 2
+    assert result["registry"] is not None
+
+
+@pytest.mark.asyncio
+async def test_document_parser_node_merges_duplicates_deterministically():
+    """같은 유형이 여러 파일에서 나오면 단독 문서, 그다음 confidence가 높은 결과를 완료 순서와 무관하게 택한다."""
+    confidences = {"/fake/a.pdf": 0.70, "/fake/b.pdf": 0.95, "/fake/c.pdf": 0.99}
+    doc_types = {"/fake/a.pdf": "registry", "/fake/b.pdf": "registry", "/fake/c.pdf": "auction_summary"}
+    delays = {"/fake/a.pdf": 0.03, "/fake/b.pdf": 0.0, "/fake/c.pdf": 0.01}
+
+    async def mock_extract(file_path: str):
+        await asyncio.sleep(delays[file_path])
+        return file_path, []
+
+    async def mock_classify(text: str):
+        path = text.strip()
+        return doc_types[path], confidences[path]
+
+    async def mock_registry(text: str):
+        return RegistryExtraction(property_address=text.strip(), property_type="아파트")
+
+    for file_paths in (["/fake/a.pdf", "/fake/b.pdf", "/fake/c.pdf"], ["/fake/c.pdf", "/fake/b.pdf", "/fake/a.pdf"]):
+        state: AgentState = {"analysis_id": "test-merge", "file_paths": file_paths}
+        with (
+            patch("app.agents.nodes.document_parser.iter_pdf_pages", _page_stream(mock_extract)),
+            patch("app.agents.nodes.document_parser.classify_document", side_effect=mock_classify),
+            patch("app.agents.nodes.document_parser.extract_registry_data", side_effect=mock_registry),
+            patch(
+                "app.agents.nodes.document_parser.extract_appraisal_data",
+                new_callable=AsyncMock,
+                return_value=AppraisalExtraction(appraised_value=546000000),
+            ),
+            patch("app.agents.nodes.document_parser.extract_sale_item_data", new_callable=AsyncMock, return_value=None),
+            patch(
+                "app.agents.nodes.document_parser.extract_status_report_data",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+        ):
+            result = await document_parser_node(state)
+
+        # 단독 등기부(b: 0.95)가 복합문서(c: 0.99)와 낮은 confidence 등기부(a)보다 우선
+        assert result["registry"].property_address == "/fake/b.pdf"
+        # 감정평가는 복합문서에서만 나옴
+        assert result["appraisal"].appraised_value == 546000000
+        assert "errors" not in result
+
+
+@pytest.mark.asyncio
+async def test_document_parser_node_errors_follow_file_order():
+    """파일별 오류는 완료 순서가 아니라 file_paths 순서대로 기록된다."""
+    state: AgentState = {"analysis_id": "test-errors", "file_paths": ["/fake/slow.pdf", "/fake/fast.pdf"]}
+
+    async def broken(file_path: str):
+        await asyncio.sleep(0.02 if "slow" in file_path else 0)
+        raise ValueError(f"손상 {file_path}")
+        yield ""  # pragma: no cover - async generator로 만들기 위함
+
+    with patch("app.agents.nodes.document_parser.iter_pdf_pages", broken):
+        result = await document_parser_node(state)
+
+    assert len(result["errors"]) == 2
+    assert "slow.pdf" in result["errors"][0]
+    assert "fast.pdf" in result["errors"][1]
+
+
+# ---------------------------------------------------------------------------
+# T-14: 복합문서 4개 추출기 병렬 실행
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_auction_summary_extractors_run_concurrently():
+    """복합문서의 4개 추출은 동시에 실행되고, 실패는 개별 격리되며 추출기별 소요 시간이 기록된다."""
+    in_flight = 0
+    peak = 0
+
+    def slow(value=None, exc: Exception | None = None):
+        async def extract(text: str, shared_document: bool = False):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            if exc is not None:
+                raise exc
+            return value
+
+        return extract
+
+    async def mock_extract(file_path: str):
+        return "경매 2025타경33712 매각기일 감정가 건물등기 임차인 현황 tankauction", []
+
+    mock_registry = RegistryExtraction(property_address="경기도 김포시 운양동", property_type="아파트")
+    mock_appraisal = AppraisalExtraction(appraised_value=546000000)
+
+    with (
+        patch("app.agents.nodes.document_parser.iter_pdf_pages", _page_stream(mock_extract)),
+        patch(
+            "app.agents.nodes.document_parser.classify_document",
+            new_callable=AsyncMock,
+            return_value=("auction_summary", 0.93),
+        ),
+        patch("app.agents.nodes.document_parser.extract_registry_data", side_effect=slow(mock_registry)),
+        patch("app.agents.nodes.document_parser.extract_appraisal_data", side_effect=slow(mock_appraisal)),
+        patch(
+            "app.agents.nodes.document_parser.extract_sale_item_data",
+            side_effect=slow(exc=ValueError("매각물건 추출 실패")),
+        ),
+        patch("app.agents.nodes.document_parser.extract_status_report_data", side_effect=slow()),
+        patch("app.agents.nodes.document_parser.settings.llm_prompt_cache_warmup", False),
+    ):
+        result = await _parse_file(0, "/fake/tankauction.pdf")
+
+    assert peak == 4
+    assert result.error is None
+    assert result.extractions["registry"] is mock_registry
+    assert result.extractions["appraisal"] is mock_appraisal
+    assert result.extractions["sale_item"] is None
+    assert set(result.timings) == {"registry", "appraisal", "sale_item", "status_report"}
+    assert all(elapsed >= 0.04 for elapsed in result.timings.values())
+
+
+# ---------------------------------------------------------------------------
+# T-15: 규칙 기반 분류 fast path
+# ---------------------------------------------------------------------------
+
+
+def test_classify_by_rules_confident_types(
+    sample_registry_text: str,
+    sample_appraisal_text: str,
+    sample_sale_item_text: str,
+    sample_auction_summary_text: str,
+):
+    """제목/포털 단서가 뚜렷한 문서는 규칙만으로 높은 confidence로 분류된다."""
+    portal = sample_auction_summary_text + "https://www.tankauction.com/ca/caView.php?tid=2418691 1/4\n"
+
+    assert classify_by_rules(sample_registry_text) == ("registry", 0.99)
+    assert classify_by_rules(sample_appraisal_text)[0] == "appraisal"
+    assert classify_by_rules(sample_sale_item_text)[0] == "sale_item"
+    assert classify_by_rules(portal) == ("auction_summary", 0.99)
+    assert classify_by_rules("아무 단서가 없는 텍스트") == ("auction_summary", 0.0)
+
+
+@pytest.mark.asyncio
+async def test_classify_document_fast_path_skips_llm(sample_registry_text: str):
+    """규칙 confidence가 기준 이상이면 LLM을 호출하지 않고 rule 경로로 집계한다."""
+    stats = ClassifierStats()
+
+    with (
+        patch("app.agents.nodes.document_parser.classifier_stats", stats),
+        patch("app.agents.nodes.document_parser._call_llm", new_callable=AsyncMock) as mock_llm,
+    ):
+        doc_type, confidence = await classify_document(sample_registry_text)
+
+    assert doc_type == "registry"
+    assert confidence >= 0.9
+    mock_llm.assert_not_called()
+    assert stats.stats() == {"rule": 1, "llm": 0, "rule_rate": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_classify_document_low_confidence_falls_back_to_llm():
+    """단서가 부족하거나 애매하면 LLM으로 분류하고 llm 경로로 집계한다."""
+    stats = ClassifierStats()
+    ambiguous = "감정평가서 매각물건명세서 첨부 목록"
+    mock_response = json.dumps({"document_type": "case_notice", "confidence": 0.8})
+
+    with (
+        patch("app.agents.nodes.document_parser.classifier_stats", stats),
+        patch(
+            "app.agents.nodes.document_parser._call_llm",
+            new_callable=AsyncMock,
+            return_value=mock_response,
+        ) as mock_llm,
+    ):
+        doc_type, confidence = await classify_document(ambiguous)
+
+    assert (doc_type, confidence) == ("case_notice", pytest.approx(0.8))
+    mock_llm.assert_awaited_once()
+    assert stats.stats() == {"rule": 0, "llm": 1, "rule_rate": 0.0}
+
+
+# ---------------------------------------------------------------------------
+# T-16: 프롬프트 캐싱용 블록 배치
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_extraction_prompt_layout_for_prompt_cache(sample_registry_text: str):
+    """단독 문서는 문서 텍스트를 마지막에, 공유 원문은 문서 텍스트를 캐시 접두부로 보낸다."""
+    with patch(
+        "app.agents.nodes.document_parser._call_llm",
+        new_callable=AsyncMock,
+        return_value='{"property_address": "서울", "property_type": "아파트"}',
+    ) as mock_llm:
+        await extract_registry_data(sample_registry_text)
+        await extract_registry_data(sample_registry_text, shared_document=True)
+
+    single, shared = mock_llm.await_args_list
+    assert single.kwargs["system"] == shared.kwargs["system"] == EXTRACTION_SYSTEM_PROMPT
+    assert single.kwargs["prefix"] == REGISTRY_EXTRACTION_PROMPT
+    assert single.args[0].endswith(sample_registry_text + "\n")
+    assert shared.kwargs["prefix"] == single.args[0]
+    assert shared.args[0] == REGISTRY_EXTRACTION_PROMPT
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch", [False, True])
+async def test_auction_summary_shared_text_warms_prompt_cache_first(batch: bool):
+    """추출기들이 같은 원문을 받으면 첫 추출기가 끝난 뒤 나머지를 동시에 호출한다 (배치 모드는 모두 한 번에)."""
+    events: list[str] = []
+
+    def recorder(name: str):
+        async def extract(text: str, shared_document: bool = False):
+            assert shared_document
+            events.append(f"start:{name}")
+            await asyncio.sleep(0.02)
+            events.append(f"end:{name}")
+
+        return extract
+
+    async def mock_extract(file_path: str):
+        return "경매 2025타경33712 매각기일 감정가 건물등기 임차인 현황 tankauction", []
+
+    with (
+        patch("app.agents.nodes.document_parser.iter_pdf_pages", _page_stream(mock_extract)),
+        patch(
+            "app.agents.nodes.document_parser.classify_document",
+            new_callable=AsyncMock,
+            return_value=("auction_summary", 0.93),
+        ),
+        patch("app.agents.nodes.document_parser.extract_registry_data", side_effect=recorder("registry")),
+        patch("app.agents.nodes.document_parser.extract_appraisal_data", side_effect=recorder("appraisal")),
+        patch("app.agents.nodes.document_parser.extract_sale_item_data", side_effect=recorder("sale_item")),
+        patch(
+            "app.agents.nodes.document_parser.extract_status_report_data",
+            side_effect=recorder("status_report"),
+        ),
+        llm_batch_scope(batch),
+    ):
+        result = await _parse_file(0, "/fake/tankauction.pdf")
+
+    assert result.error is None
+    if batch:
+        assert all(event.startswith("start:") for event in events[:4])
+    else:
+        assert events[:2] == ["start:registry", "end:registry"]
+        assert sorted(events[2:5]) == ["start:appraisal", "start:sale_item", "start:status_report"]
+
+
+@pytest.mark.asyncio
+async def test_auction_summary_distinct_slices_are_not_shared(sample_auction_summary_text: str):
+    """섹션 슬라이스가 서로 다르면 문서 텍스트를 캐시 접두부로 보내지 않는다."""
+    extract_mocks = {name: AsyncMock(return_value=None) for name in EXTRACTION_FIELDS}
+
+    async def mock_extract(file_path: str):
+        return sample_auction_summary_text, []
+
+    with (
+        patch("app.agents.nodes.document_parser.iter_pdf_pages", _page_stream(mock_extract)),
+        patch(
+            "app.agents.nodes.document_parser.classify_document",
+            new_callable=AsyncMock,
+            return_value=("auction_summary", 0.93),
+        ),
+        patch("app.agents.nodes.document_parser.extract_registry_data", extract_mocks["registry"]),
+        patch("app.agents.nodes.document_parser.extract_appraisal_data", extract_mocks["appraisal"]),
+        patch("app.agents.nodes.document_parser.extract_sale_item_data", extract_mocks["sale_item"]),
+        patch("app.agents.nodes.document_parser.extract_status_report_data", extract_mocks["status_report"]),
+    ):
+        await _parse_file(0, "/fake/tankauction.pdf")
+
+    for mock in extract_mocks.values():
+        assert mock.call_args.kwargs == {"shared_document": False}
+
+
+# ---------------------------------------------------------------------------
+# T-17: tool_use 통합 추출 (document_extraction_mode="combined")
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_extract_structured_data_builds_dataclasses():
+    """도구 입력을 유형별 dataclass로 변환하고, null인 유형은 None으로 둔다."""
+    tool_input = {
+        "registry": {
+            "property_address": "경기도 김포시 운양동 1300",
+            "property_type": "아파트",
+            "section_a_entries": [{"order": 1, "right_type": "소유권이전", "holder": "김철수"}],
+            "section_b_entries": [
+                {"order": 1, "right_type": "근저당권설정", "holder": "국민은행", "amount": 300000000},
+            ],
+        },
+        "appraisal": {"appraised_value": 546000000},
+        "sale_item": {
+            "case_number": "2025타경33712",
+            "property_address": "경기도 김포시 운양동 1300",
+            "occupancy_info": [{"occupant_name": "박영희", "occupant_type": "임차인", "dividend_applied": True}],
+            "assumed_rights": [],
+            "special_conditions": [],
+        },
+        "status_report": None,
+    }
+
+    with patch(
+        "app.agents.nodes.document_parser._call_llm_structured",
+        new_callable=AsyncMock,
+        return_value=tool_input,
+    ) as mock_llm:
+        result = await extract_structured_data("복합문서 텍스트")
+
+    tool = mock_llm.await_args.kwargs["tool"]
+    assert tool["input_schema"]["required"] == list(EXTRACTION_FIELDS)
+    assert mock_llm.await_args.kwargs["call_site"] == "document_parser.combined"
+    assert mock_llm.await_args.args[0].endswith("복합문서 텍스트\n")
+
+    assert isinstance(result["registry"], RegistryExtraction)
+    assert result["registry"].section_b_entries[0].amount == 300000000
+    assert result["appraisal"] == AppraisalExtraction(appraised_value=546000000)
+    assert isinstance(result["sale_item"], SaleItemExtraction)
+    assert result["sale_item"].occupancy_info[0].dividend_applied is True
+    assert result["status_report"] is None
+
+
+@pytest.mark.asyncio
+async def test_structured_extraction_system_prompt_matches_tool_mode():
+    """tool_use 추출은 JSON 텍스트 응답 규칙 대신 도구 호출 규칙을 담은 system 프롬프트를 쓴다."""
+    with patch(
+        "app.agents.nodes.document_parser.complete_tool",
+        new_callable=AsyncMock,
+        return_value={"registry": None},
+    ) as mock_tool:
+        await extract_structured_data("등기부 텍스트", fields=("registry",))
+
+    system = mock_tool.await_args.kwargs["system"]
+    assert "JSON" not in system
+    assert "도구 호출" in system
+    assert "JSON 객체" in EXTRACTION_SYSTEM_PROMPT
+
+
+@pytest.mark.asyncio
+async def test_structured_single_document_escalates_invalid_fast_model_result():
+    """combined 모드의 단독 감정평가서도 빠른 모델 결과가 검증에 실패하면 기본 모델로 다시 추출한다."""
+    metrics = LLMMetrics()
+
+    with (
+        patch("app.agents.nodes.document_parser.llm_metrics", metrics),
+        patch(
+            "app.agents.nodes.document_parser._call_llm_structured",
+            new_callable=AsyncMock,
+            side_effect=[{"appraisal": {"appraised_value": 0}}, {"appraisal": {"appraised_value": 546000000}}],
+        ) as mock_llm,
+    ):
+        result = await extract_structured_data("감정평가서", ("appraisal",))
+
+    assert result == {"appraisal": AppraisalExtraction(appraised_value=546000000)}
+    first, second = mock_llm.await_args_list
+    assert first.kwargs["model"] == model_for("document_parser.appraisal") != settings.llm_model
+    assert second.kwargs["model"] == settings.llm_model
+    assert not first.kwargs["accept"]({"appraisal": {"appraised_value": 0}})
+    assert not first.kwargs["accept"]({"appraisal": None})
+    assert metrics.snapshot()["document_parser.appraisal"]["escalations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_combined_mode_uses_single_tool_call_per_file(sample_auction_summary_text: str):
+    """combined 모드에서 복합문서는 tool_use 1회, 단독 문서는 해당 유형만 담은 도구로 추출한다."""
+    mock_registry = RegistryExtraction(property_address="경기도 김포시 운양동", property_type="아파트")
+    mock_structured = AsyncMock(
+        side_effect=[
+            {"registry": mock_registry, "appraisal": None, "sale_item": None, "status_report": None},
+            {"registry": mock_registry},
+        ]
+    )
+    doc_types = {"/fake/auction.pdf": ("auction_summary", 0.93), "/fake/registry.pdf": ("registry", 0.95)}
+
+    async def mock_classify(text: str):
+        return doc_types[current_path]
+
+    current_path = ""
+
+    async def mock_extract(file_path: str):
+        nonlocal current_path
+        current_path = file_path
+        return sample_auction_summary_text, []
+
+    with (
+        patch("app.agents.nodes.document_parser.settings.document_extraction_mode", "combined"),
+        patch("app.agents.nodes.document_parser.iter_pdf_pages", _page_stream(mock_extract)),
+        patch("app.agents.nodes.document_parser.classify_document", side_effect=mock_classify),
+        patch("app.agents.nodes.document_parser.extract_structured_data", mock_structured),
+        patch("app.agents.nodes.document_parser.extract_registry_data", new_callable=AsyncMock) as mock_per_type,
+    ):
+        auction = await _parse_file(0, "/fake/auction.pdf")
+        registry = await _parse_file(1, "/fake/registry.pdf")
+
+    mock_per_type.assert_not_awaited()
+    assert mock_structured.await_count == 2
+    assert mock_structured.await_args_list[0].args == (sample_auction_summary_text + "\n",)
+    assert mock_structured.await_args_list[1].args[1] == ("registry",)
+    assert auction.extractions == {
+        "registry": mock_registry,
+        "appraisal": None,
+        "sale_item": None,
+        "status_report": None,
+    }
+    assert set(auction.timings) == {"combined"}
+    assert registry.extractions == {"registry": mock_registry}
+
+
+# ---------------------------------------------------------------------------
+# T-18: 모델 티어링 (빠른 모델 → 기본 모델 승격)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_classify_escalates_low_confidence_to_default_model():
+    """빠른 모델의 분류 confidence가 낮으면 기본 모델로 다시 분류한다."""
+    metrics = LLMMetrics()
+    responses = [
+        json.dumps({"document_type": "registry", "confidence": 0.4}),
+        json.dumps({"document_type": "appraisal", "confidence": 0.92}),
+    ]
+
+    with (
+        patch("app.agents.nodes.document_parser.settings.classify_fast_path_enabled", False),
+        patch("app.agents.nodes.document_parser.llm_metrics", metrics),
+        patch("app.agents.nodes.document_parser._call_llm", new_callable=AsyncMock, side_effect=responses) as mock_llm,
+    ):
+        assert await classify_document("애매한 문서") == ("appraisal", 0.92)
+
+    first, second = mock_llm.await_args_list
+    assert first.kwargs["model"] == model_for("document_parser.classify") != settings.llm_model
+    assert second.kwargs["model"] == settings.llm_model
+    assert metrics.snapshot()["document_parser.classify"]["escalations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_extraction_caches_only_valid_responses():
+    """파싱/검증에 실패한 응답은 응답 캐시 저장 조건(accept)을 통과하지 못한다."""
+    appraisal_ok = json.dumps({"appraised_value": 546000000})
+
+    with patch(
+        "app.agents.nodes.document_parser._call_llm",
+        new_callable=AsyncMock,
+        side_effect=["감정가를 찾을 수 없습니다", appraisal_ok],
+    ) as mock_llm:
+        await extract_appraisal_data("감정평가서")
+
+    fast_accept = mock_llm.await_args_list[0].kwargs["accept"]
+    default_accept = mock_llm.await_args_list[1].kwargs["accept"]
+    assert not fast_accept("감정가를 찾을 수 없습니다")
+    assert not fast_accept(json.dumps({"appraised_value": 0}))
+    assert fast_accept(appraisal_ok)
+    assert not default_accept("{잘린 JSON")
+    assert default_accept(json.dumps({"appraised_value": 0}))
+
+
+@pytest.mark.asyncio
+async def test_extraction_escalates_only_on_invalid_fast_model_result(sample_registry_text: str):
+    """빠른 모델 결과가 파싱/검증에 실패할 때만 승격하고, 기본 모델로 라우팅된 추출은 한 번만 호출한다."""
+    metrics = LLMMetrics()
+    appraisal_ok = json.dumps({"appraised_value": 546000000})
+
+    with (
+        patch("app.agents.nodes.document_parser.llm_metrics", metrics),
+        patch(
+            "app.agents.nodes.document_parser._call_llm",
+            new_callable=AsyncMock,
+            side_effect=["감정가를 찾을 수 없습니다", appraisal_ok, json.dumps({"appraised_value": 0}), appraisal_ok],
+        ) as mock_llm,
+    ):
+        assert (await extract_appraisal_data("감정평가서")).appraised_value == 546000000
+        assert (await extract_appraisal_data("감정평가서")).appraised_value == 546000000
+    assert [call.kwargs["model"] == settings.llm_model for call in mock_llm.await_args_list] == [
+        False,
+        True,
+        False,
+        True,
+    ]
+    assert metrics.snapshot()["document_parser.appraisal"]["escalations"] == 2
+
+    with patch(
+        "app.agents.nodes.document_parser._call_llm",
+        new_callable=AsyncMock,
+        return_value=json.dumps({"property_address": "", "property_type": "아파트"}),
+    ) as mock_llm:
+        await extract_registry_data(sample_registry_text)
+    mock_llm.assert_awaited_once()
+    assert mock_llm.await_args.kwargs["model"] == settings.llm_model
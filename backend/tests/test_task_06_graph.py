@@ -5,19 +5,32 @@ LangGraph StateGraph 워크플로우 구성, 노드 실행 순서, 에러 처리
 
 from __future__ import annotations
 
+import asyncio
+import json
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.agents import graph as graph_module
 from app.agents.graph import (
     PARALLEL_NODES,
     WORKFLOW_NODES,
     build_graph,
     compiled_graph,
 )
-from app.agents.nodes.report_generator import _safe_dict, report_generator_node
+from app.agents.nodes.report_generator import (
+    REPORT_FIELDS,
+    _safe_dict,
+    polish_analysis_summary,
+    report_generator_node,
+)
+from app.agents.prompts.report_prompts import REPORT_SECTION_SYSTEM_PROMPT, REPORT_SYSTEM_PROMPT
 from app.agents.state import AgentState
-from app.schemas.valuation import ValuationResult
+from app.agents.tools.report_template import format_won, render_analysis_summary
+from app.schemas.document import AppraisalExtraction, RegistryExtraction, SaleItemExtraction
+from app.schemas.market import MarketDataResult
+from app.schemas.rights import RightsAnalysisResult, RiskLevel, TenantAnalysis
+from app.schemas.valuation import PriceRange, Recommendation, ValuationResult
 
 
 # ---------------------------------------------------------------------------
@@ -140,6 +153,287 @@ async def test_report_generator_node():
     assert not result.get("errors", [])
 
 
+@pytest.mark.asyncio
+async def test_report_generator_streams_summary_chunks():
+    """스트리밍 중 요약 필드를 report_chunk 이벤트로 보내고, 최종 보고서는 비스트리밍과 동일하다."""
+    summary = {
+        "property_overview": "서울 \"강남\" 아파트\n전용 84㎡",
+        "rights_summary": "인수 권리 없음",
+        "overall_opinion": "입찰 권장",
+    }
+    raw = "```json\n" + json.dumps(summary, ensure_ascii=False) + "\n```"
+
+    async def fake_call_llm(prompt, max_tokens=4096, *, on_text=None):
+        if on_text is not None:
+            for i in range(0, len(raw), 5):
+                await on_text(raw[i : i + 5])
+        return raw
+
+    state: AgentState = {"analysis_id": "stream-test", "valuation": ValuationResult(), "errors": []}
+    sent: list[dict] = []
+
+    async def record(analysis_id, data):
+        sent.append(data)
+
+    with (
+        patch("app.agents.nodes.report_generator._call_llm", fake_call_llm),
+        patch("app.agents.nodes.report_generator.manager.send_progress", record),
+    ):
+        streamed = await report_generator_node(state)
+        with patch("app.agents.nodes.report_generator.settings.report_stream_enabled", False):
+            chunk_count = len(sent)
+            plain = await report_generator_node(state)
+
+    assert streamed == plain
+    assert streamed["report"]["analysis_summary"] == summary
+    assert len(sent) == chunk_count  # 비활성화 시 이벤트 없음
+    assert all(event["type"] == "report_chunk" for event in sent)
+    for field, value in summary.items():
+        events = [event for event in sent if event["field"] == field]
+        assert len(events) > 1
+        assert "".join(event["delta"] for event in events) == value
+        assert events[-1]["done"] and events[-1]["text"] == value
+
+
+@pytest.mark.asyncio
+async def test_polish_summary_does_not_stream_chunks():
+    """분석 완료 후 실행되는 LLM 다듬기는 report_chunk 이벤트를 보내지 않는다."""
+    summary = {"property_overview": "서울 강남 아파트", "overall_opinion": "입찰 권장"}
+    raw = json.dumps(summary, ensure_ascii=False)
+    received: list[object] = []
+
+    async def fake_call_llm(prompt, max_tokens=4096, *, on_text=None):
+        received.append(on_text)
+        return raw
+
+    state: AgentState = {"analysis_id": "polish-test", "valuation": ValuationResult(), "errors": []}
+    sent: list[dict] = []
+
+    async def record(analysis_id, data):
+        sent.append(data)
+
+    with (
+        patch("app.agents.nodes.report_generator._call_llm", fake_call_llm),
+        patch("app.agents.nodes.report_generator.manager.send_progress", record),
+        patch("app.agents.nodes.report_generator.settings.report_stream_enabled", True),
+    ):
+        assert await polish_analysis_summary(state) == summary
+
+    assert received == [None]
+    assert sent == []
+
+
+# ---------------------------------------------------------------------------
+# T-5b: 리포트 항목 선작성 (분석 노드 직후 작성 → 마지막에 가치평가 의존 항목만 작성)
+# ---------------------------------------------------------------------------
+
+
+def _fake_report_llm(calls: list[tuple[str, list[str], float]]):
+    """요청된 항목만 채운 JSON을 돌려주고 (호출 위치, 항목, 시각)을 기록하는 _call_llm 대체"""
+
+    async def fake_call_llm(
+        prompt, max_tokens=4096, *, on_text=None, system=REPORT_SYSTEM_PROMPT, call_site="report_generator"
+    ):
+        if system == REPORT_SECTION_SYSTEM_PROMPT:
+            fields = prompt.split("\n", 1)[0].removeprefix("작성할 항목: ").split(", ")
+        else:
+            fields = list(REPORT_FIELDS)
+        calls.append((call_site, fields, asyncio.get_running_loop().time()))
+        return json.dumps({field: f"{field} 내용" for field in fields}, ensure_ascii=False)
+
+    return fake_call_llm
+
+
+@pytest.mark.asyncio
+async def test_report_sections_start_before_slow_parallel_node():
+    """권리분석 항목은 느린 병렬 노드를 기다리지 않고 작성되고, 마지막 호출은 가치평가 의존 항목만 작성한다."""
+    calls: list[tuple[str, list[str], float]] = []
+    market_done: list[float] = []
+
+    async def slow_market(state):
+        await asyncio.sleep(0.2)
+        market_done.append(asyncio.get_running_loop().time())
+        return {"market_data": None}
+
+    with (
+        patch.object(graph_module, "document_parser_node", AsyncMock(return_value={})),
+        patch.object(graph_module, "rights_analysis_node", AsyncMock(return_value={"rights_analysis": None})),
+        patch.object(graph_module, "market_data_node", slow_market),
+        patch.object(graph_module, "news_analysis_node", AsyncMock(return_value={"news_analysis": None})),
+        patch.object(graph_module, "valuation_node", AsyncMock(return_value={"valuation": ValuationResult()})),
+        patch("app.agents.nodes.report_generator._call_llm", _fake_report_llm(calls)),
+    ):
+        result = await graph_module.build_graph().ainvoke({"analysis_id": "", "report_sections": {}, "errors": []})
+
+    by_site = {call_site: (fields, at) for call_site, fields, at in calls}
+    assert set(by_site) == {
+        "report_generator.rights",
+        "report_generator.market",
+        "report_generator.news",
+        "report_generator",
+    }
+    assert by_site["report_generator.rights"][1] < market_done[0]
+    assert by_site["report_generator"][0] == ["bid_price_reasoning", "sale_price_reasoning", "overall_opinion"]
+    summary = result["report"]["analysis_summary"]
+    assert list(summary) == list(REPORT_FIELDS)
+    assert summary["rights_summary"] == "rights_summary 내용"
+
+
+@pytest.mark.asyncio
+async def test_report_generator_writes_missing_sections():
+    """선작성에 실패한 항목은 마지막 호출에서 가치평가 의존 항목과 함께 작성된다."""
+    calls: list[tuple[str, list[str], float]] = []
+    state: AgentState = {
+        "analysis_id": "",
+        "valuation": ValuationResult(),
+        "report_sections": {"property_overview": "개요", "rights_summary": "권리", "news_summary": "뉴스"},
+        "errors": [],
+    }
+
+    with patch("app.agents.nodes.report_generator._call_llm", _fake_report_llm(calls)):
+        result = await report_generator_node(state)
+
+    assert [fields for _, fields, _ in calls] == [
+        ["market_summary", "bid_price_reasoning", "sale_price_reasoning", "overall_opinion"]
+    ]
+    summary = result["report"]["analysis_summary"]
+    assert list(summary) == list(REPORT_FIELDS)
+    assert summary["rights_summary"] == "권리"
+    assert summary["market_summary"] == "market_summary 내용"
+
+
+@pytest.mark.asyncio
+async def test_report_sections_disabled_uses_single_full_call():
+    """선작성을 끄면 분석 노드는 리포트를 쓰지 않고 보고서 생성 노드가 전체를 한 번에 작성한다."""
+    calls: list[tuple[str, list[str], float]] = []
+
+    with (
+        patch.object(graph_module, "document_parser_node", AsyncMock(return_value={})),
+        patch.object(graph_module, "rights_analysis_node", AsyncMock(return_value={"rights_analysis": None})),
+        patch.object(graph_module, "market_data_node", AsyncMock(return_value={"market_data": None})),
+        patch.object(graph_module, "news_analysis_node", AsyncMock(return_value={"news_analysis": None})),
+        patch.object(graph_module, "valuation_node", AsyncMock(return_value={"valuation": ValuationResult()})),
+        patch("app.agents.nodes.report_generator._call_llm", _fake_report_llm(calls)),
+        patch.object(graph_module.settings, "report_speculative_sections", False),
+    ):
+        result = await graph_module.build_graph().ainvoke({"analysis_id": "", "report_sections": {}, "errors": []})
+
+    assert [call_site for call_site, _, _ in calls] == ["report_generator"]
+    assert list(result["report"]["analysis_summary"]) == list(REPORT_FIELDS)
+
+
+# ---------------------------------------------------------------------------
+# T-5c: 템플릿 리포트 (LLM 없이 즉시 작성 → 완료 후 LLM 다듬기)
+# ---------------------------------------------------------------------------
+
+
+def _template_state() -> AgentState:
+    return {
+        "analysis_id": "",
+        "registry": RegistryExtraction(property_address="서울 강남구 역삼동 1", property_type="아파트", area=84.9),
+        "appraisal": AppraisalExtraction(appraised_value=950_000_000),
+        "sale_item": SaleItemExtraction(case_number="2024타경1234", property_address="서울 강남구 역삼동 1"),
+        "rights_analysis": RightsAnalysisResult(
+            extinguishment_basis="근저당 (2019-01-01)",
+            risk_level=RiskLevel.LOW,
+            tenants=[
+                TenantAnalysis(
+                    name="김임차", deposit=100_000_000, has_opposition_right=False, has_priority_repayment=True
+                )
+            ],
+        ),
+        "market_data": MarketDataResult(avg_price_per_pyeong=35_000_000, price_trend="상승", jeonse_ratio=0.55),
+        "news_analysis": None,
+        "valuation": ValuationResult(
+            recommendation=Recommendation.RECOMMEND,
+            bid_price=PriceRange(conservative=700_000_000, moderate=780_000_000, aggressive=850_000_000),
+            sale_price=PriceRange(conservative=900_000_000, moderate=960_000_000, aggressive=1_000_000_000),
+            expected_roi=16.5,
+            reasoning="추정 시세: 감정가 950,000,000원 기준\n위험도 낮고 예상 수익률 16.5%로 양호합니다.",
+            confidence_score=0.8,
+        ),
+        "errors": [],
+    }
+
+
+def test_format_won():
+    assert format_won(780_000_000) == "7억 8,000만원"
+    assert format_won(1_000_000_000) == "10억원"
+    assert format_won(35_000_000) == "3,500만원"
+    assert format_won(5_000) == "5,000원"
+
+
+def test_template_summary_uses_computed_values():
+    """템플릿 요약은 LLM 리포트와 같은 항목을 갖고 가치평가가 계산한 숫자를 그대로 쓴다."""
+    state = _template_state()
+    summary = render_analysis_summary(
+        registry=state["registry"],
+        sale_item=state["sale_item"],
+        appraisal=state["appraisal"],
+        rights=state["rights_analysis"],
+        market=state["market_data"],
+        news=None,
+        valuation=state["valuation"],
+    )
+
+    assert list(summary) == list(REPORT_FIELDS)
+    assert all(summary.values())
+    assert "9억 5,000만원" in summary["property_overview"]
+    assert "7억 8,000만원" in summary["bid_price_reasoning"]
+    assert "9억 6,000만원" in summary["sale_price_reasoning"]
+    assert "16.5%" in summary["overall_opinion"] and "입찰 추천" in summary["overall_opinion"]
+    assert "대항력이 없어" in summary["rights_summary"]
+    assert "뉴스" in summary["news_summary"]
+
+
+@pytest.mark.asyncio
+async def test_template_mode_report_skips_llm():
+    """template 모드의 보고서 생성은 LLM을 호출하지 않는다."""
+    llm = AsyncMock()
+
+    with (
+        patch("app.agents.nodes.report_generator._call_llm", llm),
+        patch("app.agents.nodes.report_generator.settings.report_mode", "template"),
+    ):
+        result = await report_generator_node(_template_state())
+
+    llm.assert_not_called()
+    assert result["report"]["summary_source"] == "template"
+    assert list(result["report"]["analysis_summary"]) == list(REPORT_FIELDS)
+    assert result["report"]["bid_price"]["moderate"] == 780_000_000
+
+
+@pytest.mark.asyncio
+async def test_polish_report_replaces_template_summary(client):
+    """LLM 다듬기는 저장된 보고서의 요약만 교체하고 report_polished 이벤트를 보낸다."""
+    from app.models.analysis import Analysis
+    from tests.conftest import TestSessionLocal
+
+    async with TestSessionLocal() as db:
+        analysis = Analysis(report={"analysis_summary": {"overall_opinion": "템플릿"}, "summary_source": "template"})
+        db.add(analysis)
+        await db.commit()
+        analysis_id = analysis.id
+
+    polished = {field: f"{field} 다듬은 문장" for field in REPORT_FIELDS}
+    sent: list[dict] = []
+
+    async def record(_analysis_id, data):
+        sent.append(data)
+
+    with (
+        patch.object(graph_module, "async_session", TestSessionLocal),
+        patch.object(graph_module, "polish_analysis_summary", AsyncMock(return_value=polished)),
+        patch.object(graph_module.manager, "send_progress", record),
+    ):
+        await graph_module._polish_report(analysis_id, {})
+
+    async with TestSessionLocal() as db:
+        report = (await db.get(Analysis, analysis_id)).report
+    assert report == {"analysis_summary": polished, "summary_source": "llm"}
+    assert sent == [{"type": "report_polished", "analysis_summary": polished}]
+
+
 # ---------------------------------------------------------------------------
 # T-6: _safe_dict 유틸리티
 # ---------------------------------------------------------------------------
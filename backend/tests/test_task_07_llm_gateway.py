@@ -0,0 +1,564 @@
+"""Task-07: LLM 게이트웨이 단위 테스트
+
+Anthropic 클라이언트는 가짜 객체로 대체하여 외부 호출 없이 테스트한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import zlib
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from anthropic import RateLimitError
+from anthropic.types import Message
+
+from app.agents.llm import LLMPriority, complete_text, complete_tool, gateway, llm_cache_scope
+from app.agents.llm.cache import LLMResponseCache
+from app.agents.llm.metrics import LLMMetrics
+from app.agents.llm.rate_limiter import TokenBudgetLimiter
+from app.agents.nodes import rights_analysis
+
+
+class FakeMessages:
+    """messages.create 호출을 기록하고 동시 실행 수를 추적하는 가짜 API"""
+
+    def __init__(self, delay: float = 0.02, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.error: Exception = RuntimeError("API 오류")
+        self.stop_reason = "end_turn"
+        self.usage = {"input_tokens": 100, "output_tokens": 20}
+        self.text = "응답"
+        self.streamed = 0
+        self.calls: list[dict] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise self.error
+        finally:
+            self.in_flight -= 1
+        return self._message(kwargs)
+
+    def stream(self, **kwargs):
+        """messages.stream 대체 - 응답 텍스트를 두 글자씩 흘려보낸다."""
+        messages = self
+
+        class _Stream:
+            async def __aenter__(self):
+                self.final = await messages.create(**kwargs)
+                text = self.final.content[0].text
+                self.text_stream = _chunks(text)
+                messages.streamed += 1
+                return self
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+            async def get_final_message(self):
+                return self.final
+
+        async def _chunks(text: str):
+            for i in range(0, len(text), 2):
+                yield text[i : i + 2]
+
+        return _Stream()
+
+    def _message(self, kwargs: dict) -> Message:
+        if "tools" in kwargs:
+            content = [{"type": "tool_use", "id": "toolu_1", "name": kwargs["tools"][0]["name"], "input": {"ok": True}}]
+        else:
+            content = [{"type": "text", "text": self.text}]
+        return Message.model_validate(
+            {
+                "id": f"msg_{len(self.calls)}",
+                "type": "message",
+                "role": "assistant",
+                "model": kwargs["model"],
+                "content": content,
+                "stop_reason": self.stop_reason,
+                "stop_sequence": None,
+                "usage": self.usage,
+            }
+        )
+
+
+@pytest.fixture
+def fake_api():
+    messages = FakeMessages()
+    metrics = LLMMetrics()
+    with (
+        patch.object(gateway, "_get_client", return_value=SimpleNamespace(messages=messages)),
+        patch.object(gateway, "llm_metrics", metrics),
+        patch.object(gateway, "_limiter", gateway._ConcurrencyLimiter()),
+        patch.object(gateway, "rate_limiter", TokenBudgetLimiter()),
+        patch.object(gateway, "get_llm_cache", return_value=None),
+    ):
+        yield messages, metrics
+
+
+@pytest.fixture
+def cached_api(fake_api, tmp_path):
+    """임시 디렉터리의 SQLite 응답 캐시를 사용하는 가짜 API"""
+    messages, metrics = fake_api
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"), max_bytes=1024 * 1024)
+    with patch.object(gateway, "get_llm_cache", return_value=cache):
+        yield messages, metrics, cache
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_complete_text_records_call_site_metrics(fake_api):
+    """호출 위치별로 호출 수, 토큰, 지연 시간이 집계된다."""
+    messages, metrics = fake_api
+
+    assert await complete_text("프롬프트", call_site="document_parser.classify", max_tokens=200) == "응답"
+    await complete_text("프롬프트", call_site="document_parser.classify")
+
+    assert messages.calls[0]["model"] == gateway.model_for("document_parser.classify")
+    assert messages.calls[0]["max_tokens"] == 200
+    stats = metrics.snapshot()["document_parser.classify"]
+    assert stats["calls"] == 2
+    assert stats["input_tokens"] == 200
+    assert stats["output_tokens"] == 40
+    assert stats["avg_latency_s"] > 0
+
+
+@pytest.mark.asyncio
+async def test_global_and_per_model_concurrency_limits(fake_api):
+    """모델별/전역 동시 호출 수가 설정값을 넘지 않는다."""
+    messages, metrics = fake_api
+
+    with (
+        patch.object(gateway.settings, "llm_max_concurrency", 3),
+        patch.object(gateway.settings, "llm_default_model_concurrency", 2),
+        patch.object(gateway.settings, "llm_rate_limit_enabled", False),
+    ):
+        await asyncio.gather(*[complete_text("p", call_site="a", model="model-a") for _ in range(6)])
+        assert messages.peak == 2
+
+        messages.peak = 0
+        await asyncio.gather(
+            *[complete_text("p", call_site="b", model=model) for model in ["model-a", "model-b"] * 3]
+        )
+        assert messages.peak == 3
+
+    # 대기가 발생했으므로 대기 시간이 기록됨
+    assert metrics.snapshot()["a"]["queue_wait_s"] > 0
+
+
+@pytest.mark.asyncio
+async def test_failed_call_releases_slot_and_counts_error(fake_api):
+    """API 오류 시 예외를 전파하고, 슬롯을 반납하며, 오류 수를 기록한다."""
+    messages, metrics = fake_api
+    messages.fail = True
+
+    with patch.object(gateway.settings, "llm_default_model_concurrency", 1):
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(complete_text("p", call_site="rights_analysis"), timeout=1)
+
+    assert metrics.snapshot()["rights_analysis"]["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_complete_tool_forces_tool_choice(fake_api):
+    """complete_tool은 지정한 도구를 강제하고 tool_use 입력을 반환한다."""
+    messages, _metrics = fake_api
+    tool = {"name": "save_news_analysis", "input_schema": {"type": "object"}}
+
+    result = await complete_tool("p", tool=tool, call_site="news_analysis")
+
+    assert result == {"ok": True}
+    assert messages.calls[0]["tool_choice"] == {"type": "tool", "name": "save_news_analysis"}
+
+
+def test_nodes_share_gateway_client():
+    """노드 모듈은 더 이상 자체 Anthropic 클라이언트를 갖지 않는다."""
+    from app.agents.nodes import document_parser, news_analysis, report_generator, rights_analysis
+
+    for module in (document_parser, news_analysis, report_generator, rights_analysis):
+        assert not hasattr(module, "_get_client")
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_built_once_with_settings():
+    """공유 클라이언트는 설정값(재시도, 타임아웃)으로 한 번만 생성되고 close 후 재생성된다."""
+    with patch.object(gateway, "_client", None):
+        client = gateway._get_client()
+        assert gateway._get_client() is client
+        assert client.max_retries == gateway.settings.llm_max_retries
+        assert client.timeout.read == gateway.settings.llm_timeout_seconds
+        await gateway.close_llm_client()
+        assert gateway._client is None
+
+
+@pytest.mark.asyncio
+async def test_prompt_cache_blocks_put_variable_prompt_last(fake_api):
+    """고정 접두부가 캐시 최소 길이 이상이면 마지막 고정 블록에만 cache_control을 붙이고 가변 프롬프트는 맨 뒤로."""
+    messages, _metrics = fake_api
+    document = "문서 원문 " * 1000
+
+    await complete_text("추출 항목", call_site="document_parser.registry", system="지시문", prefix=document)
+    await complete_text("프롬프트만", call_site="rights_analysis")
+
+    ephemeral = {"type": "ephemeral"}
+    with_blocks, plain = messages.calls
+    assert with_blocks["system"] == [{"type": "text", "text": "지시문"}]
+    assert with_blocks["messages"][0]["content"] == [
+        {"type": "text", "text": document, "cache_control": ephemeral},
+        {"type": "text", "text": "추출 항목"},
+    ]
+    assert "system" not in plain
+    assert plain["messages"] == [{"role": "user", "content": "프롬프트만"}]
+
+    await complete_text("분석 데이터", call_site="report_generator", system=document)
+    assert messages.calls[-1]["system"] == [{"type": "text", "text": document, "cache_control": ephemeral}]
+
+    with patch.object(gateway.settings, "llm_prompt_cache_enabled", False):
+        await complete_text("문서 텍스트", call_site="rights_analysis", system=document)
+    assert "cache_control" not in messages.calls[-1]["system"][0]
+
+
+@pytest.mark.asyncio
+async def test_prompt_cache_skips_short_prefix(fake_api):
+    """캐시 최소 길이보다 짧은 접두부(지시문만 있는 경우)에는 효과가 없으므로 cache_control을 붙이지 않는다."""
+    messages, _metrics = fake_api
+
+    await complete_text("문서 텍스트", call_site="document_parser.registry", system="지시문", prefix="추출 항목")
+
+    request = messages.calls[-1]
+    assert "cache_control" not in request["system"][0]
+    assert all("cache_control" not in block for block in request["messages"][0]["content"])
+    # Haiku는 최소 길이가 더 길다
+    assert gateway._min_cacheable_tokens("claude-haiku-4-5") > gateway._min_cacheable_tokens("claude-sonnet-4-5")
+
+
+@pytest.mark.asyncio
+async def test_prompt_cache_token_usage_recorded(fake_api):
+    """응답 usage의 프롬프트 캐시 읽기/쓰기 토큰을 호출 위치별로 집계한다."""
+    messages, metrics = fake_api
+
+    messages.usage = {"input_tokens": 50, "output_tokens": 20, "cache_creation_input_tokens": 3000}
+    await complete_text("a", call_site="document_parser.registry", system="s", prefix="문서")
+    messages.usage = {"input_tokens": 40, "output_tokens": 20, "cache_read_input_tokens": 3000}
+    await complete_text("b", call_site="document_parser.registry", system="s", prefix="문서")
+
+    stats = metrics.snapshot()["document_parser.registry"]
+    assert stats["input_tokens"] == 90
+    assert stats["cache_creation_input_tokens"] == 3000
+    assert stats["cache_read_input_tokens"] == 3000
+
+
+@pytest.mark.asyncio
+async def test_call_site_model_routing_and_latency_histogram(fake_api):
+    """호출 위치별 라우팅 테이블로 모델을 고르고, 모델별 지연 시간 히스토그램을 남긴다."""
+    messages, metrics = fake_api
+    routing = {"document_parser.classify": "fast-model", "news_analysis": "news-model"}
+
+    with patch.object(gateway.settings, "llm_model_routing", routing):
+        assert gateway.model_for("document_parser.classify") == "fast-model"
+        assert gateway.model_for("news_analysis.summary") == "news-model"
+        assert gateway.model_for("document_parser.registry") == gateway.settings.llm_model
+
+        await complete_text("p", call_site="document_parser.classify")
+        await complete_text("p", call_site="document_parser.classify", model="big-model")
+
+    assert [call["model"] for call in messages.calls] == ["fast-model", "big-model"]
+    by_model = metrics.snapshot()["document_parser.classify"]["latency_by_model"]
+    assert set(by_model) == {"fast-model", "big-model"}
+    fast = by_model["fast-model"]
+    assert fast["calls"] == 1
+    assert fast["buckets"]["le_0.25"] == 1
+    assert fast["p50_s"] == 0.25
+
+
+# ---------------------------------------------------------------------------
+# 속도 제한 (토큰 버킷 + 우선순위 대기열)
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def token_limits():
+    """입력 토큰만 분당 6000(초당 100)으로 제한한다."""
+    with (
+        patch.object(gateway.settings, "llm_requests_per_minute", 0),
+        patch.object(gateway.settings, "llm_input_tokens_per_minute", 6000),
+        patch.object(gateway.settings, "llm_output_tokens_per_minute", 0),
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_serves_interactive_before_bulk(token_limits):
+    """버킷이 비어 있으면 먼저 들어온 bulk 호출보다 interactive 호출을 먼저 내보낸다."""
+    limiter = TokenBudgetLimiter()
+    await limiter.acquire("m", input_tokens=6000, output_tokens=0)
+    order: list[str] = []
+
+    async def call(priority: LLMPriority) -> None:
+        await limiter.acquire("m", input_tokens=5, output_tokens=0, priority=priority)
+        order.append(priority.value)
+
+    bulk = asyncio.create_task(call(LLMPriority.BULK))
+    await asyncio.sleep(0)
+    await asyncio.gather(call(LLMPriority.INTERACTIVE), bulk)
+
+    assert order == ["interactive", "bulk"]
+    stats = limiter.stats()
+    assert stats["priorities"]["bulk"]["max_wait_s"] >= 0.08
+    assert stats["priorities"]["interactive"]["acquired"] == 2
+    assert stats["models"]["m"]["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_settles_reservation_with_actual_usage(fake_api):
+    """예약한 출력 토큰은 실제 사용량 기준으로 정산한다."""
+    _messages, metrics = fake_api
+
+    with (
+        patch.object(gateway.settings, "llm_requests_per_minute", 50),
+        patch.object(gateway.settings, "llm_output_tokens_per_minute", 8000),
+    ):
+        await complete_text("p", call_site="report_generator", max_tokens=4096)
+        buckets = gateway.rate_limiter.stats()["models"][gateway.settings.llm_model]["buckets"]
+
+    assert buckets["output_tokens"]["level"] == pytest.approx(8000 - 20, abs=10)
+    assert buckets["input_tokens"]["level"] == pytest.approx(30000 - 100, abs=20)
+    assert buckets["requests"]["level"] == pytest.approx(49, abs=0.1)
+    assert metrics.snapshot()["report_generator"]["rate_limit_wait_s"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_output_reservation_uses_estimate_not_max_tokens(fake_api):
+    """출력 토큰은 max_tokens 전체가 아니라 추정치만큼 예약해 OTPM 한도 안에서도 여러 호출이 동시에 나간다."""
+    _messages, metrics = fake_api
+
+    with (
+        patch.object(gateway.settings, "llm_requests_per_minute", 0),
+        patch.object(gateway.settings, "llm_input_tokens_per_minute", 0),
+        patch.object(gateway.settings, "llm_output_tokens_per_minute", 8000),
+        patch.object(gateway.settings, "llm_rate_limit_output_estimate_tokens", 1024),
+    ):
+        await asyncio.gather(
+            *(complete_text(f"p{i}", call_site="document_parser.registry", max_tokens=4096) for i in range(4))
+        )
+
+    assert metrics.snapshot()["document_parser.registry"]["rate_limit_wait_s"] < 0.5
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_returns_reservation(fake_api):
+    """동시성 슬롯 대기 중 또는 호출 중 취소되어도 예약한 토큰을 돌려준다."""
+    messages, _metrics = fake_api
+    messages.delay = 10
+
+    with (
+        patch.object(gateway.settings, "llm_requests_per_minute", 0),
+        patch.object(gateway.settings, "llm_output_tokens_per_minute", 8000),
+        patch.object(gateway.settings, "llm_max_concurrency", 1),
+    ):
+        running = asyncio.create_task(complete_text("a", call_site="rights_analysis", model="model-c"))
+        waiting = asyncio.create_task(complete_text("b", call_site="rights_analysis", model="model-c"))
+        await asyncio.sleep(0.05)
+        for task in (running, waiting):
+            task.cancel()
+        await asyncio.gather(running, waiting, return_exceptions=True)
+        buckets = gateway.rate_limiter.stats()["models"]["model-c"]["buckets"]
+
+    assert buckets["output_tokens"]["level"] == pytest.approx(8000, abs=5)
+    assert buckets["input_tokens"]["level"] == pytest.approx(30000, abs=5)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_error_drains_bucket(fake_api):
+    """429 응답을 받으면 해당 모델 버킷을 비워 이후 호출이 한도 회복을 기다린다."""
+    messages, _metrics = fake_api
+    messages.fail = True
+    messages.error = RateLimitError(
+        "rate limited",
+        response=SimpleNamespace(request=None, status_code=429, headers={}),
+        body=None,
+    )
+
+    with pytest.raises(RateLimitError):
+        await complete_text("p", call_site="rights_analysis", model="model-a")
+
+    stats = gateway.rate_limiter.stats()
+    assert stats["throttled"] == 1
+    assert all(bucket["level"] <= 1 for bucket in stats["models"]["model-a"]["buckets"].values())
+
+
+# ---------------------------------------------------------------------------
+# 응답 캐시
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_streaming_delivers_chunks_and_same_final_text(fake_api):
+    """on_text가 있으면 스트리밍으로 호출해 조각을 전달하고, 반환값은 전체 응답과 같다."""
+    messages, metrics = fake_api
+    messages.text = "스트리밍 응답 텍스트"
+    chunks: list[str] = []
+
+    async def on_text(text: str) -> None:
+        chunks.append(text)
+
+    result = await complete_text("프롬프트", call_site="report_generator", on_text=on_text)
+
+    assert result == messages.text
+    assert "".join(chunks) == messages.text
+    assert len(chunks) > 1
+    assert messages.streamed == 1
+    stats = metrics.snapshot()["report_generator"]
+    assert stats["streamed"] == 1
+    assert stats["input_tokens"] == 100
+
+
+@pytest.mark.asyncio
+async def test_cached_response_emits_full_text_once(cached_api):
+    """캐시 적중 시에는 스트리밍 없이 전체 텍스트를 한 번에 전달한다."""
+    messages, _, _ = cached_api
+    chunks: list[str] = []
+
+    async def on_text(text: str) -> None:
+        chunks.append(text)
+
+    await complete_text("프롬프트", call_site="report_generator", on_text=on_text)
+    chunks.clear()
+    assert await complete_text("프롬프트", call_site="report_generator", on_text=on_text) == "응답"
+
+    assert chunks == ["응답"]
+    assert messages.streamed == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_request_served_from_cache(cached_api):
+    """모델/프롬프트/도구 스키마가 같은 요청은 API 호출 없이 캐시에서 응답한다."""
+    messages, metrics, cache = cached_api
+    tool = {"name": "save_news_analysis", "input_schema": {"type": "object"}}
+    other_tool = {"name": "save_news_analysis", "input_schema": {"type": "object", "required": ["x"]}}
+
+    first = await complete_tool("뉴스 프롬프트", tool=tool, call_site="document_parser.registry")
+    second = await complete_tool("뉴스 프롬프트", tool=tool, call_site="document_parser.registry")
+    await complete_tool("뉴스 프롬프트", tool=other_tool, call_site="document_parser.registry")
+    await complete_tool("뉴스 프롬프트", tool=tool, call_site="document_parser.registry", model="other-model")
+    await complete_tool("뉴스 프롬프트", tool=tool, call_site="document_parser.registry", system="다른 지시문")
+
+    assert first == second == {"ok": True}
+    assert len(messages.calls) == 4
+    stats = metrics.snapshot()["document_parser.registry"]
+    assert stats["calls"] == 5
+    assert stats["cache_hits"] == 1
+    assert stats["input_tokens"] == 400  # 캐시 적중은 토큰 비용 없음
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_scope_opt_out_bypasses_cache(cached_api):
+    """llm_cache_scope(False) 안의 호출은 캐시를 읽지도 쓰지도 않는다."""
+    messages, _metrics, cache = cached_api
+
+    await complete_text("p", call_site="rights_analysis")
+    with llm_cache_scope(False):
+        await complete_text("p", call_site="rights_analysis")
+        await complete_text("q", call_site="rights_analysis")
+    await complete_text("q", call_site="rights_analysis")
+
+    assert len(messages.calls) == 4
+    assert cache.stats()["entries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_ttl_per_call_site(cached_api):
+    """호출 위치별 TTL을 따르고, TTL이 0 이하인 호출 위치는 캐시하지 않는다."""
+    messages, _metrics, cache = cached_api
+
+    with patch.object(
+        gateway.settings,
+        "llm_cache_ttl_overrides",
+        {"news_analysis": 0, "document_parser": 60},
+    ):
+        for _ in range(2):
+            await complete_text("p", call_site="news_analysis")
+        assert len(messages.calls) == 2
+
+        await complete_text("p", call_site="document_parser.classify")
+        with patch("app.agents.llm.cache.time.time", return_value=time.time() + 61):
+            await complete_text("p", call_site="document_parser.classify")
+        assert len(messages.calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_truncated_response_not_cached(cached_api):
+    """max_tokens로 잘린 응답은 캐시하지 않는다."""
+    messages, _metrics, cache = cached_api
+    messages.stop_reason = "max_tokens"
+
+    await complete_text("p", call_site="report_generator")
+    await complete_text("p", call_site="report_generator")
+
+    assert len(messages.calls) == 2
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unparseable_response_not_replayed(cached_api):
+    """호출자 검증(accept)에 실패한 응답은 캐시하지 않아 다시 분석할 때 새로 호출한다."""
+    messages, _metrics, cache = cached_api
+    messages.text = "JSON이 아닌 응답"
+    is_json = rights_analysis._is_json_response
+
+    for _ in range(2):
+        assert await complete_text("p", call_site="rights_analysis", accept=is_json) == "JSON이 아닌 응답"
+    assert len(messages.calls) == 2
+    assert cache.stats()["entries"] == 0
+
+    messages.text = '{"risk_level": "low"}'
+    for _ in range(2):
+        await complete_text("p", call_site="rights_analysis", accept=is_json)
+    assert len(messages.calls) == 3
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_response_failing_accept_is_refetched(cached_api):
+    """검증 없이 저장된 캐시 응답도 accept를 통과하지 못하면 쓰지 않고 새로 호출한다."""
+    messages, metrics, _cache = cached_api
+    tool = {"name": "save_news_analysis", "input_schema": {"type": "object"}}
+
+    await complete_tool("p", tool=tool, call_site="news_analysis")
+    await complete_tool("p", tool=tool, call_site="news_analysis", accept=lambda data: "score" in data)
+
+    assert len(messages.calls) == 2
+    assert metrics.snapshot()["news_analysis"]["cache_hits"] == 0
+
+
+def test_llm_cache_evicts_least_recently_used(tmp_path):
+    """용량 상한을 넘으면 최근에 사용되지 않은 항목부터 축출한다."""
+    payload = {"text": "x" * 2000}
+    size = len(zlib.compress(json.dumps(payload).encode()))
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"), max_bytes=size * 2 + 10)
+
+    with patch("app.agents.llm.cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+        cache.put("a", call_site="s", model="m", response=payload, ttl=3600)
+        cache.put("b", call_site="s", model="m", response=payload, ttl=3600)
+        assert cache.get("a") == payload  # a를 최근 사용으로 갱신
+        cache.put("c", call_site="s", model="m", response=payload, ttl=3600)
+
+    with patch("app.agents.llm.cache.time.time", return_value=5.0):
+        assert cache.get("b") is None
+        assert cache.get("a") == payload
+        assert cache.get("c") == payload
+    assert cache.stats()["evictions"] == 1
+    cache.close()
@@ -0,0 +1,189 @@
+"""Task-08: LLM 배치 모드 단위 테스트
+
+실제 AsyncAnthropic 클라이언트를 프로세스 안의 가짜 배치 서버(fake_batch_server)에 연결해
+네트워크 없이 Message Batches 제출 → 폴링 → 결과 분배 흐름을 검증한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+from unittest.mock import patch
+
+import pytest
+from anthropic import DEFAULT_CONNECTION_LIMITS, AsyncAnthropic, DefaultAsyncHttpxClient
+from fastapi.responses import JSONResponse
+
+from app.agents import graph
+from app.agents.llm import LLMBatchError, complete_text, complete_tool, gateway, llm_batch_scope
+from app.agents.llm.batch import BatchCollector
+from app.agents.llm.metrics import LLMMetrics
+from app.agents.llm.rate_limiter import TokenBudgetLimiter
+from app.config import settings
+from tests.fake_batch_server import FakeBatchServer
+
+# SDK가 내부적으로 쓰는 HTTP 라이브러리 (ASGITransport를 같은 라이브러리에서 가져와야 한다)
+_http = importlib.import_module(type(DEFAULT_CONNECTION_LIMITS).__module__.split(".")[0])
+
+
+def _echo(params: dict) -> str:
+    """요청의 마지막 텍스트 블록을 그대로 돌려준다 (결과가 올바른 호출로 돌아가는지 확인용)."""
+    content = params["messages"][-1]["content"]
+    text = content if isinstance(content, str) else content[-1]["text"]
+    if text == "실패":
+        raise ValueError("잘못된 요청")
+    return f"echo:{text}"
+
+
+@pytest.fixture
+def batch_api():
+    server = FakeBatchServer(_echo, processing_delay=0.05)
+    client = AsyncAnthropic(
+        api_key="test",
+        base_url="http://fake",
+        max_retries=0,
+        http_client=DefaultAsyncHttpxClient(transport=_http.ASGITransport(app=server.app)),
+    )
+    metrics = LLMMetrics()
+    with (
+        patch.object(gateway, "_get_client", return_value=client),
+        patch.object(gateway, "llm_metrics", metrics),
+        patch.object(gateway, "batch_collector", BatchCollector()),
+        patch.object(gateway, "rate_limiter", TokenBudgetLimiter()),
+        patch.object(gateway, "get_llm_cache", return_value=None),
+        patch.object(settings, "llm_batch_idle_seconds", 0.05),
+        patch.object(settings, "llm_batch_poll_seconds", 0.02),
+    ):
+        yield server, metrics
+
+
+# ---------------------------------------------------------------------------
+# T-1: 동시 호출 수집 → 배치 1건
+# ---------------------------------------------------------------------------
+
+
+async def test_concurrent_calls_share_one_batch(batch_api):
+    """배치 모드에서 동시에 들어온 호출은 배치 1건으로 제출되고 각자 자기 결과를 받는다."""
+    server, metrics = batch_api
+
+    with llm_batch_scope(True):
+        results = await asyncio.gather(
+            *(complete_text(f"문서 {i}", call_site="document_parser.classify") for i in range(5))
+        )
+
+    assert results == [f"echo:문서 {i}" for i in range(5)]
+    assert len(server.batches) == 1
+    assert server.single_calls == 0
+    (batch,) = server.batches.values()
+    assert len(batch.requests) == 5
+    assert len({request["custom_id"] for request in batch.requests}) == 5
+    assert metrics.snapshot()["document_parser.classify"]["batched"] == 5
+
+
+async def test_batch_request_params_match_direct_call(batch_api):
+    """배치 요청 params는 단건 호출과 같은 본문(system/prefix 캐시 블록, tools)을 담는다."""
+    server, _ = batch_api
+    tool = {"name": "extract", "description": "추출", "input_schema": {"type": "object", "properties": {}}}
+    server.responder = lambda params: [
+        {"type": "tool_use", "id": "toolu_1", "name": params["tools"][0]["name"], "input": {"ok": True}}
+    ]
+
+    with llm_batch_scope(True):
+        result = await complete_tool(
+            "본문", tool=tool, call_site="document_parser.combined", system="규칙", prefix="문서"
+        )
+
+    assert result == {"ok": True}
+    (batch,) = server.batches.values()
+    params = batch.requests[0]["params"]
+    assert params["model"] == gateway.model_for("document_parser.combined")
+    assert params["system"][0]["text"] == "규칙"
+    assert [block["text"] for block in params["messages"][0]["content"]] == ["문서", "본문"]
+    assert params["tool_choice"] == {"type": "tool", "name": "extract"}
+
+
+async def test_batch_mode_off_calls_directly(batch_api):
+    """배치 스코프 밖의 호출은 messages.create로 바로 보낸다."""
+    server, _ = batch_api
+
+    assert await complete_text("단건", call_site="report_generator") == "echo:단건"
+    assert server.single_calls == 1
+    assert server.batches == {}
+
+
+# ---------------------------------------------------------------------------
+# T-2: 오류 처리
+# ---------------------------------------------------------------------------
+
+
+async def test_errored_result_fails_only_that_call(batch_api):
+    """errored 결과는 해당 호출에만 LLMBatchError로 전달되고 나머지는 정상 반환된다."""
+    server, metrics = batch_api
+
+    with llm_batch_scope(True):
+        ok, failed = await asyncio.gather(
+            complete_text("정상", call_site="rights_analysis"),
+            complete_text("실패", call_site="rights_analysis"),
+            return_exceptions=True,
+        )
+
+    assert ok == "echo:정상"
+    assert isinstance(failed, LLMBatchError)
+    assert "잘못된 요청" in str(failed)
+    stats = metrics.snapshot()["rights_analysis"]
+    assert stats["errors"] == 1
+    assert stats["batched"] == 2
+
+
+async def test_batch_submit_failure_fails_all_calls(batch_api):
+    """배치 제출 자체가 실패하면 모인 호출 모두에 예외가 전달된다."""
+    server, _ = batch_api
+
+    @server.app.middleware("http")
+    async def reject(request, call_next):
+        return JSONResponse({"type": "error", "error": {"type": "api_error", "message": "down"}}, status_code=500)
+
+    with llm_batch_scope(True):
+        results = await asyncio.gather(
+            *(complete_text(f"문서 {i}", call_site="news_analysis") for i in range(3)),
+            return_exceptions=True,
+        )
+
+    assert all(isinstance(result, Exception) for result in results)
+
+
+async def test_max_requests_flushes_immediately(batch_api):
+    """llm_batch_max_requests개가 모이면 idle 대기 없이 바로 제출한다."""
+    server, _ = batch_api
+
+    with patch.object(settings, "llm_batch_max_requests", 2), llm_batch_scope(True):
+        await asyncio.gather(*(complete_text(f"문서 {i}", call_site="news_analysis") for i in range(4)))
+
+    assert sorted(len(batch.requests) for batch in server.batches.values()) == [2, 2]
+
+
+# ---------------------------------------------------------------------------
+# T-3: 워크플로우 배치 실행
+# ---------------------------------------------------------------------------
+
+
+async def test_batch_reanalysis_groups_each_stage(batch_api):
+    """여러 분석을 배치 모드로 돌리면 단계마다 모든 분석의 호출이 배치 1건으로 묶인다."""
+    server, _ = batch_api
+    outputs: dict[str, list[str]] = {}
+
+    async def fake_workflow(analysis_id: str, file_paths: list[str] | None) -> None:
+        parsed = await complete_text(f"{analysis_id}:parse", call_site="document_parser.classify")
+        report = await complete_text(f"{analysis_id}:report", call_site="report_generator")
+        outputs[analysis_id] = [parsed, report]
+
+    with patch.object(graph, "_run_workflow", fake_workflow):
+        await graph.run_batch_reanalysis(["a1", "a2", "a3"])
+
+    assert outputs == {aid: [f"echo:{aid}:parse", f"echo:{aid}:report"] for aid in ("a1", "a2", "a3")}
+    batches = sorted(server.batches.values(), key=lambda batch: batch.created_at)
+    assert [len(batch.requests) for batch in batches] == [3, 3]
+    prompts = [{request["params"]["messages"][0]["content"] for request in batch.requests} for batch in batches]
+    stages = [{prompt.split(":")[1] for prompt in batch} for batch in prompts]
+    assert stages == [{"parse"}, {"report"}]
+    assert server.single_calls == 0
@@ -0,0 +1,212 @@
+"""Task-09: 외부 API 공유 HTTP 클라이언트 / MOLIT 페이지 조회 단위 테스트
+
+MockTransport로 네트워크 없이 MOLIT/네이버 호출이 공유 클라이언트 1개를 재사용하는지,
+MOLIT 조회가 totalCount 기준으로 모든 페이지를 받는지 검증한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.agents.tools import http_clients, real_estate_api
+from app.agents.tools.news_api import search_news
+from app.agents.tools.real_estate_api import fetch_transactions
+from app.config import settings
+
+MOLIT_XML = """\
+<response><header><resultCode>000</resultCode></header><body><items>
+  <item><dealAmount>85,000</dealAmount><excluUseAr>84.9</excluUseAr><dealYear>2025</dealYear></item>
+</items></body></response>
+"""
+
+
+@pytest.fixture
+async def mock_clients():
+    """공유 클라이언트를 MockTransport 기반으로 만들고, 만들어진 횟수와 받은 요청을 기록한다."""
+    built: list[str] = []
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.host == "openapi.naver.com":
+            return httpx.Response(200, json={"items": [{"title": "뉴스"}]})
+        return httpx.Response(200, text=MOLIT_XML)
+
+    def build(name: str) -> httpx.AsyncClient:
+        built.append(name)
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    await http_clients.close_http_clients()
+    with patch.object(http_clients, "_build_client", build):
+        yield built, requests
+        await http_clients.close_http_clients()
+
+
+# ---------------------------------------------------------------------------
+# T-1: 클라이언트 재사용
+# ---------------------------------------------------------------------------
+
+
+async def test_calls_reuse_one_client_per_api(mock_clients):
+    """여러 번 호출해도 API별 클라이언트는 한 번만 만든다."""
+    built, requests = mock_clients
+
+    for deal_ymd in ("202501", "202502", "202503"):
+        transactions = await fetch_transactions("41570", deal_ymd)
+        assert transactions[0]["거래금액"] == 850_000_000
+    assert await search_news("김포시 부동산") == [{"title": "뉴스"}]
+    assert await search_news("운양동 개발") == [{"title": "뉴스"}]
+
+    assert built == ["molit", "naver"]
+    assert len(requests) == 5
+    assert requests[-1].headers["X-Naver-Client-Id"] == settings.naver_client_id
+
+
+async def test_close_then_recreate(mock_clients):
+    """닫은 뒤 다시 사용하면 새 클라이언트를 만든다."""
+    built, _ = mock_clients
+
+    first = http_clients.get_http_client("molit")
+    assert http_clients.get_http_client("molit") is first
+    await http_clients.close_http_clients()
+
+    assert first.is_closed
+    assert http_clients.get_http_client("molit") is not first
+    assert built == ["molit", "molit"]
+
+
+async def test_start_creates_all_clients(mock_clients):
+    """start_http_clients는 등록된 클라이언트를 모두 미리 만든다."""
+    built, _ = mock_clients
+
+    await http_clients.start_http_clients()
+
+    assert sorted(built) == sorted(http_clients.HTTP_CLIENT_TIMEOUTS)
+
+
+async def test_unknown_client_name():
+    with pytest.raises(KeyError):
+        http_clients.get_http_client("unknown")
+
+
+# ---------------------------------------------------------------------------
+# T-2: 풀 설정
+# ---------------------------------------------------------------------------
+
+
+async def test_client_pool_settings():
+    """타임아웃은 API별, 풀 한도와 keep-alive는 설정값을 따른다."""
+    with patch.object(settings, "http_max_connections_per_host", 3):
+        client = http_clients._build_client("naver")
+    try:
+        assert client.timeout.read == http_clients.HTTP_CLIENT_TIMEOUTS["naver"]
+        assert client.timeout.connect == settings.http_connect_timeout_seconds
+        pool = client._transport._pool
+        assert pool._max_connections == 3
+        assert pool._keepalive_expiry == settings.http_keepalive_expiry_seconds
+    finally:
+        await client.aclose()
+
+
+def test_http2_requires_setting_and_h2():
+    """HTTP/2는 설정이 켜져 있고 h2 패키지가 있을 때만 사용한다."""
+    with patch.object(settings, "http2_enabled", False):
+        assert http_clients.http2_available() is False
+    with (
+        patch.object(settings, "http2_enabled", True),
+        patch("importlib.util.find_spec", return_value=None),
+    ):
+        assert http_clients.http2_available() is False
+
+
+async def test_start_warns_when_http2_falls_back(mock_clients, caplog):
+    """HTTP/2를 켰는데 h2가 없으면 HTTP/1.1로 연결한다는 경고를 남긴다."""
+    with (
+        patch.object(settings, "http2_enabled", True),
+        patch("importlib.util.find_spec", return_value=None),
+        caplog.at_level("WARNING", logger=http_clients.__name__),
+    ):
+        await http_clients.start_http_clients()
+
+    assert "HTTP/1.1" in caplog.text
+
+
+# ---------------------------------------------------------------------------
+# T-3: MOLIT 페이지 조회
+# ---------------------------------------------------------------------------
+
+
+def _molit_page(total: int, page_no: int, page_size: int) -> str:
+    start = (page_no - 1) * page_size
+    items = "".join(
+        f"<item><dealAmount>{i + 1:,}</dealAmount><excluUseAr>59.9</excluUseAr></item>"
+        for i in range(start, min(start + page_size, total))
+    )
+    return (
+        "<response><header><resultCode>000</resultCode></header>"
+        f"<body><items>{items}</items><totalCount>{total}</totalCount></body></response>"
+    )
+
+
+@pytest.fixture
+def molit_pages():
+    """pageNo/numOfRows에 맞춰 totalCount건을 나눠 주는 MOLIT 스텁 (동시 요청 수 최대값 기록)."""
+    state = {"total": 0, "pages": [], "active": 0, "max_active": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page_no = int(request.url.params["pageNo"])
+        page_size = int(request.url.params["numOfRows"])
+        state["pages"].append(page_no)
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return httpx.Response(200, text=_molit_page(state["total"], page_no, page_size))
+
+    def build(name: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with (
+        patch.object(http_clients, "_build_client", build),
+        patch.object(http_clients, "_clients", {}),
+        patch.object(real_estate_api, "MOLIT_PAGE_SIZE", 100),
+    ):
+        yield state
+
+
+async def test_fetch_all_pages_by_total_count(molit_pages):
+    """totalCount가 페이지 크기를 넘으면 나머지 페이지를 모두 받아 순서대로 이어 붙인다."""
+    molit_pages["total"] = 950
+
+    transactions = await fetch_transactions("11680", "202501", "아파트", "매매")
+
+    assert len(transactions) == 950
+    assert [t["거래금액"] for t in transactions] == [(i + 1) * 10_000 for i in range(950)]
+    assert sorted(molit_pages["pages"]) == list(range(1, 11))
+    assert molit_pages["pages"][0] == 1
+    assert 1 < molit_pages["max_active"] <= real_estate_api.MOLIT_PAGE_CONCURRENCY
+
+
+async def test_single_page_makes_one_call(molit_pages):
+    molit_pages["total"] = 100
+
+    assert len(await fetch_transactions("11680", "202501")) == 100
+    assert molit_pages["pages"] == [1]
+
+
+async def test_failed_page_fails_the_month(molit_pages):
+    """페이지 하나라도 실패하면 잘린 데이터 대신 예외를 올린다 (저장소에 저장되지 않음)."""
+    molit_pages["total"] = 350
+    original = real_estate_api._fetch_page
+
+    async def flaky(endpoint, lawd_cd, deal_ymd, page_no, *, rent):
+        if page_no == 3:
+            raise httpx.ConnectError("reset")
+        return await original(endpoint, lawd_cd, deal_ymd, page_no, rent=rent)
+
+    with patch.object(real_estate_api, "_fetch_page", flaky), pytest.raises(httpx.ConnectError):
+        await fetch_transactions("11680", "202501")
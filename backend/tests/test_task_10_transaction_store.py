@@ -0,0 +1,304 @@
+"""Task-10: 실거래 로컬 저장소 / 미리 받기 단위 테스트
+
+MOLIT 호출(fetch_month)을 가짜 함수로 바꿔 저장소가 필요한 달만 API로 받는지 검증한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import zlib
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.agents.nodes.market_data import _collect_transactions
+from app.agents.tools import http_clients, real_estate_api, transaction_prefetcher, transaction_store
+from app.agents.tools.molit_parser import RentRecord, TradeRecord
+from app.agents.tools.real_estate_api import DailyCallCounter
+from app.agents.tools.transaction_prefetcher import TransactionPrefetcher
+from app.agents.tools.transaction_store import (
+    COLLECTION_MONTHS,
+    TransactionStore,
+    load_transactions,
+    month_closed,
+    recent_deal_ymds,
+)
+from app.config import settings
+from app.models.analysis import Analysis
+from tests.conftest import TestSessionLocal
+
+
+@pytest.fixture
+def molit(tmp_path):
+    """임시 저장소와 호출 기록을 남기는 가짜 fetch_month."""
+    calls: list[tuple[str, str, str, str]] = []
+    store = TransactionStore(str(tmp_path / "transactions.sqlite3"))
+    counter = DailyCallCounter()
+
+    async def fake_fetch(lawd_cd, deal_ymd, property_type="아파트", transaction_type="매매"):
+        calls.append((lawd_cd, property_type, transaction_type, deal_ymd))
+        counter.record()
+        await asyncio.sleep(0.01)
+        record_cls = RentRecord if transaction_type == "전월세" else TradeRecord
+        return [record_cls(year=deal_ymd[:4], month=deal_ymd[4:], price=int(deal_ymd))], 1
+
+    with (
+        patch.object(transaction_store, "_store", store),
+        patch.object(transaction_store, "fetch_month", fake_fetch),
+        patch.object(transaction_prefetcher, "molit_calls", counter),
+        patch.object(transaction_prefetcher, "async_session", TestSessionLocal),
+    ):
+        yield store, calls
+    store.close()
+
+
+def _ts(text: str) -> float:
+    return datetime.fromisoformat(text).timestamp()
+
+
+# ---------------------------------------------------------------------------
+# T-1: 마감 판단
+# ---------------------------------------------------------------------------
+
+
+def test_month_closed_after_reporting_deadline():
+    """계약월 말일 + close_days가 지난 뒤 받은 데이터만 마감으로 본다."""
+    with patch.object(settings, "transaction_store_close_days", 35):
+        assert not month_closed("202501", _ts("2025-01-20T12:00"))
+        assert not month_closed("202501", _ts("2025-03-07T12:00"))
+        assert month_closed("202501", _ts("2025-03-08T00:00"))
+        assert month_closed("202412", _ts("2025-03-01T00:00"))
+
+
+# ---------------------------------------------------------------------------
+# T-2: 증분 조회
+# ---------------------------------------------------------------------------
+
+
+async def test_second_analysis_in_same_district_costs_no_api_calls(molit):
+    """같은 구를 두 번 분석하면 두 번째는 저장소에서만 읽는다."""
+    store, calls = molit
+
+    first = await _collect_transactions("41570", "아파트", "매매", months=60)
+    api_calls = len(calls)
+    second = await _collect_transactions("41570", "아파트", "매매", months=60)
+
+    # 30일 간격으로 고르므로 날짜에 따라 58~60개월
+    assert api_calls == len(recent_deal_ymds(60)) >= 58
+    assert len(calls) == api_calls
+    assert second == first
+    # 최근 달부터 이어 붙인다
+    prices = [t["거래금액"] for t in first]
+    assert prices == sorted(prices, reverse=True)
+    assert store.stats()["hits"] == api_calls
+
+
+async def test_only_open_months_are_refetched_after_ttl(molit):
+    """TTL이 지나면 마감 전 달만 다시 받고 마감된 달은 그대로 쓴다."""
+    store, calls = molit
+    now = time.time()
+    closed_at = _ts("2024-06-01T00:00")
+    store.put_month(("41570", "아파트", "매매", "202401"), [TradeRecord(price=1)], fetched_at=closed_at)
+    store.put_month(("41570", "아파트", "매매", "202405"), [TradeRecord(price=2)], fetched_at=closed_at)
+    open_ymd = datetime.fromtimestamp(now).strftime("%Y%m")
+    store.put_month(("41570", "아파트", "매매", open_ymd), [TradeRecord(price=3)], fetched_at=now)
+
+    with patch.object(settings, "transaction_store_open_ttl_seconds", 3600):
+        result = await load_transactions("41570", "아파트", "매매", ["202401", "202405", open_ymd])
+    assert calls == [("41570", "아파트", "매매", "202405")]
+    assert [t.price for t in result] == [3, 202405, 1]
+
+    calls.clear()
+    with patch.object(settings, "transaction_store_open_ttl_seconds", 0):
+        await load_transactions("41570", "아파트", "매매", ["202401", open_ymd])
+    assert calls == [("41570", "아파트", "매매", open_ymd)]
+
+
+async def test_keys_are_separate_per_type(molit):
+    """부동산 유형/거래 구분/법정동코드가 다르면 따로 받는다."""
+    _, calls = molit
+
+    await load_transactions("41570", "아파트", "매매", ["202401"])
+    await load_transactions("41570", "아파트", "전월세", ["202401"])
+    await load_transactions("41570", "오피스텔", "매매", ["202401"])
+    await load_transactions("11680", "아파트", "매매", ["202401"])
+
+    assert len(calls) == 4
+
+
+async def test_concurrent_requests_share_one_fetch(molit):
+    """같은 달을 동시에 요청하면 API 호출 1건을 함께 기다린다."""
+    _, calls = molit
+
+    results = await asyncio.gather(
+        *(load_transactions("41570", "아파트", "매매", ["202401", "202402"]) for _ in range(3))
+    )
+
+    assert len(calls) == 2
+    assert results[0] == results[1] == results[2]
+
+
+async def test_fetch_failure_falls_back_to_stale_data(molit):
+    """다시 받다가 실패하면 기간이 지난 저장본을 쓰고, 저장본이 없으면 빈 목록."""
+    store, _ = molit
+    store.put_month(("41570", "아파트", "매매", "209901"), [TradeRecord(price=7)], fetched_at=time.time() - 86400)
+
+    async def failing_fetch(*args, **kwargs):
+        raise RuntimeError("MOLIT 점검")
+
+    with (
+        patch.object(transaction_store, "fetch_month", failing_fetch),
+        patch.object(settings, "transaction_store_open_ttl_seconds", 60),
+    ):
+        result = await load_transactions("41570", "아파트", "매매", ["209901", "209902"])
+
+    assert result == [TradeRecord(price=7)]
+
+
+async def test_error_envelope_is_not_saved(molit):
+    """호출 한도 초과 응답(HTTP 200 + cmmMsgHeader)은 빈 달로 저장하지 않는다."""
+    store, _ = molit
+    quota_xml = (
+        "<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+        "<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>"
+        "<returnReasonCode>22</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>"
+    )
+
+    def build(name: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=quota_xml)))
+
+    with (
+        patch.object(transaction_store, "fetch_month", real_estate_api.fetch_month),
+        patch.object(http_clients, "_build_client", build),
+        patch.object(http_clients, "_clients", {}),
+    ):
+        result = await load_transactions("41570", "아파트", "매매", ["202401"])
+
+    assert result == []
+    assert store.get_months("41570", "아파트", "매매", ["202401"]) == {}
+    assert store.stats()["months"] == 0
+
+
+def test_month_closes_only_when_fully_received(molit):
+    """마감 기한이 지났어도 totalCount만큼 다 받은 달만 닫는다 (totalCount=0인 빈 달은 닫음)."""
+    store, _ = molit
+    fetched_at = _ts("2024-06-01T00:00")
+    store.put_month(("41570", "아파트", "매매", "202401"), [], fetched_at=fetched_at, total_count=0)
+    store.put_month(("41570", "아파트", "매매", "202402"), [TradeRecord(price=1)], fetched_at=fetched_at, total_count=3)
+
+    months = store.get_months("41570", "아파트", "매매", ["202401", "202402"])
+
+    assert months["202401"].closed
+    assert not months["202402"].closed
+
+
+async def test_store_disabled_always_fetches(molit):
+    _, calls = molit
+
+    with patch.object(settings, "transaction_store_enabled", False):
+        await load_transactions("41570", "아파트", "매매", ["202401"])
+        await load_transactions("41570", "아파트", "매매", ["202401"])
+
+    assert len(calls) == 2
+
+
+# ---------------------------------------------------------------------------
+# T-3: 미리 받기
+# ---------------------------------------------------------------------------
+
+
+async def _add_analyses(*rows: tuple[str, str, timedelta]) -> None:
+    async with TestSessionLocal() as db:
+        for address, property_type, age in rows:
+            created_at = datetime.now(UTC).replace(tzinfo=None) - age
+            db.add(Analysis(property_address=address, property_type=property_type, created_at=created_at))
+        await db.commit()
+
+
+async def test_hot_districts_from_recent_analyses(client, molit):
+    """최근 분석의 소재지를 법정동코드/유형별로 세어 많은 순으로 고른다 (오래된 분석, 매핑 없는 주소 제외)."""
+    await _add_analyses(
+        ("서울특별시 강남구 역삼동 123", "아파트", timedelta(hours=1)),
+        ("서울특별시 강남구 대치동 45", "아파트", timedelta(hours=2)),
+        ("서울특별시 강남구 논현동 7", "다세대주택", timedelta(hours=3)),
+        ("경기도 김포시 운양동 1301", "아파트", timedelta(hours=4)),
+        ("서울특별시 송파구 잠실동 1", "아파트", timedelta(days=10)),
+        ("제주특별자치도 제주시 1", "아파트", timedelta(hours=1)),
+    )
+
+    with patch.object(settings, "prefetch_window_hours", 72):
+        districts = await TransactionPrefetcher().hot_districts()
+
+    assert districts[0] == ("11680", "아파트")
+    assert set(districts[1:]) == {("11680", "연립다세대"), ("41570", "아파트")}
+
+
+async def test_prefetch_warms_store_for_next_analysis(client, molit):
+    """미리 받은 지역의 분석은 API를 호출하지 않고, 다음 실행은 곧 만료될 마감 전 달만 다시 받는다."""
+    _, calls = molit
+    await _add_analyses(("서울특별시 강남구 역삼동 123", "아파트", timedelta(hours=1)))
+    prefetcher = TransactionPrefetcher()
+    expected = sum(len(recent_deal_ymds(months)) for months in COLLECTION_MONTHS.values())
+
+    assert await prefetcher.run_once() == expected
+    # 이번 달이 가장 먼저 갱신된다
+    assert calls[0][3] == datetime.now().strftime("%Y%m")
+
+    calls.clear()
+    await _collect_transactions("11680", "아파트", "매매", months=COLLECTION_MONTHS["매매"])
+    await _collect_transactions("11680", "아파트", "전월세", months=COLLECTION_MONTHS["전월세"])
+    assert calls == []
+
+    # 다음 실행 전에 TTL이 지나지 않으면 다시 받지 않는다
+    with (
+        patch.object(settings, "transaction_store_open_ttl_seconds", 7200),
+        patch.object(settings, "prefetch_interval_seconds", 1800),
+    ):
+        assert await prefetcher.run_once() == 0
+    # 다음 실행 전에 TTL이 지나면 마감 전 달만 다시 받는다
+    with (
+        patch.object(settings, "transaction_store_open_ttl_seconds", 1800),
+        patch.object(settings, "prefetch_interval_seconds", 1800),
+    ):
+        refreshed = await prefetcher.run_once()
+    assert 0 < refreshed <= 4
+    assert {ymd for *_, ymd in calls} <= set(recent_deal_ymds(2))
+
+
+async def test_prefetch_respects_daily_quota(client, molit):
+    """오늘 호출 수가 한도 × 비율에 이르면 멈추고 나머지는 다음으로 미룬다."""
+    _, calls = molit
+    await _add_analyses(("서울특별시 강남구 역삼동 123", "아파트", timedelta(hours=1)))
+    prefetcher = TransactionPrefetcher()
+
+    with (
+        patch.object(settings, "molit_daily_quota", 20),
+        patch.object(settings, "prefetch_quota_ratio", 0.5),
+    ):
+        assert await prefetcher.run_once() == 10
+
+    assert len(calls) == 10
+    assert prefetcher.stats()["quota_skipped"] > 0
+
+
+async def test_store_round_trips_compact_records(molit):
+    """레코드는 값 배열로 저장되고 같은 레코드 타입으로 읽힌다 (이전 dict 행 형식도 읽음)."""
+    store, _ = molit
+    rent = RentRecord(area=59.9, year="2025", month="1", name="래미안", price=3_0000_0000, deposit=3_0000_0000)
+    store.put_month(("11680", "아파트", "전월세", "202501"), [rent])
+
+    (month,) = store.get_months("11680", "아파트", "전월세", ["202501"]).values()
+    assert month.records == [rent]
+    assert type(month.records[0]) is RentRecord
+
+    legacy = json.dumps([{"거래금액": 5, "년": "2024", "아파트": "자이"}], ensure_ascii=False).encode()
+    store._connect().execute(
+        "INSERT OR REPLACE INTO molit_months VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        ("11680", "아파트", "매매", "202401", zlib.compress(legacy), 1, time.time(), 1),
+    )
+    (month,) = store.get_months("11680", "아파트", "매매", ["202401"]).values()
+    assert month.records == [TradeRecord(year="2024", name="자이", price=5)]
@@ -0,0 +1,209 @@
+"""Task-11: MOLIT XML 스트리밍 파서 단위 테스트
+
+태그 별칭 우선순위, 한글 태그(구 API), 조각 단위 입력, 오류 응답 처리, compact 레코드의 dict 호환성을 검증한다.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.agents.tools.molit_parser import (
+    MolitApiError,
+    MolitXmlParser,
+    RentRecord,
+    TradeRecord,
+    parse_molit_xml,
+)
+from app.agents.tools.real_estate_api import parse_xml_response
+
+TRADE_XML = """\
+<response><header><resultCode>000</resultCode></header><body><items>
+  <item>
+    <aptNm>래미안</aptNm><dealAmount> 125,000 </dealAmount><excluUseAr>84.97</excluUseAr>
+    <dealYear>2025</dealYear><dealMonth>3</dealMonth><dealDay>14</dealDay>
+    <floor>12</floor><umdNm>역삼동</umdNm><buildYear>2014</buildYear>
+  </item>
+  <item><연립다세대>빌라A</연립다세대><dealAmount>31,500</dealAmount><dealYear>2025</dealYear></item>
+</items><numOfRows>1000</numOfRows><pageNo>1</pageNo><totalCount>2</totalCount></body></response>
+"""
+
+RENT_XML = """\
+<response><header><resultCode>000</resultCode></header><body><items>
+  <item><aptNm>자이</aptNm><deposit>50,000</deposit><monthlyRent>120</monthlyRent>
+  <contractType>신규</contractType><excluUseAr>59.9</excluUseAr></item>
+</items><totalCount>1</totalCount></body></response>
+"""
+
+
+def _response(items: str, code: str = "00") -> str:
+    return f"<response><header><resultCode>{code}</resultCode></header><body><items>{items}</items></body></response>"
+
+
+# ---------------------------------------------------------------------------
+# T-1: 필드 매핑
+# ---------------------------------------------------------------------------
+
+
+def test_trade_fields_and_total_count():
+    records, total = parse_molit_xml(TRADE_XML)
+
+    assert total == 2
+    assert records[0] == TradeRecord(
+        area=84.97,
+        build_year="2014",
+        year="2025",
+        month="3",
+        day="14",
+        floor="12",
+        name="래미안",
+        dong="역삼동",
+        price=1_250_000_000,
+    )
+    assert records[1]["아파트"] == "빌라A"
+    assert records[1]["전용면적"] == 0.0
+    assert records[1]["거래금액"] == 315_000_000
+
+
+def test_first_alias_wins_regardless_of_tag_order():
+    """같은 필드의 별칭이 여러 개 있으면 태그 순서와 상관없이 앞의 별칭 값을 쓴다 (빈 값은 건너뜀)."""
+    xml = _response(
+        "<item><아파트>구 단지명</아파트><aptNm>신 단지명</aptNm><dealYear></dealYear><년>2024</년></item>"
+    )
+
+    (record,), _ = parse_molit_xml(xml)
+
+    assert record.name == "신 단지명"
+    assert record.year == "2024"
+
+
+def test_legacy_korean_tags():
+    xml = _response(
+        "<item><거래금액>9,000</거래금액><전용면적>40.1</전용면적><년>2019</년><법정동>운양동</법정동></item>"
+    )
+
+    (record,), total = parse_molit_xml(xml)
+
+    assert (record.price, record.area, record.year, record.dong) == (90_000_000, 40.1, "2019", "운양동")
+    assert total == 0
+
+
+def test_rent_price_is_deposit():
+    (record,), _ = parse_molit_xml(RENT_XML, rent=True)
+
+    assert isinstance(record, RentRecord)
+    assert record["거래금액"] == record["보증금액"] == 500_000_000
+    assert record["월세금액"] == 1_200_000
+    assert record["계약구분"] == "신규"
+
+
+def test_parse_xml_response_by_type():
+    assert parse_xml_response(RENT_XML, "rent")[0].deposit == 500_000_000
+    assert len(parse_xml_response(TRADE_XML, "trade")) == 2
+
+
+# ---------------------------------------------------------------------------
+# T-2: 스트리밍
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("size", [1, 7, 64])
+def test_chunked_feed_matches_whole_parse(size):
+    """멀티바이트 문자 중간에서 잘린 조각을 넣어도 한 번에 파싱한 결과와 같다."""
+    data = TRADE_XML.encode()
+    parser = MolitXmlParser()
+    for start in range(0, len(data), size):
+        parser.feed(data[start : start + size])
+
+    assert parser.finish() == parse_molit_xml(TRADE_XML)
+
+
+def test_repeated_strings_are_shared():
+    item = "<item><dealYear>2025</dealYear><umdNm>역삼동</umdNm></item>"
+    records, _ = parse_molit_xml(_response(item * 3))
+
+    assert records[0].dong is records[2].dong
+    assert records[0].year is records[1].year
+
+
+# ---------------------------------------------------------------------------
+# T-3: 오류 응답
+# ---------------------------------------------------------------------------
+
+
+def test_header_is_recorded():
+    parser = MolitXmlParser()
+    parser.feed(_response("", code="000").replace("</resultCode>", "</resultCode><resultMsg>OK</resultMsg>"))
+
+    assert parser.finish() == ([], 0)
+    assert parser.header == {"resultCode": "000", "resultMsg": "OK"}
+
+
+def test_gateway_error_envelope_raises():
+    """호출 한도 초과는 HTTP 200 + <cmmMsgHeader>로 온다. 빈 결과로 돌려주지 않고 오류로 올린다."""
+    xml = (
+        "<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+        "<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>"
+        "<returnReasonCode>22</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>"
+    )
+
+    with pytest.raises(MolitApiError) as exc_info:
+        parse_molit_xml(xml)
+
+    assert exc_info.value.code == "22"
+    assert exc_info.value.message == "LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR"
+
+
+def test_error_result_code_raises():
+    xml = (
+        "<response><header><resultCode>30</resultCode>"
+        "<resultMsg>SERVICE_KEY_IS_NOT_REGISTERED_ERROR</resultMsg></header></response>"
+    )
+
+    with pytest.raises(MolitApiError, match="SERVICE_KEY_IS_NOT_REGISTERED_ERROR") as exc_info:
+        parse_xml_response(xml)
+
+    assert exc_info.value.code == "30"
+
+
+def test_missing_result_code_raises():
+    with pytest.raises(MolitApiError):
+        parse_molit_xml("<response><body><items></items><totalCount>0</totalCount></body></response>")
+
+
+def test_nodata_code_is_empty_result():
+    assert parse_molit_xml(_response("", code="03")) == ([], 0)
+
+
+# ---------------------------------------------------------------------------
+# T-4: compact 레코드
+# ---------------------------------------------------------------------------
+
+
+def test_record_is_slotted_mapping():
+    """레코드는 __dict__ 없이 기존 dict 행과 같은 한글 키로 읽히고 dict와 비교된다."""
+    record = TradeRecord(area=84.9, year="2025", price=850_000_000)
+
+    assert not hasattr(record, "__dict__")
+    assert record.get("거래금액") == 850_000_000
+    assert record.get("보증금액", 0) == 0
+    assert dict(record) == {
+        "전용면적": 84.9,
+        "건축년도": "",
+        "년": "2025",
+        "월": "",
+        "일": "",
+        "층": "",
+        "아파트": "",
+        "법정동": "",
+        "거래금액": 850_000_000,
+    }
+    assert record == dict(record)
+    with pytest.raises(KeyError):
+        record["area"]
+
+
+def test_row_round_trip():
+    record = RentRecord(name="자이", price=1, deposit=1, monthly_rent=2, contract_type="갱신")
+
+    assert RentRecord(*record.row()) == record
+    assert TradeRecord.from_mapping(dict(record)) == TradeRecord(name="자이", price=1)